@@ -2,14 +2,29 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
-from import_export import resources
-from import_export.admin import ImportExportModelAdmin
-from .models import UserProfile
+from django.core.exceptions import ValidationError
+from django.db.models import F
+from django.db.models.functions import Substr
+from import_export import fields
+from import_export.admin import ImportMixin
+from core.changelist import ScalableChangeListMixin
+from core.export import BackgroundExportMixin, StreamingExportMixin
+from core.imports import BulkImportResource, UserWidget
+from orders.matching import index_profiles
+from .models import USER_ROLE_CHOICES, UserProfile
 
+ROLES = dict(USER_ROLE_CHOICES)
 
-# === Ресурс для экспорта профилей ===
-class UserProfileResource(resources.ModelResource):
-    class Meta:
+
+# === Ресурс для экспорта и импорта профилей ===
+class UserProfileResource(BulkImportResource):
+    user__username = fields.Field(
+        attribute='user', column_name='user__username', widget=UserWidget(fallback_column='user__email')
+    )
+    # Рейтинг только выгружается: он выводится из отзывов (orders.ratings)
+    rating = fields.Field(attribute='rating', column_name='rating', readonly=True)
+
+    class Meta(BulkImportResource.Meta):
         model = UserProfile
         fields = (
             'id',
@@ -26,36 +41,70 @@ class UserProfileResource(resources.ModelResource):
         )
         export_order = fields
 
+    def before_import(self, dataset, **kwargs):
+        super().before_import(dataset, **kwargs)
+        # Профиль у пользователя один: занятые пользователи загружаются одним запросом на порцию
+        users = [self.user_map.get(value) for value in dataset['user__username']] if 'user__username' in dataset.headers else []
+        self.imported_users = [user for user in users if user]
+        self.profile_owners = dict(
+            UserProfile.objects.filter(user__in=self.imported_users).values_list('user_id', 'id')
+        )
+
+    def validate_instance(self, instance, import_validation_errors=None, validate_unique=True):
+        errors = dict(import_validation_errors or {})
+        if 'user' not in errors:
+            owner = self.profile_owners.get(instance.user_id)
+            if owner is not None and owner != instance.pk:
+                errors['user'] = ValidationError('У пользователя уже есть профиль.', code='unique')
+            else:
+                self.profile_owners[instance.user_id] = instance.pk if instance.pk is not None else object()
+        super().validate_instance(instance, errors, validate_unique)
+
+    def after_import(self, dataset, result, **kwargs):
+        super().after_import(dataset, result, **kwargs)
+        # bulk_create/bulk_update не вызывают сигналы, поэтому индекс подбора обновляется здесь
+        if not kwargs.get('dry_run') and self.imported_users:
+            index_profiles(
+                UserProfile.objects.filter(user__in=self.imported_users).only('id', 'role', 'specialization', 'portfolio')
+            )
+
 
 # === Inline для отображения в User ===
 class UserProfileInline(admin.StackedInline):
     model = UserProfile
     can_delete = False
+    readonly_fields = ('rating', 'rating_count')
     verbose_name = "Профиль пользователя"
     verbose_name_plural = "Профили пользователей"
 
 
-# === Кастомный UserAdmin (без изменений) ===
+# === Кастомный UserAdmin ===
 class CustomUserAdmin(UserAdmin):
     inlines = (UserProfileInline,)
     list_display = UserAdmin.list_display + ('get_role', 'get_specialization', 'get_portfolio')
+    list_filter = UserAdmin.list_filter + ('profile__role', ('profile__specialization', admin.EmptyFieldListFilter))
+    search_fields = UserAdmin.search_fields + ('profile__specialization',)
+
+    def get_queryset(self, request):
+        # Колонки профиля приходят в том же запросе (LEFT JOIN), без загрузки
+        # самого профиля: портфолио обрезается в БД, полный текст не читается
+        return super().get_queryset(request).annotate(
+            profile_role=F('profile__role'),
+            profile_specialization=F('profile__specialization'),
+            profile_portfolio=Substr('profile__portfolio', 1, 50),
+        )
 
+    @admin.display(description='Роль', ordering='profile_role')
     def get_role(self, obj):
-        profile = getattr(obj, 'profile', None)
-        if profile:
-            return profile.get_role_display()
-        return '-'
-    get_role.short_description = 'Роль'
+        return ROLES.get(obj.profile_role, '-')
 
+    @admin.display(description='Специализация', ordering='profile_specialization')
     def get_specialization(self, obj):
-        profile = getattr(obj, 'profile', None)
-        return profile.specialization if profile else '-'
-    get_specialization.short_description = 'Специализация'
+        return obj.profile_specialization or '-'
 
+    @admin.display(description='Портфолио', ordering='profile_portfolio')
     def get_portfolio(self, obj):
-        profile = getattr(obj, 'profile', None)
-        return (profile.portfolio[:50] if profile and profile.portfolio else '-') if profile else '-'
-    get_portfolio.short_description = 'Портфолио'
+        return obj.profile_portfolio or '-'
 
 
 # === Регистрация ===
@@ -65,8 +114,10 @@ admin.site.register(User, CustomUserAdmin)
 from import_export.admin import ExportActionMixin
 # Дополнительно регистрируем UserProfile отдельно — для экспорта!
 @admin.register(UserProfile)
-class UserProfileAdmin(ExportActionMixin, admin.ModelAdmin):
+class UserProfileAdmin(ScalableChangeListMixin, BackgroundExportMixin, StreamingExportMixin, ImportMixin, ExportActionMixin, admin.ModelAdmin):
     resource_class = UserProfileResource
     list_display = ('user', 'role', 'specialization', 'rating')
+    readonly_fields = ('rating', 'rating_count')
     list_filter = ('role',)
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email')
\ No newline at end of file
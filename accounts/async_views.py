@@ -0,0 +1,15 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from core.asynchronous import aload_user
+
+
+@login_required
+async def profile(request):
+    # Профиль загружен вместе с пользователем (ProfileModelBackend)
+    user = await aload_user(request)
+    context = {
+        'user_profile': user.profile
+    }
+
+    return render(request, 'accounts/profile.html', context)
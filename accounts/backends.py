@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend, который загружает пользователя из сессии вместе с профилем.
+
+    request.user.profile читается почти в каждом запросе (навбар, проверки
+    роли в представлениях), поэтому профиль подтягивается тем же запросом
+    через JOIN. Если профиля нет, обращение к user.profile по-прежнему
+    выбрасывает RelatedObjectDoesNotExist, но уже без запроса к БД.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        try:
+            user = await UserModel._default_manager.select_related('profile').aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -49,6 +49,6 @@ class ProfileUpdateForm(forms.ModelForm):
             self.profile_instance.specialization = self.cleaned_data.get('specialization')
             self.profile_instance.portfolio = self.cleaned_data.get('portfolio')
             if commit:
-                self.profile_instance.save()
+                self.profile_instance.save(update_fields=['specialization', 'portfolio', 'updated_at'])
 
         return user
\ No newline at end of file
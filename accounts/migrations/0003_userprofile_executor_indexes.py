@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:42
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from core.operations import AddPostgreSQLIndex, RunPostgreSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_portfolio'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['role', '-rating', '-id'], name='profile_role_rating_idx'),
+        ),
+        AddPostgreSQLIndex(
+            model_name='userprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['specialization'], name='profile_spec_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        # Нечеткий поиск исполнителей по логину: auth_user не наша модель, поэтому индекс создается вручную
+        RunPostgreSQL(
+            'CREATE INDEX IF NOT EXISTS auth_user_username_trgm_idx ON auth_user USING gin (username gin_trgm_ops);',
+            'DROP INDEX IF EXISTS auth_user_username_trgm_idx;',
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:08
+
+from django.db import migrations, models
+
+
+def reset_ratings(apps, schema_editor):
+    # Отзывов еще нет, поэтому рейтинг, который раньше ничем не вычислялся,
+    # приводится в соответствие с rating_count = 0
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    UserProfile.objects.update(rating=0.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_userprofile_role_updated_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(reset_ratings, migrations.RunPython.noop),
+    ]
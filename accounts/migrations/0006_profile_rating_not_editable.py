@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_userprofile_rating_sum_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='rating',
+            field=models.FloatField(default=0.0, editable=False, verbose_name='Рейтинг'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import migrations
+from django.utils import timezone
+
+OLD_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+NEW_BACKEND = 'accounts.backends.ProfileModelBackend'
+
+
+def rewrite_session_backend(apps, schema_editor):
+    # Сессии, открытые до перехода на ProfileModelBackend, хранят путь прежнего
+    # бэкенда, которого нет в AUTHENTICATION_BACKENDS, и завершились бы при
+    # развертывании. Путь переписывается в действующих сессиях
+    Session = apps.get_model('sessions', 'Session')
+    store = SessionStore()
+    sessions = Session.objects.filter(expire_date__gt=timezone.now()).order_by('pk')
+    for session in sessions.iterator(chunk_size=1000):
+        data = store.decode(session.session_data)
+        if data.get(BACKEND_SESSION_KEY) != OLD_BACKEND:
+            continue
+        data[BACKEND_SESSION_KEY] = NEW_BACKEND
+        Session.objects.filter(pk=session.pk).update(session_data=store.encode(data))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_profile_rating_not_editable'),
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(rewrite_session_backend, migrations.RunPython.noop),
+    ]
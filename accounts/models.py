@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.contrib.auth.models import User
 from core.models import BaseModel
 # Create your models here.
@@ -14,12 +15,36 @@ class UserProfile(BaseModel):
     role = models.CharField(max_length=20, choices=USER_ROLE_CHOICES, verbose_name='Роль пользователя')
 
     specialization = models.CharField(max_length=255, blank=True, null=True, verbose_name='Специализация')
-    rating = models.FloatField(default=0.0, verbose_name='Рейтинг')
+    # Средняя оценка по отзывам: rating_sum / rating_count, поддерживается orders.ratings
+    rating = models.FloatField(default=0.0, editable=False, verbose_name='Рейтинг')
+    rating_sum = models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок')
+    rating_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок')
     portfolio = models.TextField(blank=True, verbose_name='Портфолио')
 
+    # Поля, которые меняют только UPDATE из orders.ratings
+    RATING_FIELDS = ('rating', 'rating_sum', 'rating_count')
+
     def __str__(self):
         return f'{self.user.username} - {self.get_role_display()}'
 
+    def save(self, *args, **kwargs):
+        # Полное сохранение существующего профиля не записывает рейтинг: значения,
+        # прочитанные в начале запроса, затерли бы отзывы, учтенные с тех пор
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = 'Профиль пользователя'
         verbose_name_plural = 'Профили пользователей'
+        indexes = [
+            # Каталог исполнителей: WHERE role = 'executor' ORDER BY rating DESC, id DESC
+            models.Index(fields=['role', '-rating', '-id'], name='profile_role_rating_idx'),
+            # Нечеткий поиск и ILIKE по специализации (pg_trgm)
+            GinIndex(fields=['specialization'], opclasses=['gin_trgm_ops'], name='profile_spec_trgm_idx'),
+            # Валидаторы условных GET в API: MAX(updated_at) WHERE role = ...
+            models.Index(fields=['role', 'updated_at'], name='profile_role_updated_idx'),
+        ]
@@ -0,0 +1,7 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.cache import bump_generation_on_commit_receiver, bump_generation_receiver
+from .models import UserProfile
+
+post_save.connect(bump_generation_receiver, sender=UserProfile, dispatch_uid='accounts.userprofile_generation_save')
+post_delete.connect(bump_generation_on_commit_receiver, sender=UserProfile, dispatch_uid='accounts.userprofile_generation_delete')
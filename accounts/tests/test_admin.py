@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.urls import reverse
+from accounts.models import UserProfile
+
+
+class CustomUserAdminTest(TestCase):
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123____')
+        self.client = Client()
+        self.client.force_login(self.superuser)
+        self.url = reverse('admin:auth_user_changelist')
+        self.created = 0
+
+    def add_users(self, count):
+        for _ in range(count):
+            self.created += 1
+            user = User.objects.create_user(username=f'user{self.created}')
+            UserProfile.objects.create(
+                user=user, role='executor' if self.created % 2 else 'customer',
+                specialization=f'Специализация {self.created}', portfolio='П' * 200,
+            )
+
+    def get(self, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, data)
+        self.assertEqual(response.status_code, 200)
+        return queries.captured_queries, response
+
+    def test_query_count_does_not_depend_on_rows(self):
+        self.add_users(2)
+        few, _ = self.get()
+        self.add_users(10)
+        many, response = self.get()
+        self.assertEqual(len(few), len(many))
+        self.assertContains(response, 'Исполнитель')
+
+    def test_full_portfolio_is_not_loaded(self):
+        self.add_users(3)
+        _, response = self.get()
+        sql = str(response.context['cl'].result_list.query)
+        self.assertEqual(sql.count('"accounts_userprofile"."portfolio"'), 1)
+        self.assertRegex(sql, r'SUBSTR(ING)?\("accounts_userprofile"\."portfolio", 1, 50\)')
+
+    def test_profile_columns(self):
+        self.add_users(1)
+        _, response = self.get({'q': 'user1'})
+        user = response.context['cl'].result_list[0]
+        self.assertEqual(user.profile_portfolio, 'П' * 50)
+        self.assertContains(response, '<td class="field-get_portfolio">%s</td>' % ('П' * 50), html=True)
+        self.assertContains(response, 'Специализация 1')
+
+    def test_user_without_profile(self):
+        _, response = self.get({'q': 'admin'})
+        self.assertContains(response, '<td class="field-get_role">-</td>', html=True)
+
+    def test_sort_and_filter_by_role(self):
+        self.add_users(4)
+        _, response = self.get({'profile__role__exact': 'executor'})
+        self.assertEqual(sorted(user.username for user in response.context['cl'].result_list), ['user1', 'user3'])
+
+        role_column = list(response.context['cl'].list_display).index('get_role')
+        _, response = self.get({'o': str(role_column)})
+        roles = [user.profile_role for user in response.context['cl'].result_list if user.profile_role]
+        self.assertEqual(roles, sorted(roles))
+
+    def test_search_by_specialization(self):
+        self.add_users(3)
+        _, response = self.get({'q': 'Специализация 2'})
+        self.assertEqual([user.username for user in response.context['cl'].result_list], ['user2'])
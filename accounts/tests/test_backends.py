@@ -0,0 +1,59 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from accounts.backends import ProfileModelBackend
+from accounts.models import UserProfile
+
+
+class ProfileModelBackendTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='executor', password='qwerty123____')
+        UserProfile.objects.create(user=self.user, role='executor')
+        self.backend = ProfileModelBackend()
+
+    def test_get_user_loads_profile(self):
+        """Профиль загружается тем же запросом, что и пользователь"""
+        with self.assertNumQueries(1):
+            user = self.backend.get_user(self.user.pk)
+            self.assertEqual(user.profile.role, 'executor')
+
+    def test_get_user_without_profile(self):
+        """Отсутствующий профиль не приводит к дополнительному запросу"""
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123____')
+        with self.assertNumQueries(1):
+            user = self.backend.get_user(admin.pk)
+            self.assertFalse(hasattr(user, 'profile'))
+
+    def test_get_user_inactive_or_missing(self):
+        """Неактивный или несуществующий пользователь не восстанавливается из сессии"""
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+        self.assertIsNone(self.backend.get_user(0))
+
+    def test_login_with_password(self):
+        """Вход по логину и паролю работает через новый бэкенд"""
+        client = Client()
+        self.assertTrue(client.login(username='executor', password='qwerty123____'))
+        response = client.get(reverse('my_assigned_orders'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_session_of_previous_backend_rewritten(self):
+        """Миграция переписывает путь прежнего ModelBackend в открытых сессиях, и они остаются действительными"""
+        client = Client()
+        client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(client.get(reverse('my_assigned_orders')).status_code, 302)
+
+        migration = import_module('accounts.migrations.0007_rewrite_session_backend')
+        migration.rewrite_session_backend(apps, None)
+        self.assertEqual(client.session['_auth_user_backend'], 'accounts.backends.ProfileModelBackend')
+        self.assertEqual(client.get(reverse('my_assigned_orders')).status_code, 200)
+
+    async def test_aget_user_loads_profile(self):
+        """Асинхронный вариант тоже загружает профиль, иначе async-представления обращаются к БД из шаблона"""
+        user = await self.backend.aget_user(self.user.pk)
+        self.assertEqual(user.profile.role, 'executor')
+        self.assertIsNone(await self.backend.aget_user(0))
@@ -121,3 +121,16 @@ class ProfileUpdateFormTest(TestCase):
         self.assertEqual(user.email, 'difmail@example.com')
         self.assertEqual(self.profile.specialization, 'ML')
         self.assertEqual(self.profile.portfolio, 'https://example.com')
+
+    def test_form_save_keeps_rating(self):
+        """Сохранение формы не затирает рейтинг, обновленный после чтения профиля"""
+        UserProfile.objects.filter(pk=self.profile.pk).update(rating=4.0, rating_sum=8, rating_count=2)
+        form_data = {'first_name': 'Михаил', 'last_name': 'Кардаш', 'email': 'test@example.com', 'specialization': 'ML'}
+
+        form = ProfileUpdateForm(data=form_data, profile_instance=self.profile)
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.profile.refresh_from_db()
+
+        self.assertEqual(self.profile.specialization, 'ML')
+        self.assertEqual((self.profile.rating, self.profile.rating_sum, self.profile.rating_count), (4.0, 8, 2))
@@ -1,11 +1,14 @@
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth import views as auth_views
-from . import views
+from . import async_views, views
+
+read_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     path('register/', views.register, name='register'),
     path('login/', views.CustomLoginView.as_view(), name='login'),
     path('logout/', auth_views.LogoutView.as_view(next_page='home'), name='logout'),
-    path('profile/', views.profile, name='profile'),
+    path('profile/', read_views.profile, name='profile'),
     path('profile/update/', views.profile_update, name='profile_update')
 ]
\ No newline at end of file
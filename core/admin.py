@@ -1,3 +1,58 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+from .models import ExportJob
+
 
 # Register your models here.
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'status', 'get_progress', 'exported_rows', 'total_rows', 'requested_by', 'created_at', 'get_download')
+    list_filter = ('status', 'file_format')
+    list_select_related = ('requested_by',)
+    readonly_fields = (
+        'requested_by', 'resource', 'file_format', 'status', 'get_progress', 'exported_rows', 'total_rows',
+        'get_download', 'error', 'worker', 'created_at', 'started_at', 'finished_at',
+    )
+    exclude = ('file',)
+
+    def has_add_permission(self, request):
+        # Задания создаются действиями экспорта в админках моделей
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        # Файлы экспорта содержат персональные данные: сотрудник видит только свои задания
+        queryset = super().get_queryset(request)
+        if request.user.is_superuser:
+            return queryset
+        return queryset.filter(requested_by=request.user)
+
+    def get_urls(self):
+        return [
+            path('<int:job_id>/download/', self.admin_site.admin_view(self.download_view), name='core_exportjob_download'),
+        ] + super().get_urls()
+
+    def download_view(self, request, job_id):
+        # Файлы экспорта содержат персональные данные, поэтому отдаются только через админку
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        job = get_object_or_404(self.get_queryset(request), pk=job_id, status='done')
+        if not job.file:
+            raise Http404
+        return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.file.name.rsplit('/', 1)[-1])
+
+    @admin.display(description='Прогресс')
+    def get_progress(self, obj):
+        return f'{obj.progress}%'
+
+    @admin.display(description='Файл')
+    def get_download(self, obj):
+        if obj.status != 'done' or not obj.file:
+            return '-'
+        return format_html('<a href="{}">Скачать</a>', reverse('admin:core_exportjob_download', args=[obj.pk]))
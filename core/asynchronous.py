@@ -0,0 +1,65 @@
+import importlib
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.urls import clear_url_caches
+
+# Модули маршрутов, выбирающие представления по settings.ASYNC_VIEWS
+ASYNC_VIEWS_URLCONFS = ('orders.urls', 'accounts.urls', 'service_exchange.urls')
+
+
+async def aload_user(request):
+    """
+    Загружает пользователя (с профилем, см. ProfileModelBackend) и сессию до рендеринга.
+
+    В async-представлении ленивый request.user обратился бы к БД уже из
+    шаблона, где синхронные запросы запрещены, поэтому он подменяется
+    загруженным объектом.
+    """
+    request.user = await request.auser()
+    return request.user
+
+
+async def aiter_sync(iterator):
+    """
+    Асинхронная обертка над синхронным итератором: каждый элемент берется
+    отдельным вызовом в потоке синхронного кода.
+
+    StreamingHttpResponse с синхронным итератором под ASGI сначала читает его
+    целиком в список; с этой оберткой порции уходят клиенту по мере чтения.
+    Все вызовы идут в одном потоке (thread_sensitive), поэтому курсор
+    .iterator() и соединение с БД остаются теми же.
+    """
+    next_item = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (item := await next_item(iterator, None)) is not None:
+            yield item
+    finally:
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close, thread_sensitive=True)()
+
+
+def _reload_urlconfs():
+    for name in ASYNC_VIEWS_URLCONFS:
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+@contextmanager
+def async_views_enabled(enabled=True):
+    """
+    Перестраивает маршруты с заданным ASYNC_VIEWS, как при запуске под ASGI или WSGI.
+
+    Маршруты выбираются при импорте модулей urls, поэтому они загружаются
+    заново на входе и на выходе. Используется в тестах и в
+    manage.py run_async_benchmark для сравнения режимов в одном процессе.
+    """
+    previous = settings.ASYNC_VIEWS
+    settings.ASYNC_VIEWS = enabled
+    try:
+        _reload_urlconfs()
+        yield
+    finally:
+        settings.ASYNC_VIEWS = previous
+        _reload_urlconfs()
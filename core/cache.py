@@ -0,0 +1,75 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+# Поколение модели входит в ключи закешированных фрагментов шаблонов.
+# Изменение любого объекта модели увеличивает счетчик одной операцией incr,
+# и все старые фрагменты перестают находиться — без перебора и удаления ключей.
+# Вместе с поколением запоминается время изменения: для Last-Modified списков,
+# из которых объект может уйти без изменения MAX(updated_at) (удаление, смена статуса).
+
+
+def generation_key(model):
+    return f'cache-generation:{model._meta.label_lower}'
+
+
+def get_generation(model):
+    key = generation_key(model)
+    generation = cache.get(key)
+    if generation is None:
+        # Ключ мог быть вытеснен: начинаем с метки времени, чтобы не совпасть с прежними значениями
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+async def aget_generation(model):
+    key = generation_key(model)
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, int(time.time() * 1000), timeout=None)
+        generation = await cache.aget(key)
+    return generation
+
+
+def changed_at_key(model):
+    return f'cache-changed-at:{model._meta.label_lower}'
+
+
+def get_changed_at(model):
+    """Время последнего увеличения поколения модели или None, если оно неизвестно"""
+    return cache.get(changed_at_key(model))
+
+
+def bump_generation(model):
+    cache.set(changed_at_key(model), timezone.now(), timeout=None)
+    key = generation_key(model)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        generation = int(time.time() * 1000)
+        cache.set(key, generation, timeout=None)
+        return generation
+
+
+def bump_generation_receiver(sender, **kwargs):
+    """Обработчик post_save/post_delete, сбрасывающий закешированные фрагменты модели"""
+    bump_generation(sender)
+
+
+def bump_generation_on_commit(model):
+    """
+    Увеличивает поколение после фиксации транзакции.
+
+    Для изменений, после которых MAX(updated_at) выборки не меняется (удаление,
+    уход объекта из выборки): при увеличении до фиксации параллельный запрос
+    закешировал бы прежние данные под новым поколением до следующего изменения.
+    """
+    transaction.on_commit(lambda: bump_generation(model))
+
+
+def bump_generation_on_commit_receiver(sender, **kwargs):
+    """Обработчик post_delete: bump_generation_on_commit для модели отправителя"""
+    bump_generation_on_commit(sender)
@@ -0,0 +1,126 @@
+import json
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.utils import get_fields_from_path
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Списки админки для больших таблиц.
+#
+# Стандартный список делает COUNT(*) по всей выборке (и еще один по таблице
+# для «Показать все»), а фильтр по связанному пользователю выводит в боковую
+# панель всех пользователей. Здесь — пагинатор с оценкой количества строк и
+# фильтр по связи с полем автодополнения вместо списка.
+
+
+def estimated_count(queryset):
+    """
+    Оценка количества строк выборки по статистике PostgreSQL.
+
+    Для выборки без условий — pg_class.reltuples таблицы, для выборки с
+    фильтрами — число строк из плана EXPLAIN. На других СУБД и для таблиц без
+    собранной статистики возвращает None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    query = queryset.query
+    if not query.where and not query.distinct and not query.combinator:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        # -1 — таблица еще ни разу не анализировалась
+        if row is None or row[0] < 0:
+            return None
+        return row[0]
+
+    plan = json.loads(queryset.explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор, который не считает строки точно, если их заведомо много.
+
+    Если оценка не меньше settings.ADMIN_ESTIMATED_COUNT_THRESHOLD, число строк
+    и страниц берется из нее; на небольших выборках выполняется обычный COUNT(*).
+    """
+
+    @cached_property
+    def count(self):
+        if hasattr(self.object_list, 'query'):
+            estimate = estimated_count(self.object_list)
+            if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    Фильтр по внешнему ключу с полем автодополнения.
+
+    Варианты загружаются представлением автодополнения админки по мере ввода,
+    поэтому у админки связанной модели должны быть заданы search_fields.
+    Подключается как ('customer', AutocompleteFilter) вместе с
+    ScalableChangeListMixin, который добавляет на страницу скрипты виджета.
+    """
+
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.title = getattr(field, 'verbose_name', field_path)
+        # Поле формы передает виджету queryset для подписи выбранного значения
+        self.form_field = field.formfield(widget=AutocompleteSelect(field, model_admin.admin_site), required=False)
+
+    def has_output(self):
+        return True
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    @property
+    def value(self):
+        values = self.used_parameters.get(self.lookup_kwarg)
+        return values[-1] if values else None
+
+    def rendered_widget(self):
+        return self.form_field.widget.render(self.lookup_kwarg, self.value, attrs={'style': 'width: 100%'})
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.value is None,
+            'query_string': changelist.get_query_string(remove=[self.lookup_kwarg]),
+            'display': 'Все',
+        }
+
+
+class ScalableChangeListMixin:
+    """
+    Настройки списка админки для больших таблиц: оценка количества строк
+    вместо COUNT(*) и скрипты для фильтров AutocompleteFilter.
+    """
+
+    paginator = EstimatedCountPaginator
+    # Иначе ChangeList считает еще и всю таблицу без фильтров
+    show_full_result_count = False
+    # Счетчики у вариантов фильтров — отдельный COUNT на каждый вариант
+    show_facets = admin.ShowFacets.NEVER
+
+    @property
+    def media(self):
+        media = super().media
+        for list_filter in self.list_filter:
+            if isinstance(list_filter, (list, tuple)) and issubclass(list_filter[1], AutocompleteFilter):
+                field = get_fields_from_path(self.model, list_filter[0])[-1]
+                # Скрипты у всех виджетов автодополнения одинаковые
+                return media + AutocompleteSelect(field, self.admin_site).media
+        return media
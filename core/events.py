@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Брокер событий для потоков server-sent events.
+#
+# Производитель (представление, обработчик сигнала) публикует событие в канал
+# один раз, брокер раздает его всем подписчикам канала. Бэкенд задается в
+# settings.EVENT_BROKER; InProcessBroker работает в пределах одного процесса,
+# для нескольких процессов сервера нужен бэкенд поверх внешней шины с тем же
+# интерфейсом.
+
+
+class BaseBroker(ABC):
+    @abstractmethod
+    def publish(self, channel, event):
+        """Отправляет событие (словарь, сериализуемый в JSON) всем подписчикам канала"""
+
+    @abstractmethod
+    def subscribe(self, channel):
+        """
+        Асинхронный контекстный менеджер подписки на канал.
+
+        Возвращает объект с асинхронным методом get(timeout), который ждет
+        следующее событие и возвращает None, если за timeout секунд событий не было.
+        """
+
+
+class Subscription:
+    def __init__(self, max_queue_size):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+
+    def deliver(self, event):
+        # Вызывается в цикле событий подписчика. Медленный подписчик теряет
+        # самые старые события, а не задерживает производителя и остальных
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker(BaseBroker):
+    """Брокер в памяти процесса: подписчики — очереди asyncio, публикация потокобезопасна"""
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            # Синхронные представления под ASGI работают в отдельном потоке
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Цикл событий подписчика уже закрыт
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        subscription = Subscription(self.max_queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscribers = self._subscriptions.get(channel)
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[channel]
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    config = settings.EVENT_BROKER
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
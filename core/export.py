@@ -0,0 +1,347 @@
+import csv
+import io
+import json
+import logging
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.views.main import PAGE_VAR
+from django.contrib.auth.models import AnonymousUser
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, QueryDict, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from django.utils.module_loading import import_string
+from openpyxl import Workbook
+
+from .asynchronous import aiter_sync
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+# Потоковый экспорт по колонкам ресурсов django-import-export.
+#
+# В отличие от ExportActionMixin, который собирает весь tablib.Dataset и книгу
+# XLSX в памяти, строки читаются одним запросом values_list() (связанные
+# колонки вроде customer__username — через JOIN в том же запросе) порциями
+# .iterator(chunk_size) и сразу уходят в ответ. Память и число запросов не
+# зависят от количества строк. Под ASGI ответ получает асинхронный итератор
+# (aiter_sync): синхронный Django прочитал бы весь ответ в память до отправки.
+#
+# XLSX — исключение из потоковой отдачи: архив книги можно записать только
+# целиком, поэтому строки сначала сбрасываются во временный файл на диске, и
+# отправка начинается после последней строки. Память при этом тоже не растет,
+# но первый байт клиент получает только после чтения всей выборки; для больших
+# выгрузок в XLSX предназначен фоновый экспорт.
+
+
+def resource_columns(resource_class):
+    meta = resource_class._meta
+    return list(meta.export_order or meta.fields)
+
+
+class BufferWriter:
+    """Файлоподобный объект для csv.writer: накапливает строки до отправки порции"""
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+
+    def write(self, value):
+        self.buffer.write(value)
+
+    def pop(self):
+        value = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return value.encode()
+
+
+def iter_csv(columns, rows, chunk_size):
+    output = BufferWriter()
+    writer = csv.writer(output)
+    # BOM нужен Excel, чтобы распознать UTF-8 с кириллицей
+    output.write('\ufeff')
+    writer.writerow(columns)
+    for i, row in enumerate(rows, 1):
+        writer.writerow(['' if value is None else value for value in row])
+        if i % chunk_size == 0:
+            yield output.pop()
+    yield output.pop()
+
+
+def iter_jsonl(columns, rows, chunk_size):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False))
+        if len(lines) == chunk_size:
+            yield ('\n'.join(lines) + '\n').encode()
+            lines = []
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode()
+
+
+def xlsx_value(value):
+    # openpyxl не сохраняет даты с часовым поясом
+    if hasattr(value, 'tzinfo') and value.tzinfo is not None:
+        return timezone.make_naive(value)
+    return value
+
+
+def iter_xlsx(columns, rows, chunk_size):
+    # Книга в режиме write_only сбрасывает строки во временный файл на диске;
+    # готовый файл отдается порциями только после записи всех строк
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([xlsx_value(value) for value in row])
+
+    with tempfile.TemporaryFile() as f:
+        workbook.save(f)
+        f.seek(0)
+        while chunk := f.read(64 * 1024):
+            yield chunk
+
+
+EXPORT_FORMATS = {
+    'csv': (iter_csv, 'text/csv; charset=utf-8'),
+    'jsonl': (iter_jsonl, 'application/x-ndjson; charset=utf-8'),
+    'xlsx': (iter_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+
+class StreamingExport:
+    """
+    Экспорт выборки queryset в колонках ресурса import-export.
+
+    stream(format) возвращает итератор порций bytes. Если передан progress,
+    он вызывается с числом выгруженных строк после каждой порции.
+    """
+
+    def __init__(self, resource_class, queryset, chunk_size=None):
+        self.columns = resource_columns(resource_class)
+        self.queryset = queryset
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+
+    def rows(self, progress=None):
+        count = 0
+        rows = self.queryset.order_by('pk').values_list(*self.columns).iterator(chunk_size=self.chunk_size)
+        for row in rows:
+            yield row
+            count += 1
+            if progress is not None and count % self.chunk_size == 0:
+                progress(count)
+        if progress is not None:
+            progress(count)
+
+    def stream(self, file_format, progress=None):
+        iter_format = EXPORT_FORMATS[file_format][0]
+        return iter_format(self.columns, self.rows(progress), self.chunk_size)
+
+    def filename(self, file_format):
+        timestamp = timezone.localtime().strftime('%Y-%m-%d-%H%M%S')
+        return f'{self.queryset.model._meta.model_name}-{timestamp}.{file_format}'
+
+    def response(self, file_format, asynchronous=False):
+        """Ответ с выгрузкой; asynchronous=True — для отдачи через ASGI"""
+        content = self.stream(file_format)
+        if asynchronous:
+            content = aiter_sync(content)
+        response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[file_format][1])
+        response['Content-Disposition'] = f'attachment; filename="{self.filename(file_format)}"'
+        return response
+
+
+def add_export_actions(model_admin, request, actions, names):
+    """Добавляет действия экспорта так же, как ExportActionMixin.get_actions — при праве на экспорт"""
+    if model_admin.has_export_permission(request):
+        for name in names:
+            actions[name] = model_admin.get_action(name)
+    return actions
+
+
+class StreamingExportMixin:
+    """
+    Действия админки для потокового экспорта в CSV, JSONL и XLSX.
+
+    Используется вместе с ExportActionMixin: колонки берутся из resource_class,
+    право на экспорт — из has_export_permission.
+    """
+
+    stream_export_actions = ('stream_export_csv', 'stream_export_jsonl', 'stream_export_xlsx')
+
+    def get_actions(self, request):
+        return add_export_actions(self, request, super().get_actions(request), self.stream_export_actions)
+
+    def stream_export(self, request, queryset, file_format):
+        return StreamingExport(self.resource_class, queryset).response(
+            file_format, asynchronous=isinstance(request, ASGIRequest)
+        )
+
+    @admin.action(description='Потоковый экспорт выбранных в CSV')
+    def stream_export_csv(self, request, queryset):
+        return self.stream_export(request, queryset, 'csv')
+
+    @admin.action(description='Потоковый экспорт выбранных в JSONL')
+    def stream_export_jsonl(self, request, queryset):
+        return self.stream_export(request, queryset, 'jsonl')
+
+    @admin.action(description='Потоковый экспорт выбранных в XLSX')
+    def stream_export_xlsx(self, request, queryset):
+        return self.stream_export(request, queryset, 'xlsx')
+
+
+# === Фоновый экспорт ===
+#
+# Задание сохраняет ресурс, формат и строку запроса списка объектов админки —
+# простые данные, не зависящие от версии Django и кода моделей и не растущие
+# с размером выборки. Выборку по ним строит воркер (manage.py run_export_worker),
+# он же пишет файл тем же StreamingExport.
+
+
+def enqueue_export(resource_class, file_format, query='', user=None):
+    return ExportJob.objects.create(
+        requested_by=user,
+        resource=f'{resource_class.__module__}.{resource_class.__qualname__}',
+        file_format=file_format,
+        query=query,
+    )
+
+
+def changelist_query(request):
+    """
+    Строка запроса, которой воркер восстановит выборку действия админки.
+
+    При выборе всех объектов (select_across) это фильтры, поиск и сортировка
+    списка без номера страницы; иначе — pk__in с отмеченными объектами, их не
+    больше размера страницы списка.
+    """
+    if request.POST.get('select_across') == '1':
+        query = request.GET.copy()
+        query.pop(PAGE_VAR, None)
+        return query.urlencode()
+    query = QueryDict(mutable=True)
+    query['pk__in'] = ','.join(request.POST.getlist(helpers.ACTION_CHECKBOX_NAME))
+    return query.urlencode()
+
+
+def changelist_queryset(model, query, user=None):
+    """
+    Выборка списка объектов админки model по строке запроса.
+
+    Фильтры, поиск и get_queryset админки применяются так же, как в списке,
+    от имени пользователя, поставившего экспорт; недопустимые параметры
+    вызывают те же исключения, что и в списке.
+    """
+    request = HttpRequest()
+    request.GET = QueryDict(query)
+    request.user = user or AnonymousUser()
+    return admin.site.get_model_admin(model).get_changelist_instance(request).queryset
+
+
+def claim_next_job(worker):
+    """
+    Забирает самое старое задание из очереди и помечает его выполняемым.
+
+    SKIP LOCKED пропускает задания, которые в этот момент забирают другие
+    воркеры, так что каждое задание достается ровно одному из них. Задание
+    воркера, который завершился аварийно, снова забирается, если его прогресс
+    не обновлялся дольше settings.EXPORT_JOB_TIMEOUT.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_TIMEOUT)
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.filter(Q(status='pending') | Q(status='running', updated_at__lt=stale))
+            .order_by('created_at', 'pk')
+            .select_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = 'running'
+        job.worker = worker
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'worker', 'started_at', 'updated_at'])
+    return job
+
+
+def run_job(job):
+    try:
+        resource_class = import_string(job.resource)
+        queryset = changelist_queryset(resource_class._meta.model, job.query, job.requested_by)
+        export = StreamingExport(resource_class, queryset)
+
+        job.total_rows = queryset.count()
+        ExportJob.objects.filter(pk=job.pk).update(total_rows=job.total_rows, updated_at=timezone.now())
+
+        def progress(count):
+            ExportJob.objects.filter(pk=job.pk).update(exported_rows=count, updated_at=timezone.now())
+
+        with tempfile.TemporaryFile() as f:
+            for chunk in export.stream(job.file_format, progress=progress):
+                f.write(chunk)
+            f.seek(0)
+            job.file.save(export.filename(job.file_format), File(f), save=False)
+
+        job.refresh_from_db(fields=['exported_rows'])
+        job.total_rows = job.exported_rows
+        job.status = 'done'
+    except Exception as e:
+        logger.exception('Фоновый экспорт #%s завершился ошибкой', job.pk)
+        job.status = 'failed'
+        job.error = f'{type(e).__name__}: {e}'
+
+    job.finished_at = timezone.now()
+    # Если задание забрал другой воркер (этот считался завершившимся), результат не записывается
+    ExportJob.objects.filter(pk=job.pk, worker=job.worker, started_at=job.started_at).update(
+        status=job.status,
+        error=job.error,
+        file=job.file.name,
+        total_rows=job.total_rows,
+        exported_rows=job.exported_rows,
+        finished_at=job.finished_at,
+        updated_at=job.finished_at,
+    )
+    return job
+
+
+class BackgroundExportMixin:
+    """
+    Действия админки, ставящие экспорт в очередь вместо выгрузки в запросе.
+
+    Как и StreamingExportMixin, берет колонки из resource_class.
+    """
+
+    background_export_actions = ('background_export_csv', 'background_export_jsonl', 'background_export_xlsx')
+
+    def get_actions(self, request):
+        return add_export_actions(self, request, super().get_actions(request), self.background_export_actions)
+
+    def background_export(self, request, queryset, file_format):
+        job = enqueue_export(self.resource_class, file_format, query=changelist_query(request), user=request.user)
+        url = reverse('admin:core_exportjob_change', args=[job.pk])
+        self.message_user(
+            request,
+            format_html('Экспорт поставлен в очередь: <a href="{}">{}</a>. Ссылка на файл появится после выгрузки.', url, job),
+            messages.SUCCESS,
+        )
+
+    @admin.action(description='Экспорт выбранных в CSV в фоне')
+    def background_export_csv(self, request, queryset):
+        self.background_export(request, queryset, 'csv')
+
+    @admin.action(description='Экспорт выбранных в JSONL в фоне')
+    def background_export_jsonl(self, request, queryset):
+        self.background_export(request, queryset, 'jsonl')
+
+    @admin.action(description='Экспорт выбранных в XLSX в фоне')
+    def background_export_xlsx(self, request, queryset):
+        self.background_export(request, queryset, 'xlsx')
@@ -0,0 +1,141 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connections
+from django.utils import timezone
+from import_export import resources, widgets
+from import_export.instance_loaders import CachedInstanceLoader
+
+from .cache import bump_generation
+
+# Массовый импорт через ресурсы django-import-export.
+#
+# Строки проверяются по одной, но в БД пишутся пачками bulk_create/bulk_update
+# (сигналы post_save не отправляются — производные данные пересчитываются в
+# after_import). Существующие объекты загружаются одним запросом на порцию
+# (CachedInstanceLoader), пользователи — одним запросом на весь импорт (UserMap).
+
+
+class UserMap:
+    """Пользователи по логину и по email (без учета регистра), загруженные одним запросом"""
+
+    def __init__(self, users):
+        self.by_username = {}
+        self.by_email = {}
+        for user in users:
+            self.by_username[user.username] = user
+            if user.email:
+                self.by_email.setdefault(user.email.lower(), user)
+
+    @classmethod
+    def load(cls):
+        return cls(User.objects.only('id', 'username', 'email').iterator(chunk_size=settings.EXPORT_CHUNK_SIZE))
+
+    def get(self, value):
+        value = str(value).strip()
+        return self.by_username.get(value) or self.by_email.get(value.lower())
+
+
+class UserWidget(widgets.Widget):
+    """
+    Пользователь по логину или email из UserMap ресурса.
+
+    Если колонка пуста, берется значение fallback_column (например, email
+    рядом с логином). При экспорте выводится логин.
+    """
+
+    def __init__(self, fallback_column=None, required=True):
+        super().__init__()
+        self.fallback_column = fallback_column
+        self.required = required
+        self.user_map = None
+
+    def clean(self, value, row=None, **kwargs):
+        if value in (None, '') and self.fallback_column and row:
+            value = row.get(self.fallback_column)
+        if value in (None, ''):
+            if self.required:
+                raise ValueError('Пользователь не указан.')
+            return None
+
+        user = self.user_map.get(value)
+        if user is None:
+            raise ValueError(f'Пользователь «{value}» не найден.')
+        return user
+
+    def render(self, value, obj=None, **kwargs):
+        return value.username if value is not None else ''
+
+
+class BulkImportResource(resources.ModelResource):
+    """Базовый ресурс для массового импорта"""
+
+    # Заполняются моделью (auto_now_add / auto_now), из файла не читаются
+    timestamp_fields = ('created_at', 'updated_at')
+
+    def __init__(self, user_map=None, **kwargs):
+        super().__init__(**kwargs)
+        self.user_map = user_map
+        self.created_with_pk = False
+
+    class Meta:
+        use_bulk = True
+        batch_size = settings.IMPORT_BATCH_SIZE
+        skip_diff = True
+        instance_loader_class = CachedInstanceLoader
+
+    def get_import_fields(self):
+        return [field for field in super().get_import_fields() if field.attribute not in self.timestamp_fields]
+
+    def get_bulk_update_fields(self):
+        # Имена колонок ресурса не совпадают с полями модели (customer__username -> customer)
+        fields = [
+            field.attribute for field in self.get_import_fields()
+            if not field.readonly and field.attribute and field.attribute not in self._meta.import_id_fields
+        ]
+        if 'updated_at' not in fields:
+            fields.append('updated_at')
+        return fields
+
+    def before_import(self, dataset, **kwargs):
+        self.created_with_pk = False
+        # Без колонки id все строки считаются новыми
+        if 'id' not in dataset.headers:
+            dataset.append_col([''] * len(dataset), header='id')
+
+        user_widgets = [field.widget for field in self.fields.values() if isinstance(field.widget, UserWidget)]
+        if user_widgets and self.user_map is None:
+            self.user_map = UserMap.load()
+        for widget in user_widgets:
+            widget.user_map = self.user_map
+
+    def validate_instance(self, instance, import_validation_errors=None, validate_unique=True):
+        # full_clean() на каждую строку делает запросы, поэтому проверяются только choices
+        errors = dict(import_validation_errors or {})
+        for field in self._meta.model._meta.concrete_fields:
+            value = getattr(instance, field.attname)
+            if field.choices and value not in dict(field.choices) and field.name not in errors:
+                errors[field.name] = ValidationError(f'Недопустимое значение «{value}».', code='invalid_choice')
+        super().validate_instance(instance, errors, validate_unique)
+
+    def save_instance(self, instance, is_create, row, **kwargs):
+        # bulk_update не обновляет auto_now сам
+        instance.updated_at = timezone.now()
+        # pk новой строки до bulk_create задан только явным id из файла
+        if is_create and instance.pk is not None:
+            self.created_with_pk = True
+        super().save_instance(instance, is_create, row, **kwargs)
+
+    def after_import(self, dataset, result, **kwargs):
+        if kwargs.get('dry_run'):
+            return
+        model = self._meta.model
+        # Строки, созданные с явным id, не сдвигают последовательность PostgreSQL:
+        # она сбрасывается после порции с такими строками, а не после обновлений
+        if self.created_with_pk:
+            connection = connections[self.get_db_connection_name()]
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                    cursor.execute(sql)
+        bump_generation(model)
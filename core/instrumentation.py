@@ -0,0 +1,87 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.template.backends.django import DjangoTemplates
+
+# Статистика текущего запроса. ContextVar, а не атрибут соединения:
+# значение переживает sync_to_async и async ORM, которые выполняют
+# запросы в другом потоке и через другой объект соединения.
+_current_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """Счетчики одного запроса: число SQL-запросов, время БД и рендеринга шаблонов (сек.)"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+
+
+def current_stats():
+    return _current_stats.get()
+
+
+@contextmanager
+def collect_stats():
+    """Собирает статистику блока кода; вложенные блоки добавляют свои значения во внешний"""
+    parent = _current_stats.get()
+    stats = RequestStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        if parent is not None:
+            parent.queries += stats.queries
+            parent.db_time += stats.db_time
+            parent.template_time += stats.template_time
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """Обработчик connection_created: подключает счетчик запросов к каждому новому соединению"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class InstrumentedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        stats = _current_stats.get()
+        if stats is None:
+            return self.template.render(context, request)
+
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            stats.template_time += time.perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Бэкенд шаблонов Django, который учитывает время рендеринга в RequestStats"""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return InstrumentedTemplate(super().get_template(template_name))
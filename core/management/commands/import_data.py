@@ -0,0 +1,115 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+import tablib
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from openpyxl import load_workbook
+
+# Короткие имена ресурсов для командной строки; также принимается полный путь к классу
+RESOURCES = {
+    'orders': 'orders.admin.OrderResource',
+    'bids': 'orders.admin.BidResource',
+    'profiles': 'accounts.admin.UserProfileResource',
+}
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        yield headers
+        yield from reader
+
+
+def read_jsonl(path):
+    headers = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if headers is None:
+                headers = list(item)
+                yield headers
+            yield [item.get(header) for header in headers]
+
+
+def read_xlsx(path):
+    workbook = load_workbook(path, read_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        workbook.close()
+
+
+READERS = {'.csv': read_csv, '.jsonl': read_jsonl, '.xlsx': read_xlsx}
+
+
+class Command(BaseCommand):
+    help = (
+        'Массовый импорт заказов, откликов или профилей из CSV, JSONL или XLSX. '
+        'Файл читается порциями: каждая порция проверяется и записывается bulk_create/bulk_update '
+        'в своей транзакции. Ошибочные строки пропускаются и перечисляются в отчете.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', help=f'Ресурс: {", ".join(RESOURCES)} или путь к классу')
+        parser.add_argument('path', help='Файл .csv, .jsonl или .xlsx')
+        parser.add_argument('--chunk-size', type=int, default=settings.IMPORT_CHUNK_SIZE, help='Строк в одной порции')
+        parser.add_argument('--dry-run', action='store_true', help='Только проверить строки, ничего не записывая')
+
+    def handle(self, *args, resource, path, chunk_size, dry_run, **options):
+        try:
+            resource_class = import_string(RESOURCES.get(resource, resource))
+        except ImportError as e:
+            raise CommandError(f'Неизвестный ресурс: {resource}') from e
+
+        reader = READERS.get(Path(path).suffix.lower())
+        if reader is None:
+            raise CommandError(f'Неподдерживаемый формат файла: {path}')
+
+        # Один экземпляр ресурса на весь файл: карта пользователей загружается один раз
+        resource_instance = resource_class()
+        rows = reader(path)
+        headers = next(rows, None)
+        if not headers:
+            raise CommandError('Файл пуст')
+
+        totals = {'new': 0, 'update': 0, 'skip': 0, 'invalid': 0, 'error': 0}
+        offset = 0
+        started = time.perf_counter()
+        while chunk := list(islice(rows, chunk_size)):
+            dataset = tablib.Dataset(*chunk, headers=headers)
+            result = resource_instance.import_data(dataset, dry_run=dry_run, use_transactions=True)
+
+            for import_type in ('new', 'update', 'skip', 'invalid', 'error'):
+                totals[import_type] += result.totals.get(import_type, 0)
+            self.report_errors(result, offset)
+            offset += len(chunk)
+
+        elapsed = time.perf_counter() - started
+        rate = offset / elapsed if elapsed else 0.0
+        summary = (
+            f'Строк: {offset}, создано: {totals["new"]}, обновлено: {totals["update"]}, '
+            f'с ошибками: {totals["invalid"] + totals["error"]}; {elapsed:.1f} с, {rate:.0f} строк/с'
+        )
+        if dry_run:
+            summary += ' (проверка без записи)'
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def report_errors(self, result, offset):
+        # Номер строки — в файле, считая строку заголовков первой
+        for invalid in result.invalid_rows:
+            messages = '; '.join(f'{field}: {" ".join(errors)}' for field, errors in invalid.error_dict.items())
+            self.stderr.write(f'Строка {offset + invalid.number + 1}: {messages}')
+        for number, errors in result.row_errors():
+            for error in errors:
+                self.stderr.write(f'Строка {offset + number + 1}: {error.error}')
+        for error in result.base_errors:
+            self.stderr.write(f'Порция со строки {offset + 2}: {error.error}')
@@ -0,0 +1,39 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.export import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        'Воркер фоновых экспортов: забирает задания из очереди в БД и пишет файлы. '
+        'Можно запускать несколько воркеров одновременно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=5, help='Пауза при пустой очереди, секунды')
+        parser.add_argument('--once', action='store_true', help='Обработать очередь и завершиться')
+        parser.add_argument('--max-jobs', type=int, help='Завершиться после указанного числа заданий')
+
+    def handle(self, *args, interval, once, max_jobs, **options):
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            job = claim_next_job(worker)
+            if job is None:
+                if once:
+                    break
+                time.sleep(interval)
+                continue
+
+            run_job(job)
+            processed += 1
+            if job.status == 'done':
+                self.stdout.write(self.style.SUCCESS(f'{job}: выгружено строк {job.exported_rows}'))
+            else:
+                self.stderr.write(f'{job}: {job.error}')
+
+        self.stdout.write(f'Обработано заданий: {processed}')
@@ -0,0 +1,284 @@
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+# Метрики приложения в текстовом формате Prometheus (core.views.metrics).
+#
+# Счетчики и гистограммы хранятся в памяти процесса. Если задан
+# settings.METRICS_MULTIPROCESS_DIR, каждый процесс сервера периодически
+# (не чаще раза в METRICS_FLUSH_INTERVAL секунд, после запроса и при выходе)
+# записывает снимок своих значений в собственный файл этого каталога, а
+# /metrics суммирует файлы всех процессов. Файлы завершившихся процессов
+# остаются, поэтому счетчики не сбрасываются при перезапуске воркеров;
+# каталог очищается при развертывании, до запуска сервера.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric(ABC):
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name}: ожидаются метки {", ".join(self.labelnames) or "(нет)"}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._values.items()}
+
+    def _copy(self, value):
+        return value
+
+    def merge(self, total, value):
+        """Сумма значений одного набора меток из разных процессов"""
+        return total + value
+
+    @abstractmethod
+    def samples(self, key, value):
+        """Строки выборки (суффикс имени, дополнительные метки, значение) для набора меток"""
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self, key, value):
+        yield '', (), value
+
+
+class Histogram(Metric):
+    """Гистограмма: число наблюдений по корзинам (не накопительно), сумма и количество"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # Корзины, затем +Inf и сумма наблюдений
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def _copy(self, value):
+        return list(value)
+
+    def merge(self, total, value):
+        return [a + b for a, b in zip(total, value)]
+
+    def samples(self, key, value):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), value):
+            cumulative += count
+            yield '_bucket', (('le', format_value(bound)),), cumulative
+        yield '_sum', (), value[-1]
+        yield '_count', (), cumulative
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self._flushed_at = -math.inf
+        self._lock = threading.Lock()
+        # Уникально и при повторном использовании pid после перезапуска воркера
+        self.process_id = f'{os.getpid()}-{time.time_ns()}'
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f'Метрика {metric.name} уже зарегистрирована')
+        self.metrics[metric.name] = metric
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    # === Несколько процессов ===
+
+    def _path(self, directory):
+        return os.path.join(directory, f'metrics-{self.process_id}.json')
+
+    def flush(self, directory):
+        """Атомарно записывает снимок значений процесса в его файл каталога"""
+        data = {
+            name: [[list(key), value] for key, value in values.items()]
+            for name, values in self.snapshot().items()
+        }
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.metrics-', suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self._path(directory))
+        self._flushed_at = time.monotonic()
+
+    def maybe_flush(self, directory, interval):
+        if time.monotonic() - self._flushed_at < interval:
+            return
+        # Запись выполняет один поток процесса, остальные не ждут
+        if self._lock.acquire(blocking=False):
+            try:
+                self.flush(directory)
+            finally:
+                self._lock.release()
+
+    def collect(self, directory=None):
+        """Значения всех метрик {имя: {метки: значение}}; с directory — сумма по файлам процессов"""
+        if directory is None:
+            return self.snapshot()
+
+        self.flush(directory)
+        totals = {name: {} for name in self.metrics}
+        for filename in os.listdir(directory):
+            if not (filename.startswith('metrics-') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                # Файл удален или еще не дописан: os.replace делает замену атомарной,
+                # но каталог могут очищать во время чтения
+                continue
+            for name, values in data.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in values:
+                    key = tuple(key)
+                    current = totals[name].get(key)
+                    totals[name][key] = value if current is None else metric.merge(current, value)
+        return totals
+
+    def render(self, directory=None):
+        """Текстовый формат экспозиции Prometheus 0.0.4"""
+        values = self.collect(directory)
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for key, value in sorted(values.get(name, {}).items()):
+                labels = tuple(zip(metric.labelnames, key))
+                for suffix, extra, sample in metric.samples(key, value):
+                    lines.append(f'{name}{suffix}{format_labels(labels + extra)} {format_value(sample)}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return f'{value:.1f}'
+    return repr(value)
+
+
+REGISTRY = Registry()
+
+# === Метрики ===
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Время обработки запроса', ['view', 'method'],
+)
+RESPONSES = Counter(
+    'http_responses_total', 'Ответы по кодам статуса', ['view', 'method', 'status'],
+)
+DB_QUERIES = Counter(
+    'db_queries_total', 'Число SQL-запросов', ['view'],
+)
+DB_QUERY_TIME = Counter(
+    'db_query_duration_seconds_total', 'Суммарное время SQL-запросов', ['view'],
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', 'Чтения из кеша: result = hit или miss', ['result'],
+)
+ORDERS_CREATED = Counter('orders_created_total', 'Созданные заказы')
+BIDS_PLACED = Counter('bids_placed_total', 'Отклики на заказы')
+ORDER_TRANSITIONS = Counter('order_transitions_total', 'Переходы заказов по статусам', ['status'])
+
+
+def multiprocess_dir():
+    return getattr(settings, 'METRICS_MULTIPROCESS_DIR', None)
+
+
+def record_request(view_name, method, status_code, stats, total_time):
+    """Учитывает обработанный запрос (вызывается QueryBudgetMiddleware)"""
+    view = view_name or '<unresolved>'
+    REQUEST_LATENCY.observe(total_time, view=view, method=method)
+    RESPONSES.inc(view=view, method=method, status=status_code)
+    DB_QUERIES.inc(stats.queries, view=view)
+    DB_QUERY_TIME.inc(stats.db_time, view=view)
+
+    directory = multiprocess_dir()
+    if directory:
+        REGISTRY.maybe_flush(directory, settings.METRICS_FLUSH_INTERVAL)
+
+
+def _flush_at_exit():
+    directory = multiprocess_dir()
+    if directory:
+        REGISTRY.flush(directory)
+
+
+atexit.register(_flush_at_exit)
+
+
+# === Кеш ===
+
+class InstrumentedCacheMixin:
+    """Считает попадания и промахи чтений кеша в CACHE_REQUESTS"""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, self._missing_key, version)
+        if value is self._missing_key:
+            CACHE_REQUESTS.inc(result='miss')
+            return default
+        CACHE_REQUESTS.inc(result='hit')
+        return value
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    # get_many и get_or_set у LocMemCache читают через get
+    pass
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        CACHE_REQUESTS.inc(len(found), result='hit')
+        CACHE_REQUESTS.inc(len(keys) - len(found), result='miss')
+        return found
@@ -0,0 +1,75 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .instrumentation import collect_stats
+from .metrics import record_request
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryBudgetMiddleware:
+    """
+    Собирает число SQL-запросов, время БД и рендеринга шаблонов для каждого запроса.
+
+    Значения отдаются в заголовке Server-Timing, пишутся в лог и учитываются
+    в метриках (core.metrics). Если для
+    имени URL задан лимит в settings.QUERY_BUDGETS и он превышен, middleware
+    пишет предупреждение либо, при QUERY_BUDGET_ACTION = 'raise', выбрасывает
+    QueryBudgetExceeded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        with collect_stats() as stats:
+            response = self.get_response(request)
+        return self.process_stats(request, response, stats, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with collect_stats() as stats:
+            response = await self.get_response(request)
+        return self.process_stats(request, response, stats, time.perf_counter() - start)
+
+    def process_stats(self, request, response, stats, total_time):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+
+        response['Server-Timing'] = (
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+            f'tpl;dur={stats.template_time * 1000:.1f}, '
+            f'total;dur={total_time * 1000:.1f}'
+        )
+        logger.debug(
+            '%s %s: %d queries, db %.1f ms, templates %.1f ms, total %.1f ms',
+            request.method, view_name or request.path, stats.queries,
+            stats.db_time * 1000, stats.template_time * 1000, total_time * 1000,
+        )
+
+        record_request(view_name, request.method, response.status_code, stats, total_time)
+
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is not None and stats.queries > budget:
+            message = f'Лимит SQL-запросов для {view_name} превышен: {stats.queries} > {budget}'
+            if settings.QUERY_BUDGET_ACTION == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
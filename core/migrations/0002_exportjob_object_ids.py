@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:40
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fail_unfinished_jobs(apps, schema_editor):
+    # Выборка незавершенных заданий хранилась сериализованным запросом,
+    # который новая схема не читает: такие задания нужно поставить заново
+    ExportJob = apps.get_model('core', 'ExportJob')
+    ExportJob.objects.filter(status__in=['pending', 'running']).update(
+        status='failed',
+        error='Задание поставлено до обновления очереди экспорта, поставьте экспорт заново.',
+        finished_at=timezone.now(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_unfinished_jobs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='exportjob',
+            name='query',
+        ),
+        migrations.AddField(
+            model_name='exportjob',
+            name='object_ids',
+            field=models.JSONField(default=list, editable=False),
+        ),
+    ]
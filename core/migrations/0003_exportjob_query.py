@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:06
+
+from django.db import migrations, models
+from django.http import QueryDict
+
+
+def object_ids_to_query(apps, schema_editor):
+    # Незавершенные задания выгружают те же объекты по pk__in
+    ExportJob = apps.get_model('core', 'ExportJob')
+    for job in ExportJob.objects.filter(status__in=['pending', 'running']):
+        query = QueryDict(mutable=True)
+        query['pk__in'] = ','.join(str(pk) for pk in job.object_ids)
+        job.query = query.urlencode()
+        job.save(update_fields=['query'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_exportjob_object_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='query',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(object_ids_to_query, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='exportjob',
+            name='object_ids',
+        ),
+    ]
@@ -7,4 +7,55 @@ class BaseModel(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления')
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+EXPORT_JOB_STATUS_CHOICES = [
+    ('pending', 'В очереди'),
+    ('running', 'Выполняется'),
+    ('done', 'Готов'),
+    ('failed', 'Ошибка'),
+]
+
+
+class ExportJob(BaseModel):
+    """
+    Задание фонового экспорта из админки.
+
+    Очередь хранится в БД: воркер (manage.py run_export_worker) забирает
+    задание через SELECT ... FOR UPDATE SKIP LOCKED, поэтому несколько
+    воркеров обрабатывают разные задания параллельно без внешнего брокера.
+    """
+    requested_by = models.ForeignKey(
+        'auth.User', on_delete=models.SET_NULL, null=True, related_name='export_jobs', verbose_name='Запросил'
+    )
+    resource = models.CharField(max_length=255, verbose_name='Ресурс')
+    file_format = models.CharField(max_length=10, verbose_name='Формат')
+    # Выборка из админки: строка запроса списка объектов (фильтры и поиск)
+    # или pk__in с отмеченными объектами, см. core.export.changelist_query
+    query = models.TextField(blank=True, editable=False)
+    status = models.CharField(max_length=20, choices=EXPORT_JOB_STATUS_CHOICES, default='pending', verbose_name='Статус')
+    total_rows = models.PositiveIntegerField(null=True, blank=True, verbose_name='Всего строк')
+    exported_rows = models.PositiveIntegerField(default=0, verbose_name='Выгружено строк')
+    file = models.FileField(upload_to='exports/', blank=True, verbose_name='Файл')
+    error = models.TextField(blank=True, verbose_name='Ошибка')
+    worker = models.CharField(max_length=255, blank=True, verbose_name='Воркер')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Начало')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Окончание')
+
+    def __str__(self):
+        return f'Экспорт #{self.pk} ({self.resource.rsplit(".", 1)[-1]}, {self.file_format})'
+
+    class Meta:
+        verbose_name = 'Фоновый экспорт'
+        verbose_name_plural = 'Фоновые экспорты'
+        indexes = [
+            # Выбор следующего задания: WHERE status = 'pending' ORDER BY created_at
+            # (и брошенных: status = 'running' AND updated_at < ...)
+            models.Index(fields=['status', 'created_at'], name='exportjob_status_created_idx'),
+        ]
+
+    @property
+    def progress(self):
+        if not self.total_rows:
+            return 100 if self.status == 'done' else 0
+        return min(100, self.exported_rows * 100 // self.total_rows)
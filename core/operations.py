@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+class PostgreSQLOnlyMixin:
+    """
+    Миграционная операция, которая меняет схему только на PostgreSQL.
+
+    Состояние моделей обновляется всегда, поэтому makemigrations не видит
+    расхождений, а тестовые базы SQLite просто пропускают DDL,
+    который они не поддерживают (GIN-индексы, триггеры, расширения).
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class AddPostgreSQLIndex(PostgreSQLOnlyMixin, migrations.AddIndex):
+    pass
+
+
+class RunPostgreSQL(PostgreSQLOnlyMixin, migrations.RunSQL):
+    pass
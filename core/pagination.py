@@ -0,0 +1,225 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class KeysetPage:
+    """Страница курсорной пагинации"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+
+class KeysetPaginator:
+    """
+    Курсорная (keyset) пагинация по набору полей сортировки.
+
+    Вместо OFFSET страница выбирается условием вида
+    (created_at, id) < (:created_at, :id), поэтому стоимость запроса
+    не зависит от того, насколько глубоко пользователь пролистал ленту.
+    Последнее поле сортировки должно быть уникальным (обычно id).
+    """
+
+    def __init__(self, queryset, ordering, page_size):
+        directions = {field.startswith('-') for field in ordering}
+        if len(directions) != 1:
+            raise ValueError('Все поля сортировки должны иметь одно направление.')
+
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+        self.descending = directions.pop()
+        self.fields = tuple(field.lstrip('-') for field in ordering)
+
+    def get_page(self, cursor=None):
+        """Возвращает страницу по курсору; некорректный курсор ведет на первую страницу"""
+        queryset, build_page = self._plan(cursor)
+        return build_page(list(queryset))
+
+    async def aget_page(self, cursor=None):
+        """Асинхронный вариант get_page для async-представлений"""
+        queryset, build_page = self._plan(cursor)
+        return build_page([obj async for obj in queryset])
+
+    def _plan(self, cursor):
+        """Запрос страницы (page_size + 1 строк) и функция, собирающая из строк KeysetPage"""
+        try:
+            direction, values = self.decode_cursor(cursor) if cursor else (None, None)
+        except ValueError:
+            direction, values = None, None
+
+        if direction == 'p':
+            return self._previous_page(values)
+        return self._next_page(values)
+
+    def _next_page(self, values):
+        queryset = self.queryset.order_by(*self.ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, forward=True))
+
+        def build_page(rows):
+            has_next = len(rows) > self.page_size
+            rows = rows[:self.page_size]
+            return KeysetPage(
+                rows,
+                next_cursor=self.encode_cursor('n', rows[-1]) if has_next else None,
+                previous_cursor=self.encode_cursor('p', rows[0]) if values is not None and rows else None,
+            )
+
+        return queryset[:self.page_size + 1], build_page
+
+    def _previous_page(self, values):
+        reversed_ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+        queryset = self.queryset.order_by(*reversed_ordering).filter(self._seek(values, forward=False))
+
+        def build_page(rows):
+            has_previous = len(rows) > self.page_size
+            rows = rows[:self.page_size][::-1]
+            return KeysetPage(
+                rows,
+                next_cursor=self.encode_cursor('n', rows[-1]) if rows else None,
+                previous_cursor=self.encode_cursor('p', rows[0]) if has_previous else None,
+            )
+
+        return queryset[:self.page_size + 1], build_page
+
+    def _seek(self, values, forward):
+        """Строит условие (a, b, c) < (va, vb, vc) в виде дерева Q-объектов"""
+        lookup = 'lt' if self.descending == forward else 'gt'
+        condition = Q()
+        for index in reversed(range(len(self.fields))):
+            field = self.fields[index]
+            step = Q(**{f'{field}__{lookup}': values[index]})
+            if condition:
+                step |= Q(**{field: values[index]}) & condition
+            condition = step
+        return condition
+
+    def encode_cursor(self, direction, obj):
+        values = []
+        for field in self.fields:
+            value = obj
+            for part in field.split('__'):
+                value = getattr(value, part)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+
+        payload = json.dumps([direction, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise ValueError('Некорректный курсор.')
+
+        if direction not in ('n', 'p') or not isinstance(raw_values, list) or len(raw_values) != len(self.fields):
+            raise ValueError('Некорректный курсор.')
+
+        try:
+            values = [self._get_field(field).to_python(raw) for field, raw in zip(self.fields, raw_values)]
+        except (ValidationError, TypeError, ValueError):
+            raise ValueError('Некорректный курсор.')
+        return direction, values
+
+    def _get_field(self, path):
+        model = self.queryset.model
+        parts = path.split('__')
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        return model._meta.get_field(parts[-1])
+
+
+class OffsetPage:
+    """Страница пагинации по номеру без общего числа страниц"""
+
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self.has_next = has_next
+
+    @property
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_page_number(self):
+        return self.number + 1
+
+    @property
+    def previous_page_number(self):
+        return self.number - 1
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+
+class OffsetPaginator:
+    """
+    Пагинация по номеру страницы без COUNT(*).
+
+    Для выборок, где курсор неприменим (результаты поиска упорядочены по
+    релевантности): запрашивается page_size + 1 строк, и лишняя строка
+    показывает, что есть следующая страница. Страница — один запрос.
+    """
+
+    def __init__(self, queryset, page_size):
+        self.queryset = queryset
+        self.page_size = page_size
+
+    def get_page(self, number=None):
+        """Возвращает страницу по номеру; некорректный номер ведет на первую страницу"""
+        queryset, build_page = self._plan(number)
+        return build_page(list(queryset))
+
+    async def aget_page(self, number=None):
+        """Асинхронный вариант get_page для async-представлений"""
+        queryset, build_page = self._plan(number)
+        return build_page([obj async for obj in queryset])
+
+    def _plan(self, number):
+        try:
+            number = max(1, int(number))
+        except (TypeError, ValueError):
+            number = 1
+        offset = (number - 1) * self.page_size
+
+        def build_page(rows):
+            return OffsetPage(rows[:self.page_size], number, len(rows) > self.page_size)
+
+        return self.queryset[offset:offset + self.page_size + 1], build_page
+
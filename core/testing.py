@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver
+
+
+def named_url_patterns(urlpatterns):
+    """Имена всех именованных маршрутов модуля urls (включая вложенные include)"""
+    names = []
+    for pattern in urlpatterns:
+        if isinstance(pattern, URLResolver):
+            names.extend(named_url_patterns(pattern.url_patterns))
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.append(pattern.name)
+    return names
+
+
+class QueryBudgetMixin:
+    """
+    Проверка лимита SQL-запросов представления из settings.QUERY_BUDGETS.
+
+    Лимиты — те же, что контролирует QueryBudgetMiddleware в рантайме,
+    поэтому N+1 в представлении роняет тесты раньше, чем попадет в прод.
+    """
+
+    def assertQueryBudget(self, url_name, path, method='get', data=None):
+        budget = settings.QUERY_BUDGETS[url_name]
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(path, data or {})
+
+        self.assertEqual(response.resolver_match.view_name, url_name)
+        if len(queries) > budget:
+            executed = '\n'.join(f'{i}. {query["sql"]}' for i, query in enumerate(queries.captured_queries, 1))
+            self.fail(f'{url_name}: {len(queries)} SQL-запросов при лимите {budget}\n{executed}')
+        return response
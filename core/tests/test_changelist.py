@@ -0,0 +1,112 @@
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.urls import reverse
+from accounts.models import UserProfile
+from core.changelist import EstimatedCountPaginator
+from orders.models import Order, Bid
+
+
+class ChangeListQueryCountTest(TestCase):
+    """Число запросов списков админки не зависит от количества строк на странице"""
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123____')
+        self.client = Client()
+        self.client.force_login(self.superuser)
+        self.customers = []
+        self.created = 0
+
+    def add_rows(self, count):
+        for _ in range(count):
+            self.created += 1
+            customer = User.objects.create_user(username=f'customer{self.created}')
+            executor = User.objects.create_user(username=f'executor{self.created}')
+            UserProfile.objects.create(user=customer, role='customer')
+            UserProfile.objects.create(user=executor, role='executor')
+            order = Order.objects.create(
+                title=f'Заказ {self.created}', description='Описание', customer=customer,
+                status='in_progress', assigned_executor=executor,
+            )
+            Bid.objects.create(order=order, executor=executor, price_proposal=1000)
+            self.customers.append(customer)
+
+    def count_queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertConstantQueries(self, url, data=None):
+        self.add_rows(2)
+        few = self.count_queries(url, data)
+        self.add_rows(10)
+        many = self.count_queries(url, data)
+        self.assertEqual(few, many)
+
+    def test_order_changelist(self):
+        self.assertConstantQueries(reverse('admin:orders_order_changelist'))
+
+    def test_bid_changelist(self):
+        self.assertConstantQueries(reverse('admin:orders_bid_changelist'))
+
+    def test_userprofile_changelist(self):
+        self.assertConstantQueries(reverse('admin:accounts_userprofile_changelist'))
+
+    def test_order_changelist_filtered_by_customer(self):
+        self.add_rows(3)
+        url = reverse('admin:orders_order_changelist')
+        filtered = self.count_queries(url, {'customer__id__exact': self.customers[0].pk})
+        self.add_rows(10)
+        self.assertEqual(self.count_queries(url, {'customer__id__exact': self.customers[0].pk}), filtered)
+
+    def test_user_filters_do_not_list_users(self):
+        """Боковая панель не перечисляет пользователей — их ищет поле автодополнения"""
+        self.add_rows(3)
+        response = self.client.get(reverse('admin:orders_order_changelist'))
+        self.assertContains(response, 'class="autocomplete-filter"', count=2)
+        self.assertContains(response, 'data-parameter="customer__id__exact"')
+        self.assertNotContains(response, f'?customer__id__exact={self.customers[1].pk}"')
+
+        response = self.client.get(reverse('admin:orders_bid_changelist'))
+        self.assertContains(response, 'data-parameter="executor__id__exact"')
+
+    def test_autocomplete_filter_applies_and_shows_selected_user(self):
+        self.add_rows(3)
+        response = self.client.get(reverse('admin:orders_order_changelist'), {'customer__id__exact': self.customers[1].pk})
+        self.assertEqual(list(response.context['cl'].result_list), [Order.objects.get(customer=self.customers[1])])
+        self.assertContains(response, f'<option value="{self.customers[1].pk}" selected>customer2</option>', html=True)
+
+    def test_autocomplete_view_finds_users_for_filter(self):
+        self.add_rows(3)
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'orders', 'model_name': 'order', 'field_name': 'customer', 'term': 'customer2',
+        })
+        self.assertEqual([result['text'] for result in response.json()['results']], ['customer2'])
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    def setUp(self):
+        customer = User.objects.create_user(username='customer')
+        for i in range(5):
+            Order.objects.create(title=f'Заказ {i}', description='Описание', customer=customer, status='open')
+        self.queryset = Order.objects.order_by('pk')
+
+    def test_exact_count_without_statistics(self):
+        """Без статистики PostgreSQL (здесь — SQLite) выполняется обычный COUNT(*)"""
+        self.assertEqual(EstimatedCountPaginator(self.queryset, 2).count, 5)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_estimate_above_threshold(self):
+        with mock.patch('core.changelist.estimated_count', return_value=250000):
+            paginator = EstimatedCountPaginator(self.queryset, 100)
+            with self.assertNumQueries(0):
+                self.assertEqual(paginator.count, 250000)
+            self.assertEqual(paginator.num_pages, 2500)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_exact_count_below_threshold(self):
+        with mock.patch('core.changelist.estimated_count', return_value=10):
+            self.assertEqual(EstimatedCountPaginator(self.queryset, 2).count, 5)
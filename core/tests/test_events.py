@@ -0,0 +1,40 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase
+from core.events import InProcessBroker
+
+
+class InProcessBrokerTest(SimpleTestCase):
+    async def test_fan_out(self):
+        """Одно событие получают все подписчики канала, но не подписчики других каналов"""
+        broker = InProcessBroker()
+        async with broker.subscribe('order:1') as first, broker.subscribe('order:1') as second, \
+                broker.subscribe('order:2') as other:
+            broker.publish('order:1', {'type': 'bid', 'id': 1})
+            self.assertEqual(await first.get(timeout=1), {'type': 'bid', 'id': 1})
+            self.assertEqual(await second.get(timeout=1), {'type': 'bid', 'id': 1})
+            self.assertIsNone(await other.get(timeout=0.05))
+
+    async def test_publish_from_thread(self):
+        """Синхронный код в другом потоке публикует в цикл событий подписчика"""
+        broker = InProcessBroker()
+        async with broker.subscribe('order:1') as subscription:
+            await sync_to_async(broker.publish, thread_sensitive=False)('order:1', {'type': 'order'})
+            self.assertEqual(await subscription.get(timeout=1), {'type': 'order'})
+
+    async def test_slow_subscriber_drops_oldest(self):
+        broker = InProcessBroker(max_queue_size=2)
+        async with broker.subscribe('order:1') as subscription:
+            for i in range(3):
+                broker.publish('order:1', {'id': i})
+            await asyncio.sleep(0)
+            self.assertEqual(await subscription.get(timeout=1), {'id': 1})
+            self.assertEqual(await subscription.get(timeout=1), {'id': 2})
+
+    async def test_unsubscribe(self):
+        broker = InProcessBroker()
+        async with broker.subscribe('order:1'):
+            self.assertEqual(broker.subscriber_count('order:1'), 1)
+        self.assertEqual(broker.subscriber_count('order:1'), 0)
+        # Публикация без подписчиков ничего не делает
+        broker.publish('order:1', {'type': 'bid'})
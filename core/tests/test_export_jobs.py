@@ -0,0 +1,165 @@
+import csv
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth.models import Permission, User
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import UserProfile
+from core.export import claim_next_job, enqueue_export, run_job
+from core.models import ExportJob
+from orders.admin import BidResource, OrderResource
+from orders.models import Order, Bid
+
+
+class ExportJobTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+
+        self.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123____')
+        self.client = Client()
+        self.client.force_login(self.superuser)
+
+        customer = User.objects.create_user(username='customer')
+        UserProfile.objects.create(user=customer, role='customer')
+        self.orders = [
+            Order.objects.create(title=f'Заказ {i}', description='Описание', customer=customer, status=status)
+            for i, status in enumerate(['open', 'open', 'cancelled'])
+        ]
+        for i in range(5):
+            executor = User.objects.create_user(username=f'executor{i}')
+            Bid.objects.create(order=self.orders[0], executor=executor, price_proposal=1000)
+
+    def test_admin_action_enqueues_job(self):
+        response = self.client.post(reverse('admin:orders_order_changelist'), {
+            'action': 'background_export_csv',
+            '_selected_action': [str(order.pk) for order in self.orders[:2]],
+        }, follow=True)
+        self.assertContains(response, 'Экспорт поставлен в очередь')
+
+        job = ExportJob.objects.get()
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(job.file_format, 'csv')
+        self.assertEqual(job.resource, 'orders.admin.OrderResource')
+        self.assertEqual(job.requested_by, self.superuser)
+        self.assertEqual(job.query, f'pk__in={self.orders[0].pk}%2C{self.orders[1].pk}')
+
+    def test_admin_action_select_across_saves_filters(self):
+        """При выборе всех объектов сохраняются фильтры списка, а не pk"""
+        url = reverse('admin:orders_order_changelist') + '?status__exact=open&q=%D0%97%D0%B0%D0%BA%D0%B0%D0%B7&p=0'
+        self.client.post(url, {
+            'action': 'background_export_csv',
+            'select_across': '1',
+            '_selected_action': [str(self.orders[0].pk)],
+        })
+        job = ExportJob.objects.get()
+        self.assertEqual(job.query, 'status__exact=open&q=%D0%97%D0%B0%D0%BA%D0%B0%D0%B7')
+
+        job = run_job(claim_next_job('worker'))
+        self.assertEqual((job.status, job.total_rows, job.exported_rows), ('done', 2, 2))
+
+    def test_worker_exports_saved_selection(self):
+        """Воркер выгружает ровно ту выборку, что была в админке"""
+        enqueue_export(OrderResource, 'csv', query='status__exact=open', user=self.superuser)
+        call_command('run_export_worker', once=True, stdout=StringIO())
+
+        job = ExportJob.objects.get()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual((job.total_rows, job.exported_rows, job.progress), (2, 2, 100))
+        self.assertIsNotNone(job.finished_at)
+
+        with job.file.open('rb') as f:
+            rows = list(csv.reader(io.StringIO(f.read().decode('utf-8-sig'))))
+        self.assertEqual([row[1] for row in rows[1:]], ['Заказ 0', 'Заказ 1'])
+
+    def test_claim_order_and_exclusivity(self):
+        """Задания забираются по очереди, каждое — одним воркером"""
+        first = enqueue_export(BidResource, 'jsonl')
+        second = enqueue_export(BidResource, 'xlsx')
+
+        self.assertEqual(claim_next_job('worker-1'), first)
+        claimed = claim_next_job('worker-2')
+        self.assertEqual(claimed, second)
+        self.assertEqual((claimed.status, claimed.worker), ('running', 'worker-2'))
+        self.assertIsNone(claim_next_job('worker-3'))
+
+    def test_stale_running_job_reclaimed(self):
+        """Задание аварийно завершившегося воркера снова забирается после таймаута"""
+        job = enqueue_export(BidResource, 'csv')
+        self.assertEqual(claim_next_job('worker-1'), job)
+        self.assertIsNone(claim_next_job('worker-2'))
+
+        with override_settings(EXPORT_JOB_TIMEOUT=60):
+            ExportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+            reclaimed = claim_next_job('worker-2')
+        self.assertEqual((reclaimed, reclaimed.worker), (job, 'worker-2'))
+
+        # Старый воркер, закончив, не перезаписывает задание, которое забрал другой
+        job.status = 'running'
+        job.worker = 'worker-1'
+        run_job(job)
+        self.assertEqual(ExportJob.objects.get().worker, 'worker-2')
+        self.assertEqual(ExportJob.objects.get().status, 'running')
+
+    def test_selection_resolved_by_worker(self):
+        """Выборка строится воркером: учитываются изменения после постановки в очередь"""
+        job = enqueue_export(OrderResource, 'csv', query='status__exact=open')
+        Order.objects.filter(pk=self.orders[2].pk).update(status='open')
+
+        job = run_job(claim_next_job('worker'))
+        self.assertEqual((job.status, job.total_rows, job.exported_rows), ('done', 3, 3))
+
+        # Удаленные отмеченные объекты не выгружаются
+        enqueue_export(OrderResource, 'csv', query=f'pk__in={self.orders[0].pk},{self.orders[1].pk}')
+        self.orders[1].delete()
+        job = run_job(claim_next_job('worker'))
+        self.assertEqual((job.status, job.total_rows, job.exported_rows), ('done', 1, 1))
+
+    def test_invalid_query(self):
+        job = run_job(enqueue_export(OrderResource, 'csv', query='customer__password__startswith=pbkdf2'))
+        self.assertEqual(job.status, 'failed')
+
+    def test_failed_job(self):
+        job = enqueue_export(BidResource, 'csv')
+        ExportJob.objects.filter(pk=job.pk).update(resource='orders.admin.MissingResource')
+        job = run_job(claim_next_job('worker'))
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('MissingResource', job.error)
+
+    def test_download(self):
+        job = enqueue_export(BidResource, 'jsonl')
+        download_url = reverse('admin:core_exportjob_download', args=[job.pk])
+        self.assertEqual(self.client.get(download_url).status_code, 404)
+
+        run_job(claim_next_job('worker'))
+        response = self.client.get(reverse('admin:core_exportjob_changelist'))
+        self.assertContains(response, download_url)
+
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 5)
+
+    def test_download_requires_staff(self):
+        job = run_job(enqueue_export(BidResource, 'csv'))
+        client = Client()
+        client.force_login(User.objects.create_user(username='user'))
+        response = client.get(reverse('admin:core_exportjob_download', args=[job.pk]))
+        self.assertEqual(response.status_code, 302)
+
+    def test_download_only_own_jobs(self):
+        """Сотрудник с правом просмотра скачивает только свои экспорты"""
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        staff.user_permissions.add(Permission.objects.get(codename='view_exportjob'))
+        client = Client()
+        client.force_login(staff)
+
+        other = run_job(enqueue_export(BidResource, 'csv', user=self.superuser))
+        own = run_job(enqueue_export(BidResource, 'csv', user=staff))
+        self.assertEqual(client.get(reverse('admin:core_exportjob_download', args=[other.pk])).status_code, 404)
+        self.assertEqual(client.get(reverse('admin:core_exportjob_download', args=[own.pk])).status_code, 200)
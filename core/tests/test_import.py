@@ -0,0 +1,167 @@
+import os
+import tempfile
+import tablib
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from accounts.admin import UserProfileResource
+from accounts.models import UserProfile
+from core.export import StreamingExport
+from orders.admin import BidResource, OrderResource
+from orders.models import Order, Bid
+
+
+class BulkImportTest(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer', email='Customer@Example.com')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.executor = User.objects.create_user(username='executor', email='executor@example.com')
+        self.order = Order.objects.create(title='Существующий', description='Описание', customer=self.customer)
+
+    def order_rows(self, count):
+        return tablib.Dataset(
+            *[(f'Заказ {i}', 'Описание', 'customer', 'open', '1000') for i in range(count)],
+            headers=['title', 'description', 'customer__username', 'status', 'budget'],
+        )
+
+    def test_import_orders_and_report_row_errors(self):
+        """Ошибочные строки пропускаются, остальные записываются"""
+        dataset = tablib.Dataset(
+            ('Новый', 'Описание', 'customer', '', 'open'),
+            ('По email', 'Описание', '', 'customer@example.com', 'in_progress'),
+            ('Чужой', 'Описание', 'nobody', '', 'open'),
+            ('Статус', 'Описание', 'customer', '', 'unknown'),
+            headers=['title', 'description', 'customer__username', 'customer__email', 'status'],
+        )
+        result = OrderResource().import_data(dataset, use_transactions=True)
+
+        self.assertEqual(result.totals['new'], 2)
+        self.assertEqual(result.totals['invalid'], 2)
+        self.assertFalse(result.has_errors())
+        self.assertEqual([row.number for row in result.invalid_rows], [3, 4])
+        self.assertEqual(
+            set(Order.objects.values_list('title', 'customer__username')),
+            {('Существующий', 'customer'), ('Новый', 'customer'), ('По email', 'customer')},
+        )
+
+    def test_constant_number_of_queries(self):
+        """Число запросов не растет с количеством строк"""
+        with CaptureQueriesContext(connection) as small:
+            OrderResource().import_data(self.order_rows(3), use_transactions=True)
+        with CaptureQueriesContext(connection) as large:
+            OrderResource().import_data(self.order_rows(30), use_transactions=True)
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(Order.objects.count(), 34)
+
+    def test_update_by_id(self):
+        before = self.order.updated_at
+        dataset = tablib.Dataset(
+            (self.order.id, 'Переименован', 'Описание', 'customer', 'cancelled'),
+            headers=['id', 'title', 'description', 'customer__username', 'status'],
+        )
+        result = OrderResource().import_data(dataset, use_transactions=True)
+        self.assertEqual(result.totals['update'], 1)
+
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.title, self.order.status), ('Переименован', 'cancelled'))
+        self.assertGreater(self.order.updated_at, before)
+
+    def test_sequence_reset_only_after_explicit_ids(self):
+        """Последовательность сбрасывается только после создания строк с явным id"""
+        update = tablib.Dataset(
+            (self.order.id, 'Переименован', 'Описание', 'customer', 'open'),
+            headers=['id', 'title', 'description', 'customer__username', 'status'],
+        )
+        create = tablib.Dataset(
+            (self.order.id + 100, 'С id', 'Описание', 'customer', 'open'),
+            headers=['id', 'title', 'description', 'customer__username', 'status'],
+        )
+        with mock.patch.object(connection.ops, 'sequence_reset_sql', return_value=[]) as reset:
+            resource = OrderResource()
+            resource.import_data(update, use_transactions=True)
+            resource.import_data(self.order_rows(2), use_transactions=True)
+            self.assertFalse(reset.called)
+
+            resource.import_data(create, use_transactions=True)
+            self.assertEqual(reset.call_count, 1)
+        self.assertTrue(Order.objects.filter(pk=self.order.id + 100).exists())
+
+    def test_import_bids_recomputes_stats(self):
+        """Сигналы не отправляются, статистика откликов пересчитывается после импорта"""
+        other = User.objects.create_user(username='other')
+        dataset = tablib.Dataset(
+            (self.order.id, 'executor', 'Готов', '900'),
+            (self.order.id, 'other', 'Тоже готов', '800'),
+            (self.order.id, 'executor', 'Повтор', '700'),
+            (self.order.id + 100, 'other', 'Нет заказа', '500'),
+            headers=['order', 'executor__username', 'message', 'price_proposal'],
+        )
+        result = BidResource().import_data(dataset, use_transactions=True)
+
+        self.assertEqual(result.totals['new'], 2)
+        self.assertEqual(result.totals['invalid'], 2)
+        self.assertEqual(set(Bid.objects.values_list('executor', flat=True)), {self.executor.id, other.id})
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.bid_count, 2)
+        self.assertEqual(self.order.min_price_proposal, 800)
+
+    def test_import_profiles(self):
+        dataset = tablib.Dataset(
+            ('', 'executor@example.com', 'executor', 'Python', '4.5'),
+            ('customer', '', 'executor', '', '0'),
+            headers=['user__username', 'user__email', 'role', 'specialization', 'rating'],
+        )
+        result = UserProfileResource().import_data(dataset, use_transactions=True)
+
+        self.assertEqual(result.totals['new'], 1)
+        self.assertEqual(result.totals['invalid'], 1)
+        self.assertEqual(self.executor.profile.specialization, 'Python')
+        # Рейтинг выводится из отзывов и при импорте не задается
+        self.assertEqual(self.executor.profile.rating, 0.0)
+
+    def test_export_columns(self):
+        """id заказа выгружается последней колонкой, прежние колонки не сдвигаются"""
+        headers = BidResource().get_export_headers()
+        self.assertEqual(headers[:3], ['id', 'order__title', 'executor__username'])
+        self.assertEqual(headers[-1], 'order')
+
+    def test_bid_export_import_round_trip(self):
+        """Выгруженный файл откликов импортируется обратно без ошибок"""
+        Bid.objects.create(order=self.order, executor=self.executor, message='Готов', price_proposal=900)
+        streamed = b''.join(StreamingExport(BidResource, Bid.objects.all()).stream('csv')).decode('utf-8-sig')
+        exported = BidResource().export(queryset=Bid.objects.all()).export('csv')
+
+        for content in (streamed, exported):
+            dataset = tablib.Dataset().load(content, format='csv')
+            result = BidResource().import_data(dataset, use_transactions=True)
+            self.assertEqual(result.totals['update'], 1)
+            self.assertEqual(result.totals['invalid'], 0)
+            self.assertFalse(result.has_errors())
+        self.assertEqual(list(Bid.objects.values_list('order', 'executor', 'price_proposal')), [(self.order.id, self.executor.id, 900)])
+
+    def test_command(self):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.order_rows(5).export('csv'))
+            f.write('Без заказчика,Описание,,open,1000\n')
+
+        out, err = StringIO(), StringIO()
+        call_command('import_data', 'orders', path, chunk_size=2, stdout=out, stderr=err)
+
+        self.assertIn('создано: 5', out.getvalue())
+        self.assertIn('строк/с', out.getvalue())
+        self.assertIn('Строка 7', err.getvalue())
+        self.assertEqual(Order.objects.count(), 6)
+
+    def test_admin_import_page(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123____')
+        self.client.force_login(admin)
+        for url_name in ('admin:orders_order_import', 'admin:orders_bid_import', 'admin:accounts_userprofile_import'):
+            self.assertEqual(self.client.get(reverse(url_name)).status_code, 200)
@@ -0,0 +1,141 @@
+import tempfile
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client, SimpleTestCase, override_settings
+from django.urls import reverse
+from accounts.models import UserProfile
+from core.metrics import (
+    CACHE_REQUESTS, DB_QUERIES, ORDER_TRANSITIONS, ORDERS_CREATED, REQUEST_LATENCY, RESPONSES,
+    Counter, Histogram, Registry,
+)
+from orders.models import Order
+
+
+def value(metric, *labels):
+    return metric.snapshot().get(tuple(labels), 0)
+
+
+class RegistryTest(SimpleTestCase):
+    def make_registry(self):
+        registry = Registry()
+        counter = Counter('jobs_total', 'Задания', ['queue'], registry=registry)
+        histogram = Histogram('job_seconds', 'Длительность', buckets=(0.1, 1), registry=registry)
+        return registry, counter, histogram
+
+    def test_render(self):
+        registry, counter, histogram = self.make_registry()
+        counter.inc(queue='a"b')
+        counter.inc(2, queue='a"b')
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(3)
+        self.assertEqual(registry.render(), '\n'.join([
+            '# HELP job_seconds Длительность',
+            '# TYPE job_seconds histogram',
+            'job_seconds_bucket{le="0.1"} 1',
+            'job_seconds_bucket{le="1"} 2',
+            'job_seconds_bucket{le="+Inf"} 3',
+            'job_seconds_sum 3.55',
+            'job_seconds_count 3',
+            '# HELP jobs_total Задания',
+            '# TYPE jobs_total counter',
+            'jobs_total{queue="a\\"b"} 3',
+        ]) + '\n')
+
+    def test_labels_must_match(self):
+        registry, counter, _ = self.make_registry()
+        with self.assertRaises(ValueError):
+            counter.inc(other='x')
+        with self.assertRaises(ValueError):
+            Counter('jobs_total', 'Повтор', registry=registry)
+
+    def test_processes_are_summed_through_directory(self):
+        """Каждый процесс пишет свой файл, /metrics суммирует их, в том числе файлы завершившихся процессов"""
+        first, first_counter, first_histogram = self.make_registry()
+        second, second_counter, second_histogram = self.make_registry()
+        first_counter.inc(queue='a')
+        first_histogram.observe(0.05)
+        second_counter.inc(5, queue='a')
+        second_counter.inc(queue='b')
+        second_histogram.observe(0.5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            second.flush(directory)
+            totals = first.collect(directory)
+            # Значения самого процесса берутся свежими: collect записывает его файл заново
+            first_counter.inc(queue='a')
+            self.assertEqual(first.collect(directory)['jobs_total'], {('a',): 7, ('b',): 1})
+        self.assertEqual(totals['jobs_total'], {('a',): 6, ('b',): 1})
+        self.assertEqual(totals['job_seconds'][()], [1, 1, 0, 0.55])
+
+    def test_maybe_flush_respects_interval(self):
+        registry, counter, _ = self.make_registry()
+        with tempfile.TemporaryDirectory() as directory:
+            registry.maybe_flush(directory, 60)
+            counter.inc(queue='a')
+            registry.maybe_flush(directory, 60)
+            reader, _, _ = self.make_registry()
+            self.assertEqual(reader.collect(directory)['jobs_total'], {})
+
+
+class MetricsCollectionTest(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.client = Client()
+
+    def test_request_metrics(self):
+        responses = value(RESPONSES, 'order_list', 'GET', '200')
+        not_found = value(RESPONSES, '<unresolved>', 'GET', '404')
+        latency = value(REQUEST_LATENCY, 'order_list', 'GET') or [0] * 13
+        queries = value(DB_QUERIES, 'order_list')
+
+        self.client.get(reverse('order_list'))
+        self.client.get('/no-such-page/')
+
+        self.assertEqual(value(RESPONSES, 'order_list', 'GET', '200'), responses + 1)
+        self.assertEqual(value(RESPONSES, '<unresolved>', 'GET', '404'), not_found + 1)
+        self.assertEqual(sum(value(REQUEST_LATENCY, 'order_list', 'GET')[:-1]), sum(latency[:-1]) + 1)
+        self.assertGreater(value(DB_QUERIES, 'order_list'), queries)
+
+    def test_cache_hits_and_misses(self):
+        hits, misses = value(CACHE_REQUESTS, 'hit'), value(CACHE_REQUESTS, 'miss')
+        cache.get('metrics-test-key')
+        cache.set('metrics-test-key', 1)
+        cache.get('metrics-test-key')
+        cache.get_many(['metrics-test-key', 'metrics-test-missing'])
+        self.assertEqual(value(CACHE_REQUESTS, 'hit'), hits + 2)
+        self.assertEqual(value(CACHE_REQUESTS, 'miss'), misses + 2)
+
+    def test_business_counters_count_committed_changes(self):
+        created = value(ORDERS_CREATED)
+        cancelled = value(ORDER_TRANSITIONS, 'cancelled')
+        with self.captureOnCommitCallbacks(execute=True):
+            order = Order.objects.create(title='Заказ', description='Описание', customer=self.customer)
+            order.transition('cancelled')
+        self.assertEqual(value(ORDERS_CREATED), created + 1)
+        self.assertEqual(value(ORDER_TRANSITIONS, 'cancelled'), cancelled + 1)
+
+    def test_endpoint(self):
+        self.client.get(reverse('order_list'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_responses_total{view="order_list",method="GET",status="200"}', body)
+
+    @override_settings(METRICS_BEARER_TOKEN='secret')
+    def test_endpoint_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    def test_endpoint_aggregates_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            other = Registry()
+            Counter('orders_created_total', 'Созданные заказы', registry=other).inc(1000)
+            other.flush(directory)
+            with override_settings(METRICS_MULTIPROCESS_DIR=directory):
+                body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn(f'orders_created_total {value(ORDERS_CREATED) + 1000}', body)
@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+from accounts import urls as accounts_urls
+from accounts.models import UserProfile
+from core.middleware import QueryBudgetExceeded
+from core.testing import QueryBudgetMixin, named_url_patterns
+from orders import urls as orders_urls
+from orders.models import InboxEntry, Order, Bid, SavedSearch
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Лимиты SQL-запросов для всех представлений orders.urls и accounts.urls"""
+
+    def setUp(self):
+        self.client = Client()
+
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+
+        self.executors = []
+        for i in range(3):
+            executor = User.objects.create_user(username=f'executor{i}', password='qwerty123____')
+            UserProfile.objects.create(user=executor, role='executor', specialization='Python')
+            self.executors.append(executor)
+
+        # Несколько заказов и откликов, чтобы N+1 проявлялся в числе запросов
+        self.orders = []
+        for i in range(3):
+            order = Order.objects.create(
+                title=f'Заказ {i}',
+                description='Описание',
+                customer=self.customer,
+                assigned_executor=self.executors[0],
+                budget=5000,
+            )
+            for executor in self.executors:
+                Bid.objects.create(order=order, executor=executor, price_proposal=4000)
+            self.orders.append(order)
+            InboxEntry.objects.create(executor=self.executors[0], order=order)
+
+        self.order = self.orders[0]
+
+    def test_every_view_has_budget(self):
+        """Каждый именованный маршрут orders и accounts имеет лимит запросов"""
+        names = named_url_patterns(orders_urls.urlpatterns) + named_url_patterns(accounts_urls.urlpatterns)
+        missing = [name for name in names if name not in settings.QUERY_BUDGETS]
+        self.assertEqual(missing, [])
+
+    def test_anonymous_views(self):
+        self.assertQueryBudget('order_list', reverse('order_list'))
+        # Поиск листается по номеру страницы без COUNT(*) — тот же лимит
+        self.assertQueryBudget('order_list', reverse('order_list'), data={'q': 'Заказ'})
+        self.assertQueryBudget('order_list', reverse('order_list'), data={'q': 'Заказ', 'page': '2'})
+        self.assertQueryBudget('executor_list', reverse('executor_list'))
+        self.assertQueryBudget('register', reverse('register'))
+        self.assertQueryBudget('login', reverse('login'))
+        self.assertQueryBudget('api_order_list', reverse('api_order_list'))
+        self.assertQueryBudget('api_executor_list', reverse('api_executor_list'))
+
+    def test_customer_views(self):
+        self.client.force_login(self.customer)
+        self.assertQueryBudget('my_orders', reverse('my_orders'))
+        self.assertQueryBudget('create_order', reverse('create_order'))
+        self.assertQueryBudget('create_order', reverse('create_order'), method='post', data={
+            'title': 'Новый заказ', 'description': 'Описание', 'budget': '5000',
+        })
+        self.assertQueryBudget('my_orders_bulk', reverse('my_orders_bulk'), method='post', data={
+            'new_status': 'cancelled', 'orders': [order.id for order in self.orders],
+        })
+        self.assertQueryBudget('order_detail', reverse('order_detail', args=[self.order.id]))
+        self.assertQueryBudget('edit_order', reverse('edit_order', args=[self.order.id]))
+        self.assertQueryBudget('api_order_detail', reverse('api_order_detail', args=[self.order.id]))
+        self.assertQueryBudget('profile', reverse('profile'))
+        self.assertQueryBudget('profile_update', reverse('profile_update'))
+        self.assertQueryBudget('logout', reverse('logout'), method='post')
+
+    def test_executor_views(self):
+        self.client.force_login(self.executors[0])
+        self.assertQueryBudget('my_assigned_orders', reverse('my_assigned_orders'))
+        self.assertQueryBudget('saved_searches', reverse('saved_searches'), method='post', data={'keywords': 'Заказ'})
+        self.assertQueryBudget('saved_searches', reverse('saved_searches'))
+        self.assertQueryBudget('inbox', reverse('inbox'))
+        search = SavedSearch.objects.get(executor=self.executors[0])
+        self.assertQueryBudget('delete_saved_search', reverse('delete_saved_search', args=[search.id]), method='post')
+        self.assertQueryBudget('order_detail', reverse('order_detail', args=[self.order.id]))
+
+    def test_middleware_reports_server_timing(self):
+        """Middleware добавляет заголовок Server-Timing с числом запросов"""
+        response = self.client.get(reverse('order_list'))
+        self.assertIn('queries', response['Server-Timing'])
+        self.assertIn('tpl;dur=', response['Server-Timing'])
+
+    @override_settings(QUERY_BUDGETS={'order_list': 0}, QUERY_BUDGET_ACTION='raise')
+    def test_middleware_raises_when_budget_exceeded(self):
+        """При QUERY_BUDGET_ACTION = 'raise' превышение лимита приводит к исключению"""
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse('order_list'))
@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+import tracemalloc
+from asgiref.sync import sync_to_async
+from openpyxl import load_workbook
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase, Client, AsyncClient
+from django.contrib.auth.models import User
+from django.urls import reverse
+from accounts.admin import UserProfileResource
+from accounts.models import UserProfile
+from core.export import StreamingExport
+from orders.admin import BidResource, OrderResource
+from orders.models import Order, Bid
+
+
+class StreamingExportTest(TestCase):
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123____')
+        self.customer = User.objects.create_user(username='customer', email='customer@example.com')
+        UserProfile.objects.create(user=self.customer, role='customer')
+
+        self.order = Order.objects.create(title='Разработка API', description='REST API', customer=self.customer, budget=15000)
+        self.executors = []
+        for i in range(12):
+            executor = User.objects.create_user(username=f'executor{i}', email=f'exec{i}@example.com')
+            UserProfile.objects.create(user=executor, role='executor', specialization='Python')
+            Bid.objects.create(order=self.order, executor=executor, message='Готов', price_proposal=1000 + i)
+            self.executors.append(executor)
+
+    def export(self, resource_class, queryset, file_format, **kwargs):
+        return b''.join(StreamingExport(resource_class, queryset, **kwargs).stream(file_format))
+
+    def test_constant_number_of_queries(self):
+        """Связанные колонки читаются JOIN-ом: один запрос независимо от числа строк и порций"""
+        with self.assertNumQueries(1):
+            content = self.export(BidResource, Bid.objects.all(), 'jsonl', chunk_size=5)
+
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows[0]['order__title'], 'Разработка API')
+        self.assertEqual(rows[0]['executor__username'], 'executor0')
+        self.assertEqual(rows[0]['executor__email'], 'exec0@example.com')
+        self.assertEqual(rows[0]['price_proposal'], '1000.00')
+
+    def test_csv(self):
+        content = self.export(OrderResource, Order.objects.all(), 'csv')
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(rows[0], list(OrderResource._meta.export_order))
+        self.assertEqual(rows[1][1], 'Разработка API')
+        self.assertEqual(rows[1][3], 'customer')
+        # Исполнитель не назначен — пустая ячейка
+        self.assertEqual(rows[1][5], '')
+
+    def test_xlsx(self):
+        content = self.export(UserProfileResource, UserProfile.objects.filter(role='executor'), 'xlsx')
+        sheet = load_workbook(io.BytesIO(content)).active
+        rows = list(sheet.values)
+        self.assertEqual(list(rows[0]), list(UserProfileResource._meta.export_order))
+        self.assertEqual(len(rows), 13)
+        self.assertEqual(rows[1][1], 'executor0')
+
+    def test_progress(self):
+        progress = []
+        b''.join(StreamingExport(BidResource, Bid.objects.all(), chunk_size=5).stream('csv', progress=progress.append))
+        self.assertEqual(progress, [5, 10, 12])
+
+    def test_admin_action(self):
+        client = Client()
+        client.force_login(self.superuser)
+        response = client.post(reverse('admin:orders_bid_changelist'), {
+            'action': 'stream_export_csv',
+            '_selected_action': [str(bid.pk) for bid in Bid.objects.all()[:3]],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="bid-', response['Content-Disposition'])
+
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 4)
+
+    def create_orders(self, count):
+        Order.objects.bulk_create(
+            Order(title=f'Заказ {i}', description='Описание заказа. ' * 60, customer=self.customer)
+            for i in range(count)
+        )
+
+    async def send_through_asgi(self, response):
+        """Отправляет ответ обработчиком ASGI; возвращает размер тела и пиковую память при отправке"""
+        handler = ASGIHandler()
+        sent = 0
+
+        async def send(message):
+            nonlocal sent
+            sent += len(message.get('body', b''))
+
+        tracemalloc.start()
+        try:
+            await handler.send_response(response, send)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return sent, peak
+
+    async def test_asgi_memory_is_flat(self):
+        """Под ASGI выгрузка отдается порциями: пиковая память не растет с числом строк"""
+        peaks = []
+        for count in (500, 1500):
+            await sync_to_async(self.create_orders)(count)
+            response = StreamingExport(OrderResource, Order.objects.all(), chunk_size=100).response('csv', asynchronous=True)
+            self.assertTrue(response.is_async)
+            sent, peak = await self.send_through_asgi(response)
+            peaks.append(peak)
+
+        # Во второй раз выгружено вчетверо больше строк (около 5 МБ)
+        self.assertGreater(sent, 3_000_000)
+        self.assertLess(peaks[1], peaks[0] * 1.5)
+        self.assertLess(peaks[1], sent // 2)
+
+    async def test_admin_action_async(self):
+        """Действие админки под ASGI возвращает асинхронный итератор"""
+        client = AsyncClient()
+        await client.aforce_login(self.superuser)
+        response = await client.post(reverse('admin:orders_bid_changelist'), {
+            'action': 'stream_export_csv',
+            '_selected_action': [str(pk) async for pk in Bid.objects.values_list('pk', flat=True)[:3]],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 4)
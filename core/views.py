@@ -1,3 +1,21 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+from .metrics import REGISTRY, multiprocess_dir
+
+# Версия текстового формата экспозиции Prometheus
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@never_cache
+@require_GET
+def metrics(request):
+    """Метрики всех процессов сервера в текстовом формате Prometheus"""
+    token = settings.METRICS_BEARER_TOKEN
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    return HttpResponse(REGISTRY.render(multiprocess_dir()), content_type=METRICS_CONTENT_TYPE)
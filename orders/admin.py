@@ -1,14 +1,35 @@
 # orders/admin.py
+from django.conf import settings
 from django.contrib import admin
-from import_export import resources
-from import_export.admin import ImportExportModelAdmin
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path
+from import_export import fields, widgets
+from import_export.admin import ImportMixin
 from import_export.admin import ExportActionMixin
-from .models import Bid, Order
+from core.changelist import AutocompleteFilter, ScalableChangeListMixin
+from core.export import BackgroundExportMixin, StreamingExportMixin
+from core.imports import BulkImportResource, UserWidget
+from core.pagination import KeysetPaginator
+from .bid_stats import bid_price_summary, recompute_bid_stats
+from .forms import OrderAdminForm
+from .models import Bid, Order, Review, SavedSearch
+from .percolator import percolate_on_commit
+from .search import search_orders
+from .workflow import ORDER_WORKFLOW, TransitionNotAllowed
 
 
 # === Ресурсы ===
-class OrderResource(resources.ModelResource):
-    class Meta:
+class OrderResource(BulkImportResource):
+    customer__username = fields.Field(
+        attribute='customer', column_name='customer__username', widget=UserWidget(fallback_column='customer__email')
+    )
+    assigned_executor__username = fields.Field(
+        attribute='assigned_executor', column_name='assigned_executor__username', widget=UserWidget(required=False)
+    )
+
+    class Meta(BulkImportResource.Meta):
         model = Order
         fields = (
             'id',
@@ -25,8 +46,37 @@ class OrderResource(resources.ModelResource):
         )
         export_order = fields
 
-class BidResource(resources.ModelResource):
-    class Meta:
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.created_orders = []
+
+    def save_instance(self, instance, is_create, row, **kwargs):
+        super().save_instance(instance, is_create, row, **kwargs)
+        if is_create and instance.status == 'open':
+            self.created_orders.append(instance)
+
+    def after_import(self, dataset, result, **kwargs):
+        super().after_import(dataset, result, **kwargs)
+        # bulk_create не отправляет post_save: новые открытые заказы доставляются
+        # по сохраненным поискам здесь, когда id уже присвоены
+        if not kwargs.get('dry_run'):
+            for order in self.created_orders:
+                percolate_on_commit(order)
+        self.created_orders = []
+
+class BidResource(BulkImportResource):
+    # Отклик привязывается к заказу по id: названия заказов не уникальны. Колонка
+    # выгружается последней, чтобы выгруженный файл импортировался обратно
+    order = fields.Field(attribute='order_id', column_name='order', widget=widgets.IntegerWidget())
+    executor__username = fields.Field(
+        attribute='executor', column_name='executor__username', widget=UserWidget(fallback_column='executor__email')
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.touched_orders = set()
+
+    class Meta(BulkImportResource.Meta):
         model = Bid
         fields = (
             'id',
@@ -36,33 +86,161 @@ class BidResource(resources.ModelResource):
             'message',
             'price_proposal',
             'created_at',
-            'updated_at'
+            'updated_at',
+            'order',
         )
         export_order = fields
 
+    def before_import(self, dataset, **kwargs):
+        super().before_import(dataset, **kwargs)
+        # Заказы порции и уже существующие отклики на них — двумя запросами на порцию
+        order_ids = {int(value) for value in dataset['order'] if str(value).strip().isdigit()} if 'order' in dataset.headers else set()
+        self.existing_orders = set(Order.objects.filter(pk__in=order_ids).values_list('pk', flat=True))
+        self.existing_bids = {
+            (order_id, executor_id): bid_id
+            for bid_id, order_id, executor_id in Bid.objects.filter(order_id__in=self.existing_orders).values_list('id', 'order_id', 'executor_id')
+        }
+
+    def validate_instance(self, instance, import_validation_errors=None, validate_unique=True):
+        errors = dict(import_validation_errors or {})
+        if 'order_id' not in errors and instance.order_id not in self.existing_orders:
+            errors['order_id'] = ValidationError('Заказ не найден.', code='invalid')
+        elif 'executor' not in errors:
+            key = (instance.order_id, instance.executor_id)
+            owner = self.existing_bids.get(key)
+            if owner is not None and owner != instance.pk:
+                errors['executor'] = ValidationError('Исполнитель уже откликнулся на этот заказ.', code='unique')
+            else:
+                # Новые отклики файла помечаются уникальным маркером, чтобы поймать повторы внутри порции
+                self.existing_bids[key] = instance.pk if instance.pk is not None else object()
+        super().validate_instance(instance, errors, validate_unique)
+
+    def save_instance(self, instance, is_create, row, **kwargs):
+        super().save_instance(instance, is_create, row, **kwargs)
+        self.touched_orders.add(instance.order_id)
+
+    def after_import(self, dataset, result, **kwargs):
+        super().after_import(dataset, result, **kwargs)
+        # bulk_create не отправляет post_save: статистика откликов пересчитывается одним проходом
+        if not kwargs.get('dry_run') and self.touched_orders:
+            recompute_bid_stats(order_ids=sorted(self.touched_orders))
+            self.touched_orders.clear()
+
+
+def transition_action(status, label):
+    """Действие списка заказов: массовый перевод в status (недопустимые переходы пропускаются)"""
 
-# === Inlines ===
-class BidInline(admin.TabularInline):
-    model = Bid
-    extra = 0
-    verbose_name = 'Отклик'
-    verbose_name_plural = 'Отклики'
+    @admin.action(description=f'Перевести в статус «{label}»', permissions=['change'])
+    def action(modeladmin, request, queryset):
+        selected = queryset.count()
+        updated = queryset.transition(status)
+        modeladmin.message_user(request, f'Статус «{label}» установлен для заказов: {len(updated)}, пропущено: {selected - len(updated)}.')
+
+    action.__name__ = f'transition_to_{status}'
+    return action
 
 
 # === Админки с поддержкой экспорта ===
 @admin.register(Order)
-class OrderAdmin(ExportActionMixin, admin.ModelAdmin):  # ← было admin.ModelAdmin
+class OrderAdmin(ScalableChangeListMixin, BackgroundExportMixin, StreamingExportMixin, ImportMixin, ExportActionMixin, admin.ModelAdmin):  # ← было admin.ModelAdmin
     resource_class = OrderResource
     list_display = ('title', 'customer', 'status', 'assigned_executor', 'created_at')
-    list_filter = ('status', 'created_at', 'customer')
+    # date_hierarchy не используется: он строит SELECT DISTINCT по датам всей
+    # выборки; период задается фильтром created_at
+    list_filter = (
+        'status',
+        'created_at',
+        ('customer', AutocompleteFilter),
+        ('assigned_executor', AutocompleteFilter),
+    )
+    list_select_related = ('customer', 'assigned_executor')
     search_fields = ('title', 'description')
-    date_hierarchy = 'created_at'
-    inlines = [BidInline]
+    autocomplete_fields = ('customer', 'assigned_executor')
+    form = OrderAdminForm
+    actions = [transition_action(status, label) for status, label in ORDER_WORKFLOW.bulk_choices]
+    # Отклики не выводятся инлайном (у популярного заказа их тысячи): на странице
+    # заказа — сводка по ценам и постраничная панель, загружаемая отдельным запросом
+    change_form_template = 'admin/orders/order/change_form.html'
+
+    def get_urls(self):
+        return [
+            path('<int:order_id>/bids/', self.admin_site.admin_view(self.bids_view), name='orders_order_bids'),
+        ] + super().get_urls()
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        extra_context = extra_context or {}
+        if object_id and object_id.isdigit():
+            extra_context['bid_summary'] = bid_price_summary(int(object_id))
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    def bids_view(self, request, order_id):
+        """Страница откликов заказа для панели на странице изменения (фрагмент HTML)"""
+        order = get_object_or_404(Order.objects.only('pk'), pk=order_id)
+        bid_admin = self.admin_site._registry[Bid]
+        if not (self.has_view_permission(request, order) and bid_admin.has_view_permission(request)):
+            raise PermissionDenied
+        bids = Bid.objects.filter(order=order).select_related('executor')
+        paginator = KeysetPaginator(bids, ('-created_at', '-id'), settings.ADMIN_BIDS_PAGE_SIZE)
+        return TemplateResponse(request, 'admin/orders/order/bid_panel.html', {
+            'order': order,
+            'page': paginator.get_page(request.GET.get('cursor')),
+        })
+
+    def save_model(self, request, obj, form, change):
+        if not (change and 'status' in form.changed_data):
+            super().save_model(request, obj, form, change)
+            return
+
+        # Смена статуса выполняется тем же переходом, что и на сайте: условный
+        # UPDATE с действиями перехода и сигналом order_transitioned (события, метрики).
+        # Изменение статуса другим запросом отклоняет OrderAdminForm.clean, а строка
+        # заблокирована до конца транзакции админки, поэтому переход не проигрывает
+        # гонку; иначе исключение откатывает сохранение вместо сообщения об успехе
+        new_status = obj.status
+        obj.status = form.initial['status']
+        if not obj.transition(new_status, assigned_executor=obj.assigned_executor):
+            raise TransitionNotAllowed(f'Заказ #{obj.pk} изменен другим запросом.')
+        changed_fields = [
+            field for field in form.changed_data
+            if field not in ('status', 'assigned_executor', 'loaded_status')
+        ]
+        if changed_fields:
+            obj.save(update_fields=changed_fields + ['updated_at'])
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск идет по тому же GIN-индексу, что и на сайте, вместо ILIKE '%...%'
+        if not search_term.strip():
+            return queryset, False
+        return search_orders(queryset, search_term, rank=False), False
 
 
 @admin.register(Bid)
-class BidAdmin(ExportActionMixin, admin.ModelAdmin):  # ← было admin.ModelAdmin
+class BidAdmin(ScalableChangeListMixin, BackgroundExportMixin, StreamingExportMixin, ImportMixin, ExportActionMixin, admin.ModelAdmin):  # ← было admin.ModelAdmin
     resource_class = BidResource
     list_display = ('order', 'executor', 'price_proposal', 'created_at')
-    list_filter = ('created_at', 'executor')
-    raw_id_fields = ('order', 'executor')
\ No newline at end of file
+    list_filter = ('created_at', ('executor', AutocompleteFilter))
+    list_select_related = ('order', 'executor')
+    raw_id_fields = ('order', 'executor')
+
+
+@admin.register(Review)
+class ReviewAdmin(ScalableChangeListMixin, admin.ModelAdmin):
+    list_display = ('order', 'executor', 'customer', 'rating', 'created_at')
+    list_filter = ('rating', 'created_at', ('executor', AutocompleteFilter))
+    list_select_related = ('order', 'executor', 'customer')
+    raw_id_fields = ('order', 'customer', 'executor')
+
+    def get_readonly_fields(self, request, obj=None):
+        # Рейтинг исполнителя учитывает отзыв по исходным заказу и исполнителю
+        if obj is not None:
+            return ('order', 'customer', 'executor')
+        return ()
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(ScalableChangeListMixin, admin.ModelAdmin):
+    list_display = ('executor', 'keywords', 'min_budget', 'max_deadline', 'created_at')
+    list_filter = ('created_at', ('executor', AutocompleteFilter))
+    list_select_related = ('executor',)
+    search_fields = ('keywords',)
+    raw_id_fields = ('executor',)
@@ -0,0 +1,235 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import Max
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import condition, require_safe
+
+from accounts.models import UserProfile
+from core.cache import get_changed_at, get_generation
+from core.pagination import KeysetPaginator
+from .models import Order
+
+# Поля ресурсов API: имя поля -> (поля модели для only(), функция получения значения).
+# Клиент может запросить подмножество через ?fields=id,title,...
+
+ORDER_FIELDS = {
+    'id': (['id'], lambda order: order.id),
+    'title': (['title'], lambda order: order.title),
+    'description': (['description'], lambda order: order.description),
+    'status': (['status'], lambda order: order.status),
+    'budget': (['budget'], lambda order: order.budget),
+    'deadline': (['deadline'], lambda order: order.deadline),
+    'customer': (['customer__username'], lambda order: order.customer.username),
+    'assigned_executor': (
+        ['assigned_executor__username'],
+        lambda order: order.assigned_executor.username if order.assigned_executor else None,
+    ),
+    'bid_count': (['bid_count'], lambda order: order.bid_count),
+    'min_price_proposal': (['min_price_proposal'], lambda order: order.min_price_proposal),
+    'last_bid_at': (['last_bid_at'], lambda order: order.last_bid_at),
+    'created_at': (['created_at'], lambda order: order.created_at),
+    'updated_at': (['updated_at'], lambda order: order.updated_at),
+}
+
+BID_FIELDS = {
+    'id': (['id'], lambda bid: bid.id),
+    'executor': (['executor__username'], lambda bid: bid.executor.username),
+    'message': (['message'], lambda bid: bid.message),
+    'price_proposal': (['price_proposal'], lambda bid: bid.price_proposal),
+    'created_at': (['created_at'], lambda bid: bid.created_at),
+}
+
+EXECUTOR_FIELDS = {
+    'id': (['id'], lambda profile: profile.id),
+    'username': (['user__username'], lambda profile: profile.user.username),
+    'specialization': (['specialization'], lambda profile: profile.specialization),
+    'rating': (['rating'], lambda profile: profile.rating),
+    'portfolio': (['portfolio'], lambda profile: profile.portfolio),
+    'updated_at': (['updated_at'], lambda profile: profile.updated_at),
+}
+
+
+class InvalidFields(Exception):
+    pass
+
+
+def api_error(message, status):
+    return JsonResponse({'detail': message}, status=status)
+
+
+def api_view(view_func):
+    """Обертка для представлений API: только GET/HEAD, ошибки в виде JSON"""
+    @require_safe
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except InvalidFields as e:
+            return api_error(str(e), 400)
+        except Http404 as e:
+            return api_error(str(e), 404)
+    return wrapper
+
+
+def api_login_required(view_func):
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return api_error('Требуется аутентификация.', 401)
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def requested_fields(request, available, extra=()):
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(available) + list(extra)
+
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in available and field not in extra]
+    if unknown:
+        raise InvalidFields(f'Неизвестные поля: {", ".join(unknown)}')
+    return fields
+
+
+def only_fields(fields, available, always=('id',)):
+    columns = list(always)
+    for field in fields:
+        if field in available:
+            columns.extend(available[field][0])
+    return columns
+
+
+def select_fields(queryset, columns):
+    """only() по нужным колонкам и select_related только для запрошенных связей"""
+    relations = {column.rsplit('__', 1)[0] for column in columns if '__' in column}
+    return queryset.select_related(*relations).only(*columns)
+
+
+def serialize(obj, fields, available):
+    return {field: available[field][1](obj) for field in fields if field in available}
+
+
+def make_etag(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def cached_validators(compute):
+    """
+    Валидаторы для condition(): вычисляются один раз на запрос и общие для
+    etag_func и last_modified_func. Возвращают (etag, last_modified).
+    """
+    def validators(request, *args, **kwargs):
+        if not hasattr(request, '_api_validators'):
+            request._api_validators = compute(request, *args, **kwargs)
+        return request._api_validators
+    return validators
+
+
+# === Список открытых заказов ===
+
+def last_modified_of(queryset, model):
+    """
+    MAX(updated_at) выборки, но не раньше последнего изменения поколения модели:
+    удаленный или покинувший выборку объект не меняет MAX(updated_at).
+    """
+    last_modified = queryset.aggregate(last=Max('updated_at'))['last']
+    changed_at = get_changed_at(model)
+    if changed_at is not None and (last_modified is None or changed_at > last_modified):
+        return changed_at
+    return last_modified
+
+
+def _order_list_validators(request):
+    # Дешевая проверка по индексу (status, updated_at); удаление заказа и переходы
+    # по статусам (orders.signals) меняют поколение модели
+    last_modified = last_modified_of(Order.objects.filter(status='open'), Order)
+    etag = make_etag('orders', last_modified, get_generation(Order), request.GET.urlencode())
+    return etag, last_modified
+
+
+order_list_validators = cached_validators(_order_list_validators)
+
+
+@api_view
+@condition(
+    etag_func=lambda request: order_list_validators(request)[0],
+    last_modified_func=lambda request: order_list_validators(request)[1],
+)
+def order_list(request):
+    fields = requested_fields(request, ORDER_FIELDS)
+    orders = select_fields(Order.objects.filter(status='open'), only_fields(fields, ORDER_FIELDS, always=('id', 'created_at')))
+
+    page = KeysetPaginator(orders, ('-created_at', '-id'), settings.ORDERS_PAGE_SIZE).get_page(request.GET.get('cursor'))
+    return JsonResponse({
+        'results': [serialize(order, fields, ORDER_FIELDS) for order in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+# === Заказ с откликами ===
+
+def _order_detail_validators(request, order_id):
+    updated_at = Order.objects.filter(pk=order_id).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        raise Http404('Заказ не найден.')
+    # Отклики меняют updated_at заказа (см. orders.bid_stats), поэтому входят в тот же валидатор
+    return make_etag('order', order_id, updated_at, request.GET.urlencode()), updated_at
+
+
+order_detail_validators = cached_validators(_order_detail_validators)
+
+
+@api_view
+@api_login_required
+@condition(
+    etag_func=lambda request, order_id: order_detail_validators(request, order_id)[0],
+    last_modified_func=lambda request, order_id: order_detail_validators(request, order_id)[1],
+)
+def order_detail(request, order_id):
+    fields = requested_fields(request, ORDER_FIELDS, extra=('bids',))
+    try:
+        order = select_fields(Order.objects.all(), only_fields(fields, ORDER_FIELDS)).get(pk=order_id)
+    except Order.DoesNotExist:
+        raise Http404('Заказ не найден.')
+
+    data = serialize(order, fields, ORDER_FIELDS)
+    if 'bids' in fields:
+        bids = select_fields(
+            order.bids.order_by('created_at', 'id'), only_fields(BID_FIELDS, BID_FIELDS, always=('id', 'order'))
+        )
+        data['bids'] = [serialize(bid, BID_FIELDS, BID_FIELDS) for bid in bids]
+    return JsonResponse(data)
+
+
+# === Исполнители ===
+
+def _executor_list_validators(request):
+    last_modified = last_modified_of(UserProfile.objects.filter(role='executor'), UserProfile)
+    etag = make_etag('executors', last_modified, get_generation(UserProfile), request.GET.urlencode())
+    return etag, last_modified
+
+
+executor_list_validators = cached_validators(_executor_list_validators)
+
+
+@api_view
+@condition(
+    etag_func=lambda request: executor_list_validators(request)[0],
+    last_modified_func=lambda request: executor_list_validators(request)[1],
+)
+def executor_list(request):
+    fields = requested_fields(request, EXECUTOR_FIELDS)
+    executors = select_fields(
+        UserProfile.objects.filter(role='executor'), only_fields(fields, EXECUTOR_FIELDS, always=('id', 'rating'))
+    )
+
+    page = KeysetPaginator(executors, ('-rating', '-id'), settings.EXECUTORS_PAGE_SIZE).get_page(request.GET.get('cursor'))
+    return JsonResponse({
+        'results': [serialize(profile, fields, EXECUTOR_FIELDS) for profile in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
@@ -0,0 +1,152 @@
+"""
+Нативные async-версии читающих представлений для запуска под ASGI.
+
+Маршруты переключаются на них настройкой ASYNC_VIEWS (включена в asgi.py).
+Весь запрос к БД выполняется через асинхронный ORM до рендеринга шаблона:
+шаблон получает только загруженные объекты.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, render
+
+from accounts.models import UserProfile
+from core.asynchronous import aload_user
+from core.cache import aget_generation
+from core.events import get_broker
+from core.pagination import KeysetPaginator, OffsetPaginator
+from . import views
+from .events import order_channel
+from .forms import BidForm, ReviewForm
+from .matching import suggest_executors
+from .models import Bid, Order, Review
+from .search import search_executors, search_orders
+from .views import ORDER_FEED_ORDERING
+from .workflow import ORDER_WORKFLOW
+
+
+async def order_list(request):
+    await aload_user(request)
+    orders = Order.objects.filter(status='open').select_related('customer')
+    query = request.GET.get('q', '').strip()
+
+    if query:
+        results = search_orders(orders, query)
+        page = await OffsetPaginator(results, settings.ORDERS_PAGE_SIZE).aget_page(request.GET.get('page'))
+    else:
+        paginator = KeysetPaginator(orders, ORDER_FEED_ORDERING, settings.ORDERS_PAGE_SIZE)
+        page = await paginator.aget_page(request.GET.get('cursor'))
+
+    context = {
+        'orders': page.object_list,
+        'page': page,
+        'query': query,
+        'cache_generation': await aget_generation(Order),
+    }
+    return render(request, 'orders/order_list.html', context)
+
+
+async def executor_list(request):
+    await aload_user(request)
+    executors = UserProfile.objects.filter(role='executor').select_related('user')
+
+    specialization = request.GET.get('specialization', '').strip()
+    if specialization:
+        executors = executors.filter(specialization__icontains=specialization)
+
+    query = request.GET.get('q', '').strip()
+    executors = search_executors(executors, query)
+
+    paginator = KeysetPaginator(executors, ('-rating', '-id'), settings.EXECUTORS_PAGE_SIZE)
+    page = await paginator.aget_page(request.GET.get('cursor'))
+
+    context = {
+        'executors': page.object_list,
+        'page': page,
+        'query': query,
+        'specialization': specialization,
+        'cache_generation': await aget_generation(UserProfile),
+    }
+    return render(request, 'orders/executor_list.html', context)
+
+
+@login_required
+async def order_detail(request, order_id):
+    # Отклики и смена статуса остаются в синхронном представлении
+    if request.method != 'GET':
+        return await sync_to_async(views.order_detail)(request, order_id)
+
+    user = await aload_user(request)
+    order = await aget_object_or_404(
+        Order.objects.select_related('customer', 'assigned_executor'), id=order_id
+    )
+
+    is_customer = user == order.customer
+    is_executor = user.profile.role == 'executor'
+    is_assigned_executor = user == order.assigned_executor
+
+    bids = [bid async for bid in order.bids.all().select_related('executor__profile')]
+
+    user_can_bid = False
+    bid_form = None
+    if is_executor:
+        user_can_bid = not await Bid.objects.filter(order=order, executor=user).aexists()
+        bid_form = BidForm() if user_can_bid else None
+
+    review = await Review.objects.filter(order=order).afirst()
+    suggested_executors = []
+    if is_customer and order.status == 'open':
+        suggested_executors = await sync_to_async(suggest_executors)(order)
+
+    context = {
+        'order': order,
+        'bids': bids,
+        'is_customer': is_customer,
+        'is_executor': is_executor,
+        'is_assigned_executor': is_assigned_executor,
+        'user_can_bid': user_can_bid,
+        'bid_form': bid_form,
+        'review': review,
+        'review_form': ReviewForm() if views.can_leave_review(order, is_customer, review) else None,
+        'suggested_executors': suggested_executors,
+        'bidders_for_selection': [(bid.executor.id, bid.executor.username) for bid in bids] if is_customer else [],
+        'allowed_status_transitions': ORDER_WORKFLOW.status_choices(order.status) if is_customer or is_assigned_executor else (),
+    }
+    return render(request, 'orders/order_detail.html', context)
+
+
+# === Поток событий заказа (server-sent events) ===
+
+def format_sse(event):
+    return f'event: {event["type"]}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n'
+
+
+async def stream_order_events(order_id):
+    async with get_broker().subscribe(order_channel(order_id)) as subscription:
+        # Интервал переподключения EventSource после обрыва соединения
+        yield f'retry: {settings.SSE_RETRY_INTERVAL * 1000}\n\n'
+        while True:
+            event = await subscription.get(timeout=settings.SSE_KEEPALIVE_INTERVAL)
+            # Комментарий не дает прокси закрыть простаивающее соединение
+            yield format_sse(event) if event is not None else ': keepalive\n\n'
+
+
+@login_required
+async def order_events(request, order_id):
+    """Новые отклики и смена статуса/исполнителя заказа; страница заказа подписывается через EventSource"""
+    # Под WSGI бесконечный поток занял бы рабочий процесс целиком. Ответ 204
+    # сообщает EventSource, что переподключаться не нужно
+    if not settings.ASYNC_VIEWS:
+        return HttpResponse(status=204)
+
+    if not await Order.objects.filter(pk=order_id).aexists():
+        raise Http404('Заказ не найден.')
+
+    response = StreamingHttpResponse(stream_order_events(order_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx не должен буферизовать поток
+    response['X-Accel-Buffering'] = 'no'
+    return response
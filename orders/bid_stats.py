@@ -0,0 +1,149 @@
+from decimal import Decimal
+
+from django.db import NotSupportedError, connections
+from django.db.models import Aggregate, Case, Count, F, FloatField, Max, Min, OuterRef, Q, QuerySet, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Bid, Order
+
+# Денормализованные поля заказа (bid_count, min_price_proposal, last_bid_at)
+# меняются одним UPDATE с F-выражениями, без чтения строки заказа в Python.
+# updated_at тоже обновляется: отклики являются частью заказа для кешей и ETag.
+
+
+def _bid_subquery(aggregate):
+    return Subquery(
+        Bid.objects.filter(order=OuterRef('pk'))
+        .order_by()
+        .values('order')
+        .annotate(value=aggregate)
+        .values('value')[:1]
+    )
+
+
+def register_bid(bid):
+    """Учитывает новый отклик в статистике заказа"""
+    updates = {
+        'bid_count': F('bid_count') + 1,
+        'last_bid_at': bid.created_at,
+        'updated_at': timezone.now(),
+    }
+    if bid.price_proposal is not None:
+        price_field = Order._meta.get_field('min_price_proposal')
+        price = price_field.to_python(bid.price_proposal)
+        updates['min_price_proposal'] = Case(
+            When(
+                Q(min_price_proposal__isnull=True) | Q(min_price_proposal__gt=price),
+                then=Value(price, output_field=price_field),
+            ),
+            default=F('min_price_proposal'),
+        )
+    Order.objects.filter(pk=bid.order_id).update(**updates)
+
+
+def unregister_bid(bid):
+    """Убирает удаленный отклик из статистики заказа"""
+    Order.objects.filter(pk=bid.order_id).update(
+        bid_count=F('bid_count') - 1,
+        min_price_proposal=_bid_subquery(Min('price_proposal')),
+        last_bid_at=_bid_subquery(Max('created_at')),
+        updated_at=timezone.now(),
+    )
+
+
+def refresh_min_price(order_id):
+    """Пересчитывает минимальную цену после изменения существующего отклика"""
+    Order.objects.filter(pk=order_id).update(
+        min_price_proposal=_bid_subquery(Min('price_proposal')),
+        updated_at=timezone.now(),
+    )
+
+
+def is_order_deletion(origin):
+    """Удаление отклика вызвано каскадным удалением самого заказа"""
+    if isinstance(origin, QuerySet):
+        return origin.model is Order
+    return isinstance(origin, Order)
+
+
+def recompute_bid_stats(order_ids=None, batch_size=1000):
+    """
+    Полный пересчет статистики откликов пачками по batch_size заказов.
+
+    Заказы перебираются по возрастанию id, каждая пачка обновляется
+    одним UPDATE с коррелированными подзапросами. Возвращает число
+    обработанных заказов.
+    """
+    orders = Order.objects.order_by('pk')
+    if order_ids is not None:
+        orders = orders.filter(pk__in=order_ids)
+
+    processed = 0
+    last_id = 0
+    while True:
+        batch = list(orders.filter(pk__gt=last_id).values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return processed
+
+        Order.objects.filter(pk__in=batch).update(
+            bid_count=Coalesce(_bid_subquery(Count('pk')), 0),
+            min_price_proposal=_bid_subquery(Min('price_proposal')),
+            last_bid_at=_bid_subquery(Max('created_at')),
+            updated_at=timezone.now(),
+        )
+        processed += len(batch)
+        last_id = batch[-1]
+
+
+class Median(Aggregate):
+    """Медиана (PERCENTILE_CONT(0.5)); есть только в PostgreSQL"""
+
+    function = 'PERCENTILE_CONT'
+    name = 'Median'
+    template = '%(function)s(0.5) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        if connection.vendor != 'postgresql':
+            raise NotSupportedError('Median поддерживается только в PostgreSQL.')
+        return super().as_sql(compiler, connection, **extra_context)
+
+
+def _offset_median(bids, priced_count):
+    """Медиана по одной-двум средним строкам отсортированных цен (для СУБД без PERCENTILE_CONT)"""
+    if not priced_count:
+        return None
+    start = (priced_count - 1) // 2
+    prices = list(
+        bids.filter(price_proposal__isnull=False)
+        .order_by('price_proposal')
+        .values_list('price_proposal', flat=True)[start:priced_count // 2 + 1]
+    )
+    return sum(prices) / len(prices)
+
+
+def bid_price_summary(order_id):
+    """
+    Сводка по откликам заказа: количество, минимальная, медианная и
+    максимальная предложенная цена.
+
+    В PostgreSQL считается одним агрегирующим запросом; на других СУБД
+    медиана выбирается отдельным запросом по смещению.
+    """
+    bids = Bid.objects.filter(order_id=order_id)
+    aggregates = {
+        'count': Count('pk'),
+        'min_price': Min('price_proposal'),
+        'max_price': Max('price_proposal'),
+    }
+    if connections[bids.db].vendor == 'postgresql':
+        summary = bids.aggregate(median_price=Median('price_proposal'), **aggregates)
+        if summary['median_price'] is not None:
+            summary['median_price'] = Decimal(str(summary['median_price'])).quantize(Decimal('0.01'))
+        return summary
+
+    summary = bids.aggregate(priced_count=Count('price_proposal'), **aggregates)
+    median = _offset_median(bids, summary.pop('priced_count'))
+    summary['median_price'] = median.quantize(Decimal('0.01')) if median is not None else None
+    return summary
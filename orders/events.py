@@ -0,0 +1,50 @@
+from django.db import transaction
+
+from core.events import get_broker
+from .workflow import ORDER_WORKFLOW
+
+# События заказа для потока server-sent events (см. orders.async_views.order_events).
+# Публикуются после фиксации транзакции: подписчики не должны видеть
+# изменений, которые затем откатились.
+
+
+def order_channel(order_id):
+    return f'order:{order_id}'
+
+
+def _publish_on_commit(order_id, event):
+    transaction.on_commit(lambda: get_broker().publish(order_channel(order_id), event))
+
+
+def _username(user):
+    return user.get_username() if user is not None else None
+
+
+def publish_bid(bid):
+    """Новый отклик: executor загружен представлением вместе с профилем"""
+    profile = getattr(bid.executor, 'profile', None)
+    _publish_on_commit(bid.order_id, {
+        'type': 'bid',
+        'id': bid.pk,
+        'executor_id': bid.executor_id,
+        'executor': _username(bid.executor),
+        'specialization': profile.specialization if profile else '',
+        'message': bid.message,
+        'price_proposal': str(bid.price_proposal) if bid.price_proposal is not None else None,
+        'created_at': bid.created_at.isoformat(),
+    })
+
+
+def publish_order_state(order_ids, status, changes=None):
+    """
+    Смена статуса или исполнителя.
+
+    Переходы выполняются через UPDATE без сигналов, поэтому событие строится
+    из переданных значений без повторного чтения заказа. Исполнитель входит
+    в событие, только если он менялся.
+    """
+    event = {'type': 'order', 'status': status, 'status_display': ORDER_WORKFLOW.labels[status]}
+    if changes and 'assigned_executor' in changes:
+        event['assigned_executor'] = _username(changes['assigned_executor'])
+    for order_id in order_ids:
+        _publish_on_commit(order_id, event)
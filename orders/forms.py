@@ -1,6 +1,9 @@
 from django import forms
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
-from .models import Order, Bid
+from .models import Order, Bid, Review, SavedSearch
+from .workflow import ORDER_WORKFLOW
 
 
 class OrderForm(forms.ModelForm):
@@ -21,6 +24,58 @@ class OrderForm(forms.ModelForm):
         return budget
 
 
+class OrderAdminForm(forms.ModelForm):
+    """Форма заказа в админке: статус меняется только по допустимым переходам"""
+
+    # Статус на момент открытия формы: смена статуса не сохраняется, если
+    # заказ с тех пор изменил другой запрос
+    loaded_status = forms.CharField(widget=forms.HiddenInput, required=False)
+
+    class Meta:
+        model = Order
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk is not None and 'status' in self.fields:
+            self.fields['status'].choices = ORDER_WORKFLOW.transition_choices(self.instance.status)
+            self.fields['loaded_status'].initial = self.instance.status
+
+    def clean(self):
+        cleaned_data = super().clean()
+        status = cleaned_data.get('status')
+        if self.instance.pk is not None and 'status' in self.changed_data and status:
+            self.check_status_not_changed(cleaned_data.get('loaded_status'))
+            for field in ORDER_WORKFLOW.requires.get(status, ()):
+                if cleaned_data.get(field) is None:
+                    self.add_error(field, f'Обязательно для статуса «{ORDER_WORKFLOW.labels[status]}».')
+        return cleaned_data
+
+    def check_status_not_changed(self, loaded_status):
+        orders = Order.objects.filter(pk=self.instance.pk)
+        # Админка сохраняет объект в той же транзакции, что и проверяет форму:
+        # блокировка строки не дает другому запросу сменить статус до перехода
+        if transaction.get_connection(orders.db).in_atomic_block:
+            orders = orders.select_for_update()
+        current = orders.values_list('status', flat=True).first()
+        if current != self.instance.status or (loaded_status and loaded_status != current):
+            raise forms.ValidationError(
+                f'Заказ изменен другим запросом, текущий статус — «{ORDER_WORKFLOW.labels.get(current, current)}». '
+                'Обновите страницу и повторите изменение.',
+                code='stale',
+            )
+
+
+class BulkOrderStatusForm(forms.Form):
+    # Перевод в работу требует выбора исполнителя, поэтому массово недоступен
+    new_status = forms.ChoiceField(choices=ORDER_WORKFLOW.bulk_choices, label='Новый статус')
+    orders = forms.ModelMultipleChoiceField(queryset=Order.objects.none(), label='Заказы')
+
+    def __init__(self, *args, customer=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['orders'].queryset = Order.objects.filter(customer=customer).only('id', 'title', 'status')
+
+
 class BidForm(forms.ModelForm):
     class Meta:
         model = Bid
@@ -30,4 +85,37 @@ class BidForm(forms.ModelForm):
         price_proposal = self.cleaned_data.get('price_proposal')
         if price_proposal is not None and price_proposal < 1000:
             raise forms.ValidationError('Предлагаемая цена должна быть не менее 1000.')
-        return price_proposal
\ No newline at end of file
+        return price_proposal
+
+
+class ReviewForm(forms.ModelForm):
+    class Meta:
+        model = Review
+        fields = ['rating', 'comment']
+        widgets = {
+            'rating': forms.RadioSelect,
+            'comment': forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}),
+        }
+
+
+class SavedSearchForm(forms.ModelForm):
+    class Meta:
+        model = SavedSearch
+        fields = ['keywords', 'min_budget', 'max_deadline']
+        widgets = {
+            'keywords': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'например, django api'}),
+            'min_budget': forms.NumberInput(attrs={'class': 'form-control'}),
+            'max_deadline': forms.DateTimeInput(attrs={'class': 'form-control', 'type': 'datetime-local'}),
+        }
+
+    def __init__(self, *args, executor=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executor = executor
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if SavedSearch.objects.filter(executor=self.executor).count() >= settings.SAVED_SEARCHES_PER_EXECUTOR:
+            raise forms.ValidationError(
+                f'Можно сохранить не более {settings.SAVED_SEARCHES_PER_EXECUTOR} поисков. Удалите ненужные.'
+            )
+        return cleaned_data
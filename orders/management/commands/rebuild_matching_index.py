@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from orders.matching import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает индекс подбора исполнителей по специализации и портфолио профилей'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Количество профилей в одной транзакции')
+
+    def handle(self, *args, batch_size, **options):
+        processed = rebuild_index(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Индекс подбора обновлен для {processed} профилей'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from orders.bid_stats import recompute_bid_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает количество откликов, минимальную цену и дату последнего отклика у заказов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Количество заказов в одном UPDATE')
+        parser.add_argument('--order', type=int, action='append', dest='order_ids', help='Пересчитать только указанные заказы')
+
+    def handle(self, *args, batch_size, order_ids, **options):
+        processed = recompute_bid_stats(order_ids=order_ids, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Статистика откликов пересчитана для {processed} заказов'))
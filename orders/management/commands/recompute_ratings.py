@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from orders.ratings import recompute_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сумму, количество оценок и рейтинг исполнителей по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Количество профилей в одном UPDATE')
+        parser.add_argument('--executor', type=int, action='append', dest='executor_ids', help='Пересчитать только указанных исполнителей (id пользователя)')
+
+    def handle(self, *args, batch_size, executor_ids, **options):
+        processed = recompute_ratings(executor_ids=executor_ids, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Рейтинг пересчитан для {processed} исполнителей'))
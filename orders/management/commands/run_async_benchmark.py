@@ -0,0 +1,97 @@
+import asyncio
+import json
+import time
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient
+from django.urls import reverse
+
+from core.asynchronous import async_views_enabled
+from orders.models import Order
+from .run_benchmark import percentile
+
+SCENARIOS = ('order_list', 'executor_list', 'order_detail', 'profile')
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение синхронных и нативных async-представлений под ASGI-обработчиком Django. '
+        'Медленные клиенты моделируются паузой между запросами каждого из --concurrency '
+        'одновременных клиентов. Печатает JSON с p50/p95/p99 и пропускной способностью для обоих режимов. '
+        'Измерение идет в одном процессе; для цифр сервера запускайте ASGI-сервер отдельно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help='Количество запросов на клиента')
+        parser.add_argument('--concurrency', type=int, default=20, help='Количество одновременных клиентов')
+        parser.add_argument('--client-delay', type=float, default=50, help='Пауза клиента между запросами, мс')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='Запустить только указанные сценарии')
+        parser.add_argument('--mode', choices=('sync', 'async'), action='append', dest='modes', help='Режим представлений')
+        parser.add_argument('--host', default='localhost', help='Значение заголовка Host')
+        parser.add_argument('--output', help='Сохранить отчет в файл')
+
+    def handle(self, *args, **options):
+        self.host = options['host']
+        self.customer = User.objects.filter(profile__role='customer').order_by('pk').first()
+        self.order = Order.objects.filter(customer=self.customer).order_by('-bid_count', 'pk').first()
+        if not (self.customer and self.order):
+            raise CommandError('Нет данных для прогона: сначала выполните manage.py seed_data')
+
+        selected = options['scenarios'] or list(SCENARIOS)
+        unknown = set(selected) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Неизвестные сценарии: {", ".join(sorted(unknown))}')
+
+        report = {}
+        for mode in options['modes'] or ['sync', 'async']:
+            with async_views_enabled(mode == 'async'):
+                urls = self.urls()
+                report[mode] = {
+                    name: async_to_sync(self.run)(
+                        urls[name], options['concurrency'], options['requests'], options['client_delay'] / 1000,
+                    )
+                    for name in selected
+                }
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    def urls(self):
+        return {
+            'order_list': reverse('order_list'),
+            'executor_list': reverse('executor_list'),
+            'order_detail': reverse('order_detail', args=[self.order.pk]),
+            'profile': reverse('profile'),
+        }
+
+    async def run(self, url, concurrency, count, delay):
+        latencies = []
+
+        async def slow_client():
+            client = AsyncClient(headers={'host': self.host})
+            await client.aforce_login(self.customer)
+            for _ in range(count):
+                request_started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append((time.perf_counter() - request_started) * 1000)
+                if response.status_code >= 400:
+                    raise CommandError(f'Ответ {response.status_code} при прогоне {url}')
+                await asyncio.sleep(delay)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(slow_client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'p50_ms': round(percentile(latencies, 0.50), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        }
@@ -0,0 +1,142 @@
+import json
+import math
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from core.instrumentation import collect_stats
+from orders.models import Order
+
+
+def percentile(sorted_values, fraction):
+    """Процентиль методом ближайшего ранга"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон основных сценариев через тестовый клиент Django. '
+        'Печатает JSON с p50/p95/p99, пропускной способностью и числом SQL-запросов на запрос. '
+        'Сценарии записи создают заказы и отклики в текущей базе.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Количество запросов на сценарий')
+        parser.add_argument('--warmup', type=int, default=10, help='Количество прогревочных запросов')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='Запустить только указанные сценарии')
+        parser.add_argument('--read-only', action='store_true', help='Пропустить сценарии, изменяющие данные')
+        parser.add_argument('--host', default='localhost', help='Значение заголовка Host')
+        parser.add_argument('--output', help='Сохранить отчет в файл')
+
+    def handle(self, *args, **options):
+        self.host = options['host']
+        self.customer = User.objects.filter(profile__role='customer').order_by('pk').first()
+        self.executor = User.objects.filter(profile__role='executor').order_by('pk').first()
+        self.order = Order.objects.filter(status='open').order_by('-bid_count', 'pk').first()
+        if not (self.customer and self.executor and self.order):
+            raise CommandError('Нет данных для прогона: сначала выполните manage.py seed_data')
+
+        scenarios = {
+            'order_list': self.order_list,
+            'executor_list': self.executor_list,
+            'order_detail': self.order_detail,
+            'create_order': self.create_order,
+            'submit_bid': self.submit_bid,
+        }
+        write_scenarios = {'create_order', 'submit_bid'}
+
+        selected = options['scenarios'] or list(scenarios)
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            raise CommandError(f'Неизвестные сценарии: {", ".join(sorted(unknown))}')
+        if options['read_only']:
+            selected = [name for name in selected if name not in write_scenarios]
+
+        report = {}
+        for name in selected:
+            report[name] = self.run(scenarios[name], options['requests'], options['warmup'])
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    def client(self, user=None):
+        client = Client(HTTP_HOST=self.host)
+        if user is not None:
+            client.force_login(user)
+        return client
+
+    def run(self, scenario, count, warmup):
+        requests = scenario(count + warmup)
+        for request in requests[:warmup]:
+            request()
+
+        latencies = []
+        queries = 0
+        started = time.perf_counter()
+        for request in requests[warmup:]:
+            with collect_stats() as stats:
+                request_started = time.perf_counter()
+                response = request()
+                latencies.append((time.perf_counter() - request_started) * 1000)
+            if response.status_code >= 400:
+                raise CommandError(f'Ответ {response.status_code} при прогоне сценария')
+            queries += stats.queries
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'p50_ms': round(percentile(latencies, 0.50), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            'queries_per_request': round(queries / len(latencies), 2) if latencies else 0.0,
+        }
+
+    # Каждый сценарий возвращает список вызываемых объектов, по одному на запрос
+
+    def order_list(self, count):
+        client = self.client()
+        url = reverse('order_list')
+        return [lambda: client.get(url)] * count
+
+    def executor_list(self, count):
+        client = self.client()
+        url = reverse('executor_list')
+        return [lambda: client.get(url)] * count
+
+    def order_detail(self, count):
+        client = self.client(self.order.customer)
+        url = reverse('order_detail', args=[self.order.pk])
+        return [lambda: client.get(url)] * count
+
+    def create_order(self, count):
+        client = self.client(self.customer)
+        url = reverse('create_order')
+        data = {'title': 'Нагрузочный заказ', 'description': 'Создан run_benchmark', 'budget': '5000'}
+        return [lambda: client.post(url, data)] * count
+
+    def submit_bid(self, count):
+        # Каждый отклик подается на новый заказ: повторный отклик того же исполнителя запрещен
+        client = self.client(self.executor)
+        order_ids = list(
+            Order.objects.filter(status='open').exclude(bids__executor=self.executor).values_list('pk', flat=True)[:count]
+        )
+        if len(order_ids) < count:
+            raise CommandError('Недостаточно открытых заказов для сценария submit_bid')
+
+        data = {'message': 'Готов выполнить', 'price_proposal': '4000'}
+        return [
+            lambda url=reverse('order_detail', args=[order_id]): client.post(url, data)
+            for order_id in order_ids
+        ]
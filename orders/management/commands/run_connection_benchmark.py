@@ -0,0 +1,126 @@
+import copy
+import json
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from django.urls import reverse
+
+from orders.models import Order
+from .run_benchmark import percentile
+
+SCENARIOS = ('order_list', 'order_detail', 'profile')
+
+
+class Command(BaseCommand):
+    help = (
+        'Вклад установки соединения с БД во время запроса: прогон сценариев с новым соединением '
+        'на каждый запрос (CONN_MAX_AGE=0, без пула) и с соединениями из настроек (постоянное '
+        'соединение или пул psycopg). Печатает JSON с p50/p95/p99 запроса и временем получения '
+        'соединения для обоих режимов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Количество запросов на сценарий')
+        parser.add_argument('--warmup', type=int, default=10, help='Количество прогревочных запросов')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='Запустить только указанные сценарии')
+        parser.add_argument('--host', default='localhost', help='Значение заголовка Host')
+        parser.add_argument('--output', help='Сохранить отчет в файл')
+
+    def handle(self, *args, **options):
+        self.host = options['host']
+        self.customer = User.objects.filter(profile__role='customer').order_by('pk').first()
+        self.order = Order.objects.filter(customer=self.customer).order_by('-bid_count', 'pk').first()
+        if not (self.customer and self.order):
+            raise CommandError('Нет данных для прогона: сначала выполните manage.py seed_data')
+
+        selected = options['scenarios'] or list(SCENARIOS)
+        unknown = set(selected) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Неизвестные сценарии: {", ".join(sorted(unknown))}')
+
+        # Сценарий: URL и пользователь (None — анонимный запрос)
+        scenarios = {
+            'order_list': (reverse('order_list'), None),
+            'order_detail': (reverse('order_detail', args=[self.order.pk]), self.customer),
+            'profile': (reverse('profile'), self.customer),
+        }
+        configured = connections[DEFAULT_DB_ALIAS]
+        per_request = self.per_request_connection(configured)
+
+        report = {'settings': self.describe(configured.settings_dict)}
+        for mode, connection in (('per_request', per_request), ('configured', configured)):
+            report[mode] = {
+                name: self.run(connection, *scenarios[name], options['requests'], options['warmup'])
+                for name in selected
+            }
+        per_request.close()
+
+        report['saved_p50_ms'] = {
+            name: round(report['per_request'][name]['p50_ms'] - report['configured'][name]['p50_ms'], 2)
+            for name in selected
+        }
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    @staticmethod
+    def per_request_connection(connection):
+        """Копия соединения по умолчанию, которое закрывается в конце каждого запроса"""
+        settings_dict = copy.deepcopy(connection.settings_dict)
+        settings_dict['CONN_MAX_AGE'] = 0
+        settings_dict['OPTIONS'].pop('pool', None)
+        return type(connection)(settings_dict, connection.alias)
+
+    @staticmethod
+    def describe(settings_dict):
+        pool = settings_dict['OPTIONS'].get('pool')
+        return {
+            'vendor': connections[DEFAULT_DB_ALIAS].vendor,
+            'conn_max_age': settings_dict['CONN_MAX_AGE'],
+            'conn_health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+            'pool': {key: pool[key] for key in ('min_size', 'max_size') if key in pool} if pool else None,
+        }
+
+    def run(self, connection, url, user, count, warmup):
+        client = Client(headers={'host': self.host})
+        if user is not None:
+            client.force_login(user)
+        original = connections[connection.alias]
+        connections[connection.alias] = connection
+        try:
+            latencies = []
+            connect_times = []
+            for i in range(warmup + count):
+                # Тестовый клиент не вызывает close_old_connections по сигналам начала
+                # и конца запроса, поэтому соединение обслуживается так же, как ими
+                connection.close_if_unusable_or_obsolete()
+                request_started = time.perf_counter()
+                connection.ensure_connection()
+                connected = time.perf_counter()
+                response = client.get(url)
+                finished = time.perf_counter()
+                connection.close_if_unusable_or_obsolete()
+                if response.status_code >= 400:
+                    raise CommandError(f'Ответ {response.status_code} при прогоне {url}')
+                if i >= warmup:
+                    latencies.append((finished - request_started) * 1000)
+                    connect_times.append((connected - request_started) * 1000)
+        finally:
+            connections[connection.alias] = original
+
+        latencies.sort()
+        connect_times.sort()
+        return {
+            'requests': len(latencies),
+            'p50_ms': round(percentile(latencies, 0.50), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'connect_avg_ms': round(sum(connect_times) / len(connect_times), 3) if connect_times else 0.0,
+            'connect_p95_ms': round(percentile(connect_times, 0.95), 3),
+        }
@@ -0,0 +1,156 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import UserProfile
+from orders.bid_stats import recompute_bid_stats
+from orders.matching import rebuild_index
+from orders.models import Bid, Order, Review, SavedSearch
+from orders.percolator import index_searches
+from orders.ratings import recompute_ratings
+
+SPECIALIZATIONS = [
+    'Python Developer', 'Django Backend', 'Frontend React', 'Дизайнер интерфейсов',
+    'Копирайтер', 'Переводчик', 'Маркетолог', 'Мобильная разработка', 'DevOps', 'Тестировщик',
+]
+TITLE_WORDS = [
+    'Разработка', 'сайта', 'лендинга', 'интернет-магазина', 'бота', 'Дизайн', 'логотипа',
+    'перевод', 'статьи', 'API', 'Django', 'React', 'настройка', 'сервера', 'тестирование',
+]
+STATUS_WEIGHTS = {'open': 60, 'in_progress': 20, 'completed': 15, 'cancelled': 5}
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими заказчиками, исполнителями, заказами и откликами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=1000)
+        parser.add_argument('--executors', type=int, default=5000)
+        parser.add_argument('--orders', type=int, default=20000)
+        parser.add_argument('--bids-per-order', type=float, default=5.0, help='Среднее число откликов на заказ')
+        parser.add_argument('--searches-per-executor', type=float, default=2.0, help='Среднее число сохраненных поисков исполнителя')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--prefix', default='seed', help='Префикс логинов создаваемых пользователей')
+        parser.add_argument('--seed', type=int, default=None, help='Зерно генератора для воспроизводимости')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            customers = self.create_users(options['prefix'], 'customer', options['customers'])
+            executors = self.create_users(options['prefix'], 'executor', options['executors'])
+            orders = self.create_orders(customers, executors, options['orders'])
+            bids = self.create_bids(orders, executors, options['bids_per_order'])
+            reviews = self.create_reviews(orders)
+            searches = self.create_saved_searches(executors, options['searches_per_executor'])
+            # bulk_create не вызывает сигналы, поэтому статистику откликов и рейтинги считаем пачками
+            recompute_bid_stats(order_ids=[order.pk for order in orders], batch_size=self.batch_size)
+            recompute_ratings(executor_ids=[executor.pk for executor in executors], batch_size=self.batch_size)
+            rebuild_index(batch_size=self.batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: заказчиков {len(customers)}, исполнителей {len(executors)}, '
+            f'заказов {len(orders)}, откликов {bids}, отзывов {reviews}, сохраненных поисков {searches} за {time.perf_counter() - started:.1f} с'
+        ))
+
+    def create_users(self, prefix, role, count):
+        # Хеш пароля считается один раз: PBKDF2 на каждого пользователя занял бы минуты
+        password = make_password(f'{prefix}-password')
+        start = User.objects.filter(username__startswith=f'{prefix}_{role}_').count()
+        users = User.objects.bulk_create(
+            [
+                User(username=f'{prefix}_{role}_{start + i}', email=f'{prefix}_{role}_{start + i}@example.com', password=password)
+                for i in range(count)
+            ],
+            batch_size=self.batch_size,
+        )
+
+        profiles = []
+        for user in users:
+            profile = UserProfile(user=user, role=role)
+            if role == 'executor':
+                profile.specialization = self.rng.choice(SPECIALIZATIONS)
+                profile.portfolio = f'https://example.com/{user.username}'
+            profiles.append(profile)
+        UserProfile.objects.bulk_create(profiles, batch_size=self.batch_size)
+        return users
+
+    def create_orders(self, customers, executors, count):
+        # Активность заказчиков распределена по Парето: немногие создают большую часть заказов
+        weights = [self.rng.paretovariate(1.5) for _ in customers]
+        owners = self.rng.choices(customers, weights=weights, k=count)
+        statuses = self.rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=count)
+
+        orders = []
+        for customer, status in zip(owners, statuses):
+            title = ' '.join(self.rng.sample(TITLE_WORDS, 3))
+            orders.append(Order(
+                title=title,
+                description=f'{title}. ' * self.rng.randint(1, 20),
+                customer=customer,
+                status=status,
+                budget=Decimal(int(self.rng.lognormvariate(10, 0.8))).max(Decimal(1000)),
+                assigned_executor=self.rng.choice(executors) if status in ('in_progress', 'completed') else None,
+            ))
+        return Order.objects.bulk_create(orders, batch_size=self.batch_size)
+
+    def create_bids(self, orders, executors, mean_bids):
+        created = 0
+        batch = []
+        for order in orders:
+            bidders = set(self.rng.sample(executors, min(len(executors), int(self.rng.expovariate(1 / mean_bids)))))
+            if order.assigned_executor is not None:
+                bidders.add(order.assigned_executor)
+
+            budget = float(order.budget)
+            for executor in bidders:
+                batch.append(Bid(
+                    order=order,
+                    executor=executor,
+                    message='Готов выполнить',
+                    price_proposal=Decimal(int(budget * self.rng.uniform(0.6, 1.2))),
+                ))
+
+            if len(batch) >= self.batch_size:
+                Bid.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+
+        Bid.objects.bulk_create(batch)
+        return created + len(batch)
+
+    def create_reviews(self, orders):
+        # Отзывы на большую часть завершенных заказов, оценки смещены к высоким
+        reviews = [
+            Review(
+                order=order,
+                customer=order.customer,
+                executor=order.assigned_executor,
+                rating=self.rng.choices(range(1, 6), weights=[2, 3, 10, 35, 50])[0],
+            )
+            for order in orders
+            if order.status == 'completed' and self.rng.random() < 0.8
+        ]
+        Review.objects.bulk_create(reviews, batch_size=self.batch_size)
+        return len(reviews)
+
+    def create_saved_searches(self, executors, mean_searches):
+        searches = []
+        for executor in executors:
+            for _ in range(int(self.rng.expovariate(1 / mean_searches))):
+                searches.append(SavedSearch(
+                    executor=executor,
+                    keywords=' '.join(self.rng.sample(TITLE_WORDS, self.rng.randint(1, 2))),
+                    min_budget=Decimal(self.rng.choice([1000, 5000, 20000])) if self.rng.random() < 0.5 else None,
+                ))
+        searches = SavedSearch.objects.bulk_create(searches, batch_size=self.batch_size)
+        # Созданные заказы считаются уже существующими и во входящие не доставляются
+        index_searches(searches, replace=False)
+        return len(searches)
@@ -0,0 +1,212 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Sum, Value, When
+
+from accounts.models import UserProfile
+from core.cache import get_generation
+from .models import ExecutorTerm, MatchingTerm
+
+# Подбор исполнителей к заказу по текстовому сходству с учетом рейтинга.
+#
+# Профили исполнителей хранятся в разреженной матрице ExecutorTerm
+# (профиль × термин) по схеме lnc.ltc: у профиля — логарифмическая частота
+# термина с нормировкой по длине вектора, без IDF, поэтому веса профиля не
+# зависят от остальных профилей и обновляются при сохранении только его самого.
+# IDF (из числа профилей с термином, MatchingTerm) применяется к вектору заказа.
+# Косинусное сходство — сумма произведений весов по общим терминам — считается
+# в БД одним запросом по индексу term, только по строкам терминов заказа.
+
+TOKEN_RE = re.compile(r'\w+')
+MIN_TOKEN_LENGTH = 3
+# Грубый стемминг усечением: «разработка», «разработку», «разработчик» -> «разраб»
+STEM_LENGTH = 6
+STOP_WORDS = frozenset({
+    'для', 'что', 'это', 'как', 'или', 'при', 'без', 'над', 'под', 'все', 'его', 'она', 'они', 'так',
+    'уже', 'нужно', 'надо', 'очень', 'также', 'который', 'которые', 'есть', 'быть', 'будет', 'нам', 'вас',
+    'the', 'and', 'for', 'with', 'you', 'your', 'are', 'this', 'that', 'from', 'have', 'will',
+})
+
+
+def tokenize(text):
+    for word in TOKEN_RE.findall((text or '').lower()):
+        if len(word) < MIN_TOKEN_LENGTH or word.isdigit() or word in STOP_WORDS:
+            continue
+        yield word[:STEM_LENGTH]
+
+
+def term_counts(*fields):
+    """Частоты терминов; каждое поле передается парой (текст, кратность)"""
+    counts = Counter()
+    for text, factor in fields:
+        for term in tokenize(text):
+            counts[term] += factor
+    return counts
+
+
+def normalize(weights, limit):
+    """Оставляет limit самых весомых терминов и нормирует вектор до единичной длины"""
+    top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    norm = math.sqrt(sum(weight * weight for _, weight in top))
+    return {term: weight / norm for term, weight in top} if norm else {}
+
+
+def profile_vector(profile):
+    if profile.role != 'executor':
+        return {}
+    # Специализация короче портфолио, но важнее его, поэтому учитывается дважды
+    counts = term_counts((profile.specialization, 2), (profile.portfolio, 1))
+    weights = {term: 1 + math.log(count) for term, count in counts.items()}
+    return normalize(weights, settings.MATCHING_MAX_PROFILE_TERMS)
+
+
+# === Индекс ===
+
+def _reindex(vectors):
+    """Заменяет термины профилей {profile_id: вектор}, поддерживая число профилей у терминов"""
+    with transaction.atomic():
+        current = defaultdict(dict)
+        rows = ExecutorTerm.objects.filter(profile_id__in=vectors).values_list('profile_id', 'term', 'weight')
+        for profile_id, term, weight in rows:
+            current[profile_id][term] = weight
+
+        changed = [profile_id for profile_id, vector in vectors.items() if current[profile_id] != vector]
+        if not changed:
+            return 0
+
+        deltas = Counter()
+        for profile_id in changed:
+            deltas.subtract(current[profile_id].keys())
+            deltas.update(vectors[profile_id].keys())
+
+        ExecutorTerm.objects.filter(profile_id__in=changed).delete()
+        ExecutorTerm.objects.bulk_create(
+            [
+                ExecutorTerm(profile_id=profile_id, term=term, weight=weight)
+                for profile_id in changed
+                for term, weight in vectors[profile_id].items()
+            ],
+            batch_size=settings.IMPORT_BATCH_SIZE,
+        )
+
+        MatchingTerm.objects.bulk_create(
+            [MatchingTerm(term=term) for term, delta in deltas.items() if delta > 0],
+            ignore_conflicts=True,
+        )
+        # Один UPDATE с F() на каждое значение приращения: параллельные
+        # сохранения профилей не теряют изменений счетчиков
+        terms_by_delta = defaultdict(list)
+        for term, delta in deltas.items():
+            if delta:
+                terms_by_delta[delta].append(term)
+        for delta, terms in terms_by_delta.items():
+            MatchingTerm.objects.filter(term__in=terms).update(document_count=F('document_count') + delta)
+        return len(changed)
+
+
+def index_profiles(profiles):
+    """Обновляет профили в индексе; профили не исполнителей из него убираются. Возвращает число измененных"""
+    return _reindex({profile.pk: profile_vector(profile) for profile in profiles})
+
+
+def unindex_profile(profile):
+    _reindex({profile.pk: {}})
+
+
+def rebuild_index(batch_size=1000):
+    """Переиндексирует все профили пачками по batch_size (после bulk-загрузок без сигналов)"""
+    profiles = UserProfile.objects.only('id', 'role', 'specialization', 'portfolio').order_by('pk')
+    processed = 0
+    last_id = 0
+    while True:
+        batch = list(profiles.filter(pk__gt=last_id)[:batch_size])
+        if not batch:
+            return processed
+        index_profiles(batch)
+        processed += len(batch)
+        last_id = batch[-1].pk
+
+
+# === Подбор ===
+
+def executor_count():
+    return cache.get_or_set(
+        'matching:executor_count',
+        lambda: UserProfile.objects.filter(role='executor').count(),
+        settings.MATCHING_CACHE_TIMEOUT,
+    )
+
+
+def order_vector(order):
+    # Название описывает задачу точнее описания, поэтому учитывается дважды
+    counts = term_counts((order.title, 2), (order.description, 1))
+    if not counts:
+        return {}
+
+    document_counts = dict(
+        MatchingTerm.objects.filter(term__in=counts, document_count__gt=0).values_list('term', 'document_count')
+    )
+    total = max(executor_count(), 1)
+    weights = {
+        term: (1 + math.log(count)) * math.log(1 + total / document_counts[term])
+        for term, count in counts.items()
+        if term in document_counts
+    }
+    # В запрос попадают термины с наибольшим tf·idf: общие слова с длинными
+    # списками профилей отсекаются и не замедляют подсчет
+    return normalize(weights, settings.MATCHING_MAX_QUERY_TERMS)
+
+
+def rank_executors(order, limit=None):
+    """
+    Исполнители, подходящие заказу, по убыванию итоговой оценки.
+
+    Оценка — косинусное сходство текста заказа с профилем, смешанное с
+    рейтингом (rating / 5) в доле settings.MATCHING_RATING_WEIGHT. Возвращает
+    профили с загруженными пользователями и атрибутами similarity и score.
+    """
+    limit = limit or settings.MATCHING_SUGGESTIONS
+    vector = order_vector(order)
+    if not vector:
+        return []
+
+    rating_weight = settings.MATCHING_RATING_WEIGHT
+    query_weight = Case(
+        *[When(term=term, then=Value(weight)) for term, weight in vector.items()],
+        output_field=FloatField(),
+    )
+    similarity = Sum(F('weight') * query_weight)
+    rows = list(
+        ExecutorTerm.objects.filter(term__in=vector)
+        .exclude(profile__user_id=order.customer_id)
+        .values('profile_id', 'profile__rating')
+        .annotate(
+            similarity=similarity,
+            score=similarity * Value(1 - rating_weight) + F('profile__rating') / Value(5.0) * Value(rating_weight),
+        )
+        .order_by('-score', 'profile_id')
+        .values_list('profile_id', 'similarity', 'score')[:limit]
+    )
+
+    profiles = UserProfile.objects.select_related('user').in_bulk([row[0] for row in rows])
+    ranked = []
+    for profile_id, similarity_value, score_value in rows:
+        profile = profiles[profile_id]
+        profile.similarity = similarity_value
+        profile.score = score_value
+        ranked.append(profile)
+    return ranked
+
+
+def suggest_executors(order):
+    """rank_executors с кешем: до изменения заказа или любого профиля список не пересчитывается"""
+    key = f'matching:{order.pk}:{order.updated_at.timestamp()}:{get_generation(UserProfile)}'
+    suggestions = cache.get(key)
+    if suggestions is None:
+        suggestions = rank_executors(order)
+        cache.set(key, suggestions, settings.MATCHING_CACHE_TIMEOUT)
+    return suggestions
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:41
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from core.operations import AddPostgreSQLIndex, RunPostgreSQL
+
+
+SEARCH_VECTOR_SQL = '''
+CREATE FUNCTION orders_order_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER orders_order_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON orders_order
+    FOR EACH ROW EXECUTE FUNCTION orders_order_search_vector_update();
+
+UPDATE orders_order SET search_vector =
+    setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('russian', coalesce(description, '')), 'B');
+'''
+
+DROP_SEARCH_VECTOR_SQL = '''
+DROP TRIGGER IF EXISTS orders_order_search_vector_trigger ON orders_order;
+DROP FUNCTION IF EXISTS orders_order_search_vector_update();
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        AddPostgreSQLIndex(
+            model_name='order',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='order_search_vector_idx'),
+        ),
+        RunPostgreSQL(SEARCH_VECTOR_SQL, DROP_SEARCH_VECTOR_SQL),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:42
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_bid_stats(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    Bid = apps.get_model('orders', 'Bid')
+
+    def bid_subquery(aggregate):
+        return Subquery(
+            Bid.objects.filter(order=OuterRef('pk')).order_by().values('order').annotate(value=aggregate).values('value')[:1]
+        )
+
+    Order.objects.update(
+        bid_count=Coalesce(bid_subquery(Count('pk')), 0),
+        min_price_proposal=bid_subquery(Min('price_proposal')),
+        last_bid_at=bid_subquery(Max('created_at')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='bid_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество откликов'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='last_bid_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата последнего отклика'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='min_price_proposal',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True, verbose_name='Минимальная предложенная цена'),
+        ),
+        migrations.RunPython(fill_bid_stats, migrations.RunPython.noop),
+    ]
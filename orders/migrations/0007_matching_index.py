@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_userprofile_rating_sum_count'),
+        ('orders', '0006_review'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchingTerm',
+            fields=[
+                ('term', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='Термин')),
+                ('document_count', models.PositiveIntegerField(default=0, verbose_name='Количество профилей')),
+            ],
+            options={
+                'verbose_name': 'Термин подбора',
+                'verbose_name_plural': 'Термины подбора',
+            },
+        ),
+        migrations.CreateModel(
+            name='ExecutorTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=32, verbose_name='Термин')),
+                ('weight', models.FloatField(verbose_name='Вес')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matching_terms', to='accounts.userprofile', verbose_name='Профиль')),
+            ],
+            options={
+                'verbose_name': 'Термин профиля',
+                'verbose_name_plural': 'Термины профилей',
+                'indexes': [models.Index(fields=['term'], include=('profile', 'weight'), name='executorterm_term_idx')],
+                'constraints': [models.UniqueConstraint(fields=('profile', 'term'), name='executorterm_profile_term_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_matching_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления')),
+                ('keywords', models.CharField(blank=True, max_length=255, verbose_name='Ключевые слова')),
+                ('min_budget', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Бюджет не менее')),
+                ('max_deadline', models.DateTimeField(blank=True, null=True, verbose_name='Срок не позднее')),
+                ('executor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL, verbose_name='Исполнитель')),
+            ],
+            options={
+                'verbose_name': 'Сохраненный поиск',
+                'verbose_name_plural': 'Сохраненные поиски',
+            },
+        ),
+        migrations.CreateModel(
+            name='InboxEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_read', models.BooleanField(default=False, verbose_name='Прочитано')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('executor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to=settings.AUTH_USER_MODEL, verbose_name='Исполнитель')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='orders.order', verbose_name='Заказ')),
+                ('search', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='orders.savedsearch', verbose_name='Поиск')),
+            ],
+            options={
+                'verbose_name': 'Входящий заказ',
+                'verbose_name_plural': 'Входящие заказы',
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(blank=True, max_length=32, verbose_name='Термин')),
+                ('term_count', models.PositiveSmallIntegerField(verbose_name='Терминов в поиске')),
+                ('min_budget', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Бюджет не менее')),
+                ('max_deadline', models.DateTimeField(blank=True, null=True, verbose_name='Срок не позднее')),
+                ('executor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Исполнитель')),
+                ('search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='orders.savedsearch', verbose_name='Поиск')),
+            ],
+            options={
+                'verbose_name': 'Термин сохраненного поиска',
+                'verbose_name_plural': 'Термины сохраненных поисков',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['executor', '-created_at'], name='savedsearch_executor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inboxentry',
+            index=models.Index(fields=['executor', '-created_at', '-id'], name='inboxentry_executor_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inboxentry',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['executor'], name='inboxentry_unread_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='inboxentry',
+            constraint=models.UniqueConstraint(fields=('executor', 'order'), name='inboxentry_executor_order_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='savedsearchterm',
+            index=models.Index(fields=['term', 'min_budget'], include=('search', 'executor', 'term_count', 'max_deadline'), name='savedsearchterm_term_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='savedsearchterm',
+            constraint=models.UniqueConstraint(fields=('search', 'term'), name='savedsearchterm_search_term_uniq'),
+        ),
+    ]
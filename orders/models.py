@@ -1,16 +1,42 @@
-from django.db import models
+from django.db import models, transaction
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import User
-from django.core.validators import MinValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.dispatch import Signal
+from django.utils import timezone
+from accounts.models import UserProfile
 from core.models import BaseModel
+from .workflow import ORDER_STATUS_CHOICES, ORDER_WORKFLOW, TransitionNotAllowed
 # Create your models here.
 
 
-ORDER_STATUS_CHOICES = [
-    ('open', 'Открыт'),
-    ('in_progress', 'В работе'),
-    ('completed', 'Завершен'),
-    ('cancelled', 'Отменен')
-]
+# Отправляется после перехода статуса (transition() обновляет заказы через
+# UPDATE, поэтому post_save не срабатывает). Аргументы: order_ids, status, changes
+order_transitioned = Signal()
+
+
+class OrderQuerySet(models.QuerySet):
+    def transition(self, new_status, **changes):
+        """
+        Переводит в new_status все заказы выборки, для которых переход допустим.
+
+        Подходящие заказы блокируются (SELECT ... FOR UPDATE) и обновляются
+        одним UPDATE вместе с изменениями действий перехода (ORDER_WORKFLOW).
+        Возвращает множество id переведенных заказов; остальные заказы выборки
+        считаются пропущенными.
+        """
+        changes = ORDER_WORKFLOW.prepare(new_status, changes)
+        with transaction.atomic(using=self.db):
+            eligible = set(
+                self.filter(status__in=ORDER_WORKFLOW.sources[new_status]).select_for_update().values_list('pk', flat=True)
+            )
+            if eligible:
+                self.model.objects.filter(pk__in=eligible).update(
+                    status=new_status, updated_at=timezone.now(), **changes
+                )
+                order_transitioned.send(sender=self.model, order_ids=eligible, status=new_status, changes=changes)
+        return eligible
 
 
 class Order(BaseModel):
@@ -28,32 +54,83 @@ class Order(BaseModel):
         related_name='assigned_orders',
         verbose_name='Назначенный исполнитель'
     )
+    # Денормализованная статистика откликов, поддерживается orders.bid_stats
+    bid_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество откликов')
+    min_price_proposal = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Минимальная предложенная цена'
+    )
+    last_bid_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='Дата последнего отклика')
+    # Заполняется триггером БД из title и description (см. orders.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = OrderQuerySet.as_manager()
+
+    # Поля, которые меняют только UPDATE из orders.bid_stats
+    BID_STATS_FIELDS = ('bid_count', 'min_price_proposal', 'last_bid_at')
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Полное сохранение существующего заказа (формы, админка, импорт) не
+        # записывает статистику откликов: значения, прочитанные в начале запроса,
+        # затерли бы отклики, учтенные с тех пор
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.BID_STATS_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = 'Заказ'
         verbose_name_plural = 'Заказы'
+        indexes = [
+            # Курсорная пагинация ленты заказов: WHERE status = ... ORDER BY created_at DESC, id DESC
+            models.Index(fields=['status', '-created_at', '-id'], name='order_status_created_idx'),
+            models.Index(fields=['customer', '-created_at', '-id'], name='order_customer_created_idx'),
+            models.Index(fields=['assigned_executor', '-created_at', '-id'], name='order_executor_created_idx'),
+            GinIndex(fields=['search_vector'], name='order_search_vector_idx'),
+            # Валидаторы условных GET в API: MAX(updated_at) WHERE status = ...
+            models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+        ]
+        constraints = [
+            ORDER_WORKFLOW.check_constraint('status', name='order_status_valid'),
+        ]
             
 
-    def get_allowed_status_transitions(self):
-        transitions = {
-            'open': ['in_progress', 'cancelled'],
-            'in_progress': ['completed', 'cancelled', 'open'],
-            'completed': ['open'],
-            'cancelled': ['open']
-        }
-
-        current_status = self.status
-
-        allowed_destinations = transitions.get(current_status, [])
-
-        all_relevant_statuses = allowed_destinations + [current_status]
+    def transition(self, new_status, **changes):
+        """
+        Переводит заказ в new_status одним условным UPDATE.
 
-        result = [(value, label) for value, label in ORDER_STATUS_CHOICES if value in all_relevant_statuses]
+        Запрос записывает только status, updated_at и переданные поля и
+        выполняется с условием WHERE id = ? AND status = ? по статусу,
+        который был прочитан вместе с объектом. Если заказ успел изменить
+        другой запрос, ничего не записывается и возвращается False —
+        изменения не теряются молча. При успехе объект в памяти обновляется.
+        Недопустимый из текущего статуса переход — TransitionNotAllowed.
+        """
+        if not ORDER_WORKFLOW.can_transition(self.status, new_status):
+            raise TransitionNotAllowed(f'Переход из «{self.status}» в «{new_status}» недопустим.')
+        changes = ORDER_WORKFLOW.prepare(new_status, changes)
+        now = timezone.now()
+        updated = Order.objects.filter(pk=self.pk, status=self.status).update(
+            status=new_status, updated_at=now, **changes
+        )
+        if not updated:
+            return False
 
-        return result
+        self.status = new_status
+        self.updated_at = now
+        for field, value in changes.items():
+            setattr(self, field, value)
+        order_transitioned.send(sender=Order, order_ids=[self.pk], status=new_status, changes=changes)
+        return True
 
 
 class Bid(BaseModel):
@@ -66,3 +143,167 @@ class Bid(BaseModel):
         unique_together = ('order', 'executor')
         verbose_name = 'Отклик'
         verbose_name_plural = 'Отклики'
+
+
+REVIEW_RATING_CHOICES = [(value, str(value)) for value in range(1, 6)]
+
+
+class Review(BaseModel):
+    """
+    Отзыв заказчика о назначенном исполнителе завершенного заказа.
+
+    Рейтинг исполнителя (UserProfile.rating_sum / rating_count) меняется
+    вместе с отзывом, см. orders.ratings.
+    """
+
+    order = models.OneToOneField(Order, on_delete=models.CASCADE, related_name='review', verbose_name='Заказ')
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews_given', verbose_name='Заказчик')
+    executor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews_received', verbose_name='Исполнитель')
+    rating = models.PositiveSmallIntegerField(
+        choices=REVIEW_RATING_CHOICES,
+        validators=[MinValueValidator(1), MaxValueValidator(5)],
+        verbose_name='Оценка'
+    )
+    comment = models.TextField(blank=True, verbose_name='Комментарий')
+
+    class Meta:
+        verbose_name = 'Отзыв'
+        verbose_name_plural = 'Отзывы'
+        constraints = [
+            models.CheckConstraint(condition=models.Q(rating__gte=1, rating__lte=5), name='review_rating_range'),
+        ]
+        indexes = [
+            # Отзывы исполнителя и пересчет рейтинга: WHERE executor_id = ... ORDER BY created_at DESC
+            models.Index(fields=['executor', '-created_at'], name='review_executor_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.order} — {self.rating}'
+
+
+class MatchingTerm(models.Model):
+    """Термин индекса подбора исполнителей и число профилей, в которых он встречается"""
+
+    term = models.CharField(max_length=32, primary_key=True, verbose_name='Термин')
+    document_count = models.PositiveIntegerField(default=0, verbose_name='Количество профилей')
+
+    class Meta:
+        verbose_name = 'Термин подбора'
+        verbose_name_plural = 'Термины подбора'
+
+    def __str__(self):
+        return self.term
+
+
+class ExecutorTerm(models.Model):
+    """
+    Вес термина в профиле исполнителя (разреженная матрица «профиль × термин»).
+
+    Вес — логарифмическая частота термина, нормированная по длине вектора
+    профиля; поддерживается orders.matching при сохранении профиля.
+    """
+
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='matching_terms', verbose_name='Профиль')
+    term = models.CharField(max_length=32, verbose_name='Термин')
+    weight = models.FloatField(verbose_name='Вес')
+
+    class Meta:
+        verbose_name = 'Термин профиля'
+        verbose_name_plural = 'Термины профилей'
+        constraints = [
+            models.UniqueConstraint(fields=['profile', 'term'], name='executorterm_profile_term_uniq'),
+        ]
+        indexes = [
+            # Подбор: WHERE term IN (...) GROUP BY profile_id — в PostgreSQL только по индексу
+            models.Index(fields=['term'], include=['profile', 'weight'], name='executorterm_term_idx'),
+        ]
+
+
+class SavedSearch(BaseModel):
+    """
+    Сохраненный поиск исполнителя: о новых подходящих заказах он узнает из
+    входящих (InboxEntry), не просматривая ленту заказов.
+
+    Заказ подходит, если содержит все ключевые слова (в названии или описании),
+    его бюджет не меньше min_budget, а срок не позже max_deadline. Заказ без
+    бюджета проходит только поиск без min_budget, заказ без срока — любой.
+    """
+
+    executor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches', verbose_name='Исполнитель')
+    keywords = models.CharField(max_length=255, blank=True, verbose_name='Ключевые слова')
+    min_budget = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name='Бюджет не менее')
+    max_deadline = models.DateTimeField(null=True, blank=True, verbose_name='Срок не позднее')
+
+    class Meta:
+        verbose_name = 'Сохраненный поиск'
+        verbose_name_plural = 'Сохраненные поиски'
+        indexes = [
+            models.Index(fields=['executor', '-created_at'], name='savedsearch_executor_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.executor} — {self.keywords or "все заказы"}'
+
+
+class SavedSearchTerm(models.Model):
+    """
+    Обратный индекс сохраненных поисков: строка на каждое ключевое слово
+    (у поиска без слов — одна строка с пустым термином).
+
+    Условия поиска копируются в каждую строку, чтобы подбор поисков к заказу
+    выполнялся по одному индексу без соединения с SavedSearch; поддерживается
+    orders.percolator при сохранении поиска.
+    """
+
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='terms', verbose_name='Поиск')
+    executor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', verbose_name='Исполнитель')
+    term = models.CharField(max_length=32, blank=True, verbose_name='Термин')
+    # Сколько терминов у поиска: заказ подходит, если совпали все
+    term_count = models.PositiveSmallIntegerField(verbose_name='Терминов в поиске')
+    # 0, если минимальный бюджет не задан: порог сравнивается без проверок на NULL
+    min_budget = models.DecimalField(max_digits=10, decimal_places=2, default=0, verbose_name='Бюджет не менее')
+    max_deadline = models.DateTimeField(null=True, blank=True, verbose_name='Срок не позднее')
+
+    class Meta:
+        verbose_name = 'Термин сохраненного поиска'
+        verbose_name_plural = 'Термины сохраненных поисков'
+        constraints = [
+            models.UniqueConstraint(fields=['search', 'term'], name='savedsearchterm_search_term_uniq'),
+        ]
+        indexes = [
+            # Подбор к заказу: WHERE term IN (...) AND min_budget <= budget — по каждому
+            # термину диапазон отсортированных порогов бюджета, в PostgreSQL только по индексу
+            models.Index(
+                fields=['term', 'min_budget'],
+                include=['search', 'executor', 'term_count', 'max_deadline'],
+                name='savedsearchterm_term_idx',
+            ),
+        ]
+
+
+class InboxEntry(models.Model):
+    """Новый заказ, подошедший под сохраненный поиск исполнителя"""
+
+    executor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='inbox_entries', verbose_name='Исполнитель')
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='+', verbose_name='Заказ')
+    search = models.ForeignKey(
+        SavedSearch, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', verbose_name='Поиск'
+    )
+    is_read = models.BooleanField(default=False, verbose_name='Прочитано')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
+
+    class Meta:
+        verbose_name = 'Входящий заказ'
+        verbose_name_plural = 'Входящие заказы'
+        constraints = [
+            # Заказ, подошедший под несколько поисков, попадает во входящие один раз
+            models.UniqueConstraint(fields=['executor', 'order'], name='inboxentry_executor_order_uniq'),
+        ]
+        indexes = [
+            # Лента входящих: WHERE executor_id = ... ORDER BY created_at DESC, id DESC
+            models.Index(fields=['executor', '-created_at', '-id'], name='inboxentry_executor_feed_idx'),
+            models.Index(fields=['executor'], condition=models.Q(is_read=False), name='inboxentry_unread_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.executor} — {self.order_id}'
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .matching import tokenize
+from .models import InboxEntry, SavedSearchTerm
+
+# Сохраненные поиски исполнителей и доставка новых заказов во входящие.
+#
+# Вместо проверки каждого сохраненного поиска на новом заказе поиски
+# индексируются по ключевым словам (SavedSearchTerm, с теми же терминами, что
+# и подбор исполнителей в orders.matching). Для заказа выбираются строки
+# индекса по его терминам с порогом бюджета не выше бюджета заказа, и поиск
+# подходит, если совпали все его термины. Работа на заказ — один запрос по
+# индексу и одна пачка INSERT во входящие, независимо от числа поисков.
+
+# Термин поиска без ключевых слов: такой поиск проверяется на каждом заказе
+ANY_TERM = ''
+
+
+def search_terms(keywords):
+    return sorted(set(tokenize(keywords))) or [ANY_TERM]
+
+
+def index_searches(searches, replace=True):
+    """
+    Строит строки обратного индекса сохраненных поисков (после bulk_create — вместо сигнала).
+
+    replace=False — для только что созданных поисков: прежних строк у них нет.
+    """
+    rows = []
+    for search in searches:
+        terms = search_terms(search.keywords)
+        rows.extend(
+            SavedSearchTerm(
+                search=search,
+                executor_id=search.executor_id,
+                term=term,
+                term_count=len(terms),
+                min_budget=search.min_budget or 0,
+                max_deadline=search.max_deadline,
+            )
+            for term in terms
+        )
+    if not replace:
+        SavedSearchTerm.objects.bulk_create(rows, batch_size=settings.IMPORT_BATCH_SIZE)
+        return
+    with transaction.atomic():
+        SavedSearchTerm.objects.filter(search__in=[search.pk for search in searches]).delete()
+        SavedSearchTerm.objects.bulk_create(rows, batch_size=settings.IMPORT_BATCH_SIZE)
+
+
+def matching_searches(order):
+    """
+    Сохраненные поиски, под которые подходит заказ: список пар (executor_id, search_id).
+
+    Подсчет совпавших терминов выполняется в БД; строки индекса отбираются по
+    термину и отсортированному порогу бюджета (индекс savedsearchterm_term_idx).
+    """
+    terms = set(tokenize(order.title)) | set(tokenize(order.description))
+    terms.add(ANY_TERM)
+
+    rows = SavedSearchTerm.objects.filter(term__in=terms, min_budget__lte=order.budget or 0)
+    if order.deadline is not None:
+        rows = rows.filter(Q(max_deadline__isnull=True) | Q(max_deadline__gte=order.deadline))
+    return list(
+        rows.exclude(executor_id=order.customer_id)
+        .values('search_id', 'executor_id', 'term_count')
+        .annotate(hits=Count('id'))
+        .filter(hits=F('term_count'))
+        .order_by('search_id')
+        .values_list('executor_id', 'search_id')
+    )
+
+
+def percolate(order):
+    """Доставляет новый заказ во входящие исполнителей с подходящими поисками. Возвращает число записей"""
+    # Несколько поисков одного исполнителя дают одну запись, с первым из поисков
+    searches = {}
+    for executor_id, search_id in matching_searches(order):
+        searches.setdefault(executor_id, search_id)
+
+    InboxEntry.objects.bulk_create(
+        [InboxEntry(executor_id=executor_id, order=order, search_id=search_id) for executor_id, search_id in searches.items()],
+        batch_size=settings.IMPORT_BATCH_SIZE,
+        # Повторная доставка (например, при повторном импорте) не дублирует записи
+        ignore_conflicts=True,
+    )
+    return len(searches)
+
+
+def percolate_on_commit(order):
+    # Доставка после фиксации: откатившийся заказ никому не приходит, а ошибка
+    # доставки только логируется и не превращает созданный заказ в ошибку 500
+    transaction.on_commit(lambda: percolate(order), robust=True)
@@ -0,0 +1,83 @@
+from django.db.models import Avg, Count, F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from core.cache import bump_generation, bump_generation_on_commit
+from .models import Review
+
+# Рейтинг исполнителя хранится в профиле как сумма и количество оценок, а
+# средняя оценка rating пересчитывается из них в том же UPDATE с F-выражениями,
+# без чтения профиля в Python и без AVG по всем отзывам. Обработчики сигналов
+# вызываются в транзакции сохранения или удаления отзыва.
+
+
+def _update_rating(executor_id, sum_delta, count_delta):
+    # В UPDATE все F() ссылаются на значения до изменения строки
+    rating_sum = F('rating_sum') + sum_delta
+    rating_count = F('rating_count') + count_delta
+    UserProfile.objects.filter(user_id=executor_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=Coalesce(
+            Cast(rating_sum, FloatField()) / NullIf(Cast(rating_count, FloatField()), Value(0.0)),
+            Value(0.0),
+        ),
+        # Карточки каталога исполнителей кешируются по updated_at
+        updated_at=timezone.now(),
+    )
+    # Подбор исполнителей (matching.suggest_executors) кешируется по поколению
+    # профилей: после фиксации отзыва рейтинг в нем пересчитывается
+    bump_generation_on_commit(UserProfile)
+
+
+def register_review(review):
+    """Учитывает новый отзыв в рейтинге исполнителя"""
+    _update_rating(review.executor_id, review.rating, 1)
+
+
+def unregister_review(review):
+    """Убирает удаленный отзыв из рейтинга исполнителя"""
+    _update_rating(review.executor_id, -review.rating, -1)
+
+
+def _review_subquery(aggregate):
+    return Subquery(
+        Review.objects.filter(executor=OuterRef('user_id'))
+        .order_by()
+        .values('executor')
+        .annotate(value=aggregate)
+        .values('value')[:1]
+    )
+
+
+def recompute_ratings(executor_ids=None, batch_size=1000):
+    """
+    Полный пересчет рейтингов пачками по batch_size профилей.
+
+    Профили перебираются по возрастанию id, каждая пачка обновляется одним
+    UPDATE с коррелированными подзапросами по отзывам (индекс
+    review_executor_created_idx). Возвращает число обработанных профилей.
+    """
+    profiles = UserProfile.objects.filter(role='executor').order_by('pk')
+    if executor_ids is not None:
+        profiles = profiles.filter(user_id__in=executor_ids)
+
+    processed = 0
+    last_id = 0
+    while True:
+        batch = list(profiles.filter(pk__gt=last_id).values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            break
+
+        UserProfile.objects.filter(pk__in=batch).update(
+            rating_sum=Coalesce(_review_subquery(Sum('rating')), 0),
+            rating_count=Coalesce(_review_subquery(Count('pk')), 0),
+            rating=Coalesce(_review_subquery(Avg('rating', output_field=FloatField())), Value(0.0)),
+        )
+        processed += len(batch)
+        last_id = batch[-1]
+
+    # updated_at пачкой не меняется, поэтому закешированные карточки сбрасываются поколением
+    bump_generation(UserProfile)
+    return processed
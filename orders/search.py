@@ -0,0 +1,56 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, Q
+
+# Должна совпадать с конфигурацией в триггере миграции 0003_order_search_vector
+SEARCH_CONFIG = 'russian'
+
+
+def search_orders(queryset, query, rank=True):
+    """
+    Полнотекстовый поиск по названию и описанию заказа.
+
+    На PostgreSQL используется поле search_vector (GIN-индекс, обновляется
+    триггером), результаты сортируются по релевантности. На остальных СУБД
+    (тестовая SQLite) выполняется поиск подстрок по каждому слову запроса.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    if connections[queryset.db].vendor == 'postgresql':
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+        queryset = queryset.filter(search_vector=search_query)
+        if rank:
+            queryset = queryset.annotate(
+                rank=SearchRank(F('search_vector'), search_query)
+            ).order_by('-rank', '-created_at', '-id')
+        return queryset
+
+    condition = Q()
+    for term in query.split():
+        condition &= Q(title__icontains=term) | Q(description__icontains=term)
+    queryset = queryset.filter(condition)
+    if rank:
+        queryset = queryset.order_by('-created_at', '-id')
+    return queryset
+
+
+def search_executors(queryset, query):
+    """
+    Нечеткий поиск исполнителей по логину и специализации.
+
+    На PostgreSQL используется оператор pg_trgm %, который обслуживается
+    GIN-индексами по триграммам, поэтому опечатки в запросе допустимы.
+    На остальных СУБД выполняется поиск подстроки.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    if connections[queryset.db].vendor == 'postgresql':
+        return queryset.filter(
+            Q(user__username__trigram_similar=query) | Q(specialization__trigram_similar=query)
+        )
+
+    return queryset.filter(Q(user__username__icontains=query) | Q(specialization__icontains=query))
@@ -0,0 +1,106 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from accounts.models import UserProfile
+from core.cache import bump_generation_on_commit, bump_generation_on_commit_receiver, bump_generation_receiver
+from core.metrics import BIDS_PLACED, ORDERS_CREATED, ORDER_TRANSITIONS
+from . import bid_stats, events, matching, percolator, ratings
+from .models import Bid, Order, Review, SavedSearch, order_transitioned
+
+post_save.connect(bump_generation_receiver, sender=Order, dispatch_uid='orders.order_generation_save')
+post_delete.connect(bump_generation_on_commit_receiver, sender=Order, dispatch_uid='orders.order_generation_delete')
+
+
+@receiver(post_save, sender=Order)
+def percolate_new_order(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.status == 'open':
+        percolator.percolate_on_commit(instance)
+
+
+@receiver(post_save, sender=SavedSearch)
+def index_saved_search(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        percolator.index_searches([instance], replace=not created)
+
+
+@receiver(post_save, sender=Bid)
+def update_bid_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        bid_stats.register_bid(instance)
+        events.publish_bid(instance)
+    else:
+        bid_stats.refresh_min_price(instance.order_id)
+
+
+@receiver(post_delete, sender=Bid)
+def update_bid_stats_on_delete(sender, instance, origin=None, **kwargs):
+    # При удалении заказа его отклики удаляются каскадно, пересчитывать нечего
+    if bid_stats.is_order_deletion(origin):
+        return
+    bid_stats.unregister_bid(instance)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        ratings.register_review(instance)
+    else:
+        # Прежняя оценка неизвестна: рейтинг исполнителя пересчитывается по его отзывам
+        ratings.recompute_ratings(executor_ids=[instance.executor_id])
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    ratings.unregister_review(instance)
+
+
+# Поля профиля, из которых строится вектор подбора исполнителей
+MATCHING_FIELDS = {'role', 'specialization', 'portfolio'}
+
+
+@receiver(post_save, sender=UserProfile)
+def index_profile_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not MATCHING_FIELDS & set(update_fields)):
+        return
+    matching.index_profiles([instance])
+
+
+@receiver(pre_delete, sender=UserProfile)
+def unindex_profile_on_delete(sender, instance, **kwargs):
+    matching.unindex_profile(instance)
+
+
+@receiver(order_transitioned, sender=Order)
+def bump_generation_on_transition(sender, **kwargs):
+    # Переход записывается UPDATE без post_save; заказ, покинувший список
+    # открытых, не меняет его MAX(updated_at), поэтому меняется поколение
+    bump_generation_on_commit(Order)
+
+
+@receiver(order_transitioned, sender=Order)
+def publish_order_transition(sender, order_ids, status, changes, **kwargs):
+    events.publish_order_state(order_ids, status, changes)
+
+
+# Бизнес-счетчики метрик учитываются после фиксации: откатившиеся изменения не считаются
+
+@receiver(post_save, sender=Order)
+def count_created_order(sender, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(ORDERS_CREATED.inc)
+
+
+@receiver(post_save, sender=Bid)
+def count_placed_bid(sender, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(BIDS_PLACED.inc)
+
+
+@receiver(order_transitioned, sender=Order)
+def count_order_transition(sender, order_ids, status, **kwargs):
+    transaction.on_commit(lambda: ORDER_TRANSITIONS.inc(len(order_ids), status=status))
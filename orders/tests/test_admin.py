@@ -0,0 +1,69 @@
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import Permission, User
+from django.urls import reverse
+from orders.models import Order, Bid
+
+
+@override_settings(ADMIN_BIDS_PAGE_SIZE=3)
+class OrderAdminBidPanelTest(TestCase):
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123____')
+        self.client = Client()
+        self.client.force_login(self.superuser)
+
+        customer = User.objects.create_user(username='customer')
+        self.order = Order.objects.create(title='Заказ', description='Описание', customer=customer)
+        self.bids = [
+            Bid.objects.create(order=self.order, executor=User.objects.create_user(username=f'executor{i}'), price_proposal=price)
+            for i, price in enumerate([1000, 2000, 3000, 4000, None])
+        ]
+        self.change_url = reverse('admin:orders_order_change', args=[self.order.pk])
+        self.panel_url = reverse('admin:orders_order_bids', args=[self.order.pk])
+
+    def test_change_page_shows_summary_without_bid_rows(self):
+        response = self.client.get(self.change_url)
+        self.assertEqual(response.context['bid_summary'], {
+            'count': 5,
+            'min_price': Decimal('1000'),
+            'median_price': Decimal('2500.00'),
+            'max_price': Decimal('4000'),
+        })
+        self.assertContains(response, self.panel_url)
+        self.assertNotContains(response, 'executor4')
+        # Поля пользователей — автодополнение, а не список всех пользователей
+        self.assertNotContains(response, '<option value="%d">executor0</option>' % self.bids[0].executor_id)
+
+    def test_add_page_has_no_panel(self):
+        response = self.client.get(reverse('admin:orders_order_add'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'bid-panel')
+
+    def test_panel_is_paginated(self):
+        response = self.client.get(self.panel_url)
+        page = response.context['page']
+        self.assertEqual([bid.pk for bid in page], [bid.pk for bid in reversed(self.bids)][:3])
+        self.assertContains(response, reverse('admin:orders_bid_change', args=[self.bids[4].pk]))
+
+        response = self.client.get(self.panel_url, {'cursor': page.next_cursor})
+        self.assertEqual([bid.pk for bid in response.context['page']], [self.bids[1].pk, self.bids[0].pk])
+
+    def test_panel_query_count_does_not_depend_on_bids(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.panel_url)
+        for i in range(10):
+            Bid.objects.create(order=self.order, executor=User.objects.create_user(username=f'more{i}'), price_proposal=500)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.panel_url)
+        self.assertEqual(len(few), len(many))
+
+    def test_panel_requires_bid_view_permission(self):
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        staff.user_permissions.add(Permission.objects.get(codename='view_order'))
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(self.panel_url).status_code, 403)
+
+        staff.user_permissions.add(Permission.objects.get(codename='view_bid'))
+        self.assertEqual(self.client.get(self.panel_url).status_code, 200)
@@ -0,0 +1,144 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from accounts.models import UserProfile
+from orders.models import Order, Bid
+
+
+class OrderApiTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.executor = User.objects.create_user(username='executor', password='qwerty123____')
+        UserProfile.objects.create(user=self.executor, role='executor', specialization='Python', rating=4.5)
+
+        self.order = Order.objects.create(title='Заказ', description='Описание', customer=self.customer, budget=5000)
+        Order.objects.create(title='Отмененный', description='Описание', customer=self.customer, status='cancelled')
+
+    def test_order_list(self):
+        """Список содержит только открытые заказы"""
+        response = self.client.get(reverse('api_order_list'))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([order['title'] for order in data['results']], ['Заказ'])
+        self.assertEqual(data['results'][0]['customer'], 'customer')
+        self.assertIsNone(data['next'])
+
+    def test_sparse_fieldset(self):
+        """Параметр fields ограничивает набор полей"""
+        response = self.client.get(reverse('api_order_list'), {'fields': 'id,title'})
+        self.assertEqual(response.json()['results'], [{'id': self.order.id, 'title': 'Заказ'}])
+
+    def test_unknown_field(self):
+        """Неизвестное поле приводит к ответу 400"""
+        response = self.client.get(reverse('api_order_list'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(ORDERS_PAGE_SIZE=1)
+    def test_cursor_paging(self):
+        """Список листается курсором"""
+        Order.objects.create(title='Второй', description='Описание', customer=self.customer)
+        first = self.client.get(reverse('api_order_list'), {'fields': 'title'}).json()
+        second = self.client.get(reverse('api_order_list'), {'fields': 'title', 'cursor': first['next']}).json()
+        self.assertEqual([first['results'][0]['title'], second['results'][0]['title']], ['Второй', 'Заказ'])
+
+    def test_list_not_modified(self):
+        """Повторный запрос с If-None-Match получает 304 без выборки заказов"""
+        response = self.client.get(reverse('api_order_list'))
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api_order_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.order.save()
+        response = self.client.get(reverse('api_order_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_changes_on_delete(self):
+        """Удаление заказа меняет ETag списка"""
+        etag = self.client.get(reverse('api_order_list'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.create(title='Временный', description='Описание', customer=self.customer).delete()
+        response = self.client.get(reverse('api_order_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_changes_on_transition(self):
+        """Отмена не самого нового открытого заказа меняет ETag и Last-Modified списка"""
+        Order.objects.create(title='Новый', description='Описание', customer=self.customer)
+        # Last-Modified с точностью до секунды: заказы изменены заметно раньше перехода
+        Order.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        cache.clear()
+        first = self.client.get(reverse('api_order_list'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(Order.objects.get(pk=self.order.pk).transition('cancelled'))
+        response = self.client.get(reverse('api_order_list'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual([order['title'] for order in response.json()['results']], ['Новый'])
+
+        response = self.client.get(reverse('api_order_list'), HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_generation_bumped_after_commit(self):
+        """Поколение меняется после фиксации перехода: запрос внутри транзакции не кеширует старый список под новым"""
+        url = reverse('api_order_list')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.assertEqual(Order.objects.filter(pk=self.order.pk).transition('cancelled'), {self.order.pk})
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+
+    def test_order_detail_requires_login(self):
+        """Детали заказа доступны только после входа"""
+        response = self.client.get(reverse('api_order_detail', args=[self.order.id]))
+        self.assertEqual(response.status_code, 401)
+
+    def test_order_detail_with_bids(self):
+        """Детали заказа содержат отклики, новый отклик меняет ETag"""
+        self.client.force_login(self.customer)
+        url = reverse('api_order_detail', args=[self.order.id])
+        etag = self.client.get(url)['ETag']
+
+        Bid.objects.create(order=self.order, executor=self.executor, price_proposal=4000)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['bid_count'], 1)
+        self.assertEqual(data['bids'][0]['executor'], 'executor')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_order_detail_without_bids_field(self):
+        """Без поля bids отклики не запрашиваются"""
+        self.client.force_login(self.customer)
+        response = self.client.get(reverse('api_order_detail', args=[self.order.id]), {'fields': 'id,status'})
+        self.assertEqual(response.json(), {'id': self.order.id, 'status': 'open'})
+
+    def test_order_detail_not_found(self):
+        self.client.force_login(self.customer)
+        response = self.client.get(reverse('api_order_detail', args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_executor_list(self):
+        """Список исполнителей отсортирован по рейтингу"""
+        response = self.client.get(reverse('api_executor_list'), {'fields': 'username,rating'})
+        self.assertEqual(response.json()['results'], [{'username': 'executor', 'rating': 4.5}])
+
+    def test_post_not_allowed(self):
+        response = self.client.post(reverse('api_order_list'))
+        self.assertEqual(response.status_code, 405)
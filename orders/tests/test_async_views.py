@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from accounts import async_views as accounts_async_views
+from accounts.models import UserProfile
+from core.asynchronous import async_views_enabled
+from core.instrumentation import collect_stats
+from orders import async_views
+from orders.models import Order, Bid
+
+
+class AsyncViewsTest(TestCase):
+    """Нативные async-представления, подключаемые при ASYNC_VIEWS = True"""
+
+    def setUp(self):
+        self.enterContext(async_views_enabled())
+        self.client = AsyncClient()
+
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+
+        self.executor = User.objects.create_user(username='executor', password='qwerty123____')
+        UserProfile.objects.create(user=self.executor, role='executor', specialization='Python', rating=4.5)
+
+        self.bidder = User.objects.create_user(username='bidder', password='qwerty123____')
+        UserProfile.objects.create(user=self.bidder, role='executor', specialization='Django')
+
+        self.order = Order.objects.create(
+            title='Асинхронный заказ', description='Описание', customer=self.customer, budget=5000,
+        )
+        Bid.objects.create(order=self.order, executor=self.bidder, price_proposal=4000)
+
+    async def assertAsyncQueryBudget(self, url_name, path):
+        # CaptureQueriesContext не работает в async-контексте, запросы считает core.instrumentation
+        with collect_stats() as stats:
+            response = await self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(stats.queries, settings.QUERY_BUDGETS[url_name])
+        return response
+
+    async def test_order_list(self):
+        response = await self.assertAsyncQueryBudget('order_list', reverse('order_list'))
+        self.assertIs(response.resolver_match.func, async_views.order_list)
+        self.assertContains(response, 'Асинхронный заказ')
+
+    async def test_order_list_search(self):
+        response = await self.client.get(reverse('order_list'), {'q': 'заказ'})
+        self.assertContains(response, 'Асинхронный заказ')
+
+    async def test_executor_list(self):
+        response = await self.assertAsyncQueryBudget('executor_list', reverse('executor_list'))
+        self.assertIs(response.resolver_match.func, async_views.executor_list)
+        self.assertContains(response, 'executor')
+        self.assertContains(response, 'bidder')
+
+    async def test_order_detail_requires_login(self):
+        response = await self.client.get(reverse('order_detail', args=[self.order.id]))
+        self.assertEqual(response.status_code, 302)
+
+    async def test_order_detail_customer(self):
+        await self.client.aforce_login(self.customer)
+        response = await self.client.get(reverse('order_detail', args=[self.order.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(response.resolver_match.func.__wrapped__, async_views.order_detail.__wrapped__)
+        self.assertTrue(response.context['is_customer'])
+        self.assertEqual(response.context['bidders_for_selection'], [(self.bidder.id, 'bidder')])
+
+    async def test_order_detail_missing_order(self):
+        await self.client.aforce_login(self.customer)
+        response = await self.client.get(reverse('order_detail', args=[self.order.id + 100]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_order_detail_post_uses_sync_view(self):
+        """Отклик отправляется через синхронное представление"""
+        await self.client.aforce_login(self.executor)
+        response = await self.client.get(reverse('order_detail', args=[self.order.id]))
+        self.assertTrue(response.context['user_can_bid'])
+
+        response = await self.client.post(reverse('order_detail', args=[self.order.id]), {
+            'message': 'Готов выполнить', 'price_proposal': '4500',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(await Bid.objects.filter(order=self.order, executor=self.executor).aexists())
+
+    async def test_profile(self):
+        await self.client.aforce_login(self.executor)
+        response = await self.assertAsyncQueryBudget('profile', reverse('profile'))
+        self.assertIs(response.resolver_match.func.__wrapped__, accounts_async_views.profile.__wrapped__)
+        self.assertContains(response, 'Python')
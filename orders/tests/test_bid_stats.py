@@ -0,0 +1,108 @@
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth.models import User
+from orders.bid_stats import bid_price_summary
+from orders.models import Order, Bid
+
+
+class BidStatsTest(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer', password='pass')
+        self.executors = [User.objects.create_user(username=f'executor{i}', password='pass') for i in range(3)]
+        self.order = Order.objects.create(title='Заказ', description='Описание', customer=self.customer)
+
+    def bid(self, executor, price):
+        return Bid.objects.create(order=self.order, executor=executor, price_proposal=price)
+
+    def test_stats_updated_on_create(self):
+        """Создание отклика увеличивает счетчик и обновляет минимальную цену"""
+        self.bid(self.executors[0], Decimal('5000'))
+        self.bid(self.executors[1], Decimal('3000'))
+        last = self.bid(self.executors[2], None)
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.bid_count, 3)
+        self.assertEqual(self.order.min_price_proposal, Decimal('3000'))
+        self.assertEqual(self.order.last_bid_at, last.created_at)
+
+    def test_stats_updated_on_delete(self):
+        """Удаление отклика уменьшает счетчик и пересчитывает минимум"""
+        first = self.bid(self.executors[0], Decimal('5000'))
+        cheapest = self.bid(self.executors[1], Decimal('3000'))
+
+        cheapest.delete()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.bid_count, 1)
+        self.assertEqual(self.order.min_price_proposal, Decimal('5000'))
+        self.assertEqual(self.order.last_bid_at, first.created_at)
+
+    def test_stats_updated_on_price_change(self):
+        """Изменение цены существующего отклика пересчитывает минимум"""
+        bid = self.bid(self.executors[0], Decimal('5000'))
+        bid.price_proposal = Decimal('4000')
+        bid.save()
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.bid_count, 1)
+        self.assertEqual(self.order.min_price_proposal, Decimal('4000'))
+
+    def test_stale_order_save_keeps_stats(self):
+        """Сохранение прочитанного до отклика заказа не затирает статистику"""
+        stale = Order.objects.get(pk=self.order.pk)
+        self.bid(self.executors[0], Decimal('5000'))
+
+        stale.title = 'Новое название'
+        stale.save()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.title, 'Новое название')
+        self.assertEqual(self.order.bid_count, 1)
+        self.assertEqual(self.order.min_price_proposal, Decimal('5000'))
+
+    def test_order_delete_with_bids(self):
+        """Удаление заказа с откликами проходит без ошибок"""
+        self.bid(self.executors[0], Decimal('5000'))
+        self.order.delete()
+        self.assertFalse(Bid.objects.exists())
+
+    def test_recompute_command(self):
+        """Команда пересчета восстанавливает испорченную статистику"""
+        self.bid(self.executors[0], Decimal('5000'))
+        self.bid(self.executors[1], Decimal('3000'))
+        empty = Order.objects.create(title='Пустой', description='Описание', customer=self.customer)
+        Order.objects.update(bid_count=42, min_price_proposal=Decimal('1'), last_bid_at=None)
+        updated_at = Order.objects.get(pk=self.order.pk).updated_at
+
+        out = StringIO()
+        call_command('recompute_bid_stats', '--batch-size', '1', stdout=out)
+        self.assertIn('2', out.getvalue())
+
+        self.order.refresh_from_db()
+        empty.refresh_from_db()
+        self.assertEqual(self.order.bid_count, 2)
+        self.assertEqual(self.order.min_price_proposal, Decimal('3000'))
+        self.assertIsNotNone(self.order.last_bid_at)
+        # Кеши карточек и ETag API сбрасываются по updated_at
+        self.assertGreater(self.order.updated_at, updated_at)
+        self.assertEqual(empty.bid_count, 0)
+        self.assertIsNone(empty.min_price_proposal)
+
+    def test_price_summary(self):
+        """Сводка: количество всех откликов, медиана — только по указанным ценам"""
+        self.bid(self.executors[0], Decimal('5000'))
+        self.bid(self.executors[1], Decimal('3000'))
+        self.bid(self.executors[2], None)
+
+        self.assertEqual(bid_price_summary(self.order.pk), {
+            'count': 3,
+            'min_price': Decimal('3000'),
+            'median_price': Decimal('4000.00'),
+            'max_price': Decimal('5000'),
+        })
+
+    def test_price_summary_odd_and_empty(self):
+        self.assertEqual(bid_price_summary(self.order.pk)['median_price'], None)
+        for executor, price in zip(self.executors, ('100', '700', '300')):
+            self.bid(executor, Decimal(price))
+        self.assertEqual(bid_price_summary(self.order.pk)['median_price'], Decimal('300.00'))
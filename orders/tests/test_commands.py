@@ -0,0 +1,81 @@
+import json
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth.models import User
+from accounts.models import UserProfile
+from orders.models import Order
+
+
+class SeedDataCommandTest(TestCase):
+    def test_seed_creates_consistent_data(self):
+        """seed_data создает пользователей с профилями, заказы и отклики с корректной статистикой"""
+        call_command('seed_data', customers=3, executors=10, orders=20, bids_per_order=3, seed=1, stdout=StringIO())
+
+        self.assertEqual(UserProfile.objects.filter(role='customer').count(), 3)
+        self.assertEqual(UserProfile.objects.filter(role='executor').count(), 10)
+        self.assertEqual(Order.objects.count(), 20)
+
+        for order in Order.objects.all():
+            self.assertEqual(order.bid_count, order.bids.count())
+            if order.assigned_executor_id:
+                self.assertTrue(order.bids.filter(executor_id=order.assigned_executor_id).exists())
+
+    def test_seed_can_run_twice(self):
+        """Повторный запуск не конфликтует по логинам"""
+        call_command('seed_data', customers=2, executors=2, orders=2, seed=1, stdout=StringIO())
+        call_command('seed_data', customers=2, executors=2, orders=2, seed=2, stdout=StringIO())
+        self.assertEqual(User.objects.count(), 8)
+
+
+class RunBenchmarkCommandTest(TestCase):
+    def test_benchmark_report(self):
+        """run_benchmark печатает JSON с процентилями и числом запросов"""
+        call_command('seed_data', customers=2, executors=5, orders=10, seed=1, stdout=StringIO())
+        out = StringIO()
+        call_command('run_benchmark', requests=3, warmup=1, read_only=True, scenarios=['order_list', 'executor_list'], host='testserver', stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report), {'order_list', 'executor_list'})
+        self.assertEqual(report['order_list']['requests'], 3)
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'queries_per_request'):
+            self.assertIn(key, report['order_list'])
+        self.assertGreater(report['order_list']['queries_per_request'], 0)
+
+
+class RunAsyncBenchmarkCommandTest(TestCase):
+    def test_benchmark_compares_modes(self):
+        """run_async_benchmark печатает отчет для синхронных и async-представлений"""
+        call_command('seed_data', customers=2, executors=5, orders=10, seed=1, stdout=StringIO())
+        out = StringIO()
+        call_command(
+            'run_async_benchmark', requests=2, concurrency=3, client_delay=1,
+            scenarios=['order_list', 'profile'], host='testserver', stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report), {'sync', 'async'})
+        for mode in ('sync', 'async'):
+            self.assertEqual(set(report[mode]), {'order_list', 'profile'})
+            self.assertEqual(report[mode]['order_list']['requests'], 6)
+            self.assertIn('throughput_rps', report[mode]['profile'])
+
+
+class RunConnectionBenchmarkCommandTest(TransactionTestCase):
+    # Отдельное соединение режима per_request видит только зафиксированные данные
+    def test_benchmark_compares_connection_modes(self):
+        """run_connection_benchmark печатает отчет для новых и переиспользуемых соединений"""
+        call_command('seed_data', customers=2, executors=5, orders=10, seed=1, stdout=StringIO())
+        out = StringIO()
+        call_command(
+            'run_connection_benchmark', requests=3, warmup=1,
+            scenarios=['order_list', 'profile'], host='testserver', stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report), {'settings', 'per_request', 'configured', 'saved_p50_ms'})
+        for mode in ('per_request', 'configured'):
+            self.assertEqual(set(report[mode]), {'order_list', 'profile'})
+            self.assertEqual(report[mode]['order_list']['requests'], 3)
+            self.assertIn('connect_avg_ms', report[mode]['order_list'])
+        self.assertIn('conn_max_age', report['settings'])
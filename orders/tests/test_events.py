@@ -0,0 +1,100 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, Client, TestCase
+from django.urls import reverse
+from accounts.models import UserProfile
+from core.asynchronous import async_views_enabled
+from core.events import get_broker
+from orders.events import order_channel
+from orders.models import Order, Bid
+
+
+class OrderEventsTest(TestCase):
+    """Публикация событий заказа и поток server-sent events"""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+
+        self.executor = User.objects.create_user(username='executor', password='qwerty123____')
+        UserProfile.objects.create(user=self.executor, role='executor', specialization='Python')
+
+        self.order = Order.objects.create(title='Заказ', description='Описание', customer=self.customer, budget=5000)
+        self.other_order = Order.objects.create(title='Другой', description='Описание', customer=self.customer)
+
+    def create_bid(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Bid.objects.create(order=self.order, executor=self.executor, message='Готов', price_proposal=4000)
+
+    async def test_bid_published_after_commit(self):
+        async with get_broker().subscribe(order_channel(self.order.id)) as subscription:
+            bid = await sync_to_async(self.create_bid)()
+            event = await subscription.get(timeout=1)
+
+        self.assertEqual(event['type'], 'bid')
+        self.assertEqual(event['id'], bid.id)
+        self.assertEqual(event['executor'], 'executor')
+        self.assertEqual(event['specialization'], 'Python')
+        self.assertEqual(event['price_proposal'], '4000')
+
+    async def test_transition_published(self):
+        def assign():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.order.transition('in_progress', assigned_executor=self.executor)
+
+        async with get_broker().subscribe(order_channel(self.order.id)) as subscription:
+            await sync_to_async(assign)()
+            event = await subscription.get(timeout=1)
+
+        self.assertEqual(event, {
+            'type': 'order', 'status': 'in_progress', 'status_display': 'В работе', 'assigned_executor': 'executor',
+        })
+
+    async def test_bulk_transition_published_per_order(self):
+        def cancel():
+            with self.captureOnCommitCallbacks(execute=True):
+                Order.objects.filter(customer=self.customer).transition('cancelled')
+
+        async with get_broker().subscribe(order_channel(self.order.id)) as first, \
+                get_broker().subscribe(order_channel(self.other_order.id)) as second:
+            await sync_to_async(cancel)()
+            self.assertEqual((await first.get(timeout=1))['status'], 'cancelled')
+            self.assertEqual((await second.get(timeout=1))['status'], 'cancelled')
+
+    async def test_stream(self):
+        """Поток отдает интервал переподключения, затем события отклика"""
+        client = AsyncClient()
+        await client.aforce_login(self.customer)
+        with async_views_enabled():
+            response = await client.get(reverse('order_events', args=[self.order.id]))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+            content = aiter(response.streaming_content)
+            self.assertTrue((await asyncio.wait_for(anext(content), 1)).startswith(b'retry:'))
+
+            await sync_to_async(self.create_bid)()
+            chunk = (await asyncio.wait_for(anext(content), 1)).decode()
+            await content.aclose()
+
+        self.assertTrue(chunk.startswith('event: bid\ndata: '))
+        self.assertIn('"executor": "executor"', chunk)
+
+    async def test_stream_missing_order(self):
+        client = AsyncClient()
+        await client.aforce_login(self.customer)
+        with async_views_enabled():
+            response = await client.get(reverse('order_events', args=[self.other_order.id + 100]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_stream_disabled_under_wsgi(self):
+        """Без ASGI поток не открывается: 204 останавливает переподключения EventSource"""
+        client = Client()
+        client.force_login(self.customer)
+        response = client.get(reverse('order_events', args=[self.order.id]))
+        self.assertEqual(response.status_code, 204)
+
+    def test_stream_requires_login(self):
+        response = Client().get(reverse('order_events', args=[self.order.id]))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from accounts.models import UserProfile
+from core.cache import bump_generation, get_generation
+from orders.models import Order
+
+
+class FragmentCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.customer = User.objects.create_user(username='customer', password='pass')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.order = Order.objects.create(title='Старое название', description='Описание', customer=self.customer)
+
+        self.executor = User.objects.create_user(username='executor', password='pass')
+        self.profile = UserProfile.objects.create(user=self.executor, role='executor', specialization='Python')
+
+    def test_generation_bump(self):
+        """Поколение модели увеличивается и восстанавливается после вытеснения"""
+        first = get_generation(Order)
+        self.assertEqual(bump_generation(Order), first + 1)
+
+        cache.clear()
+        self.assertGreater(bump_generation(Order), 0)
+
+    def test_order_card_reused_until_invalidated(self):
+        """Карточка заказа берется из кеша, пока не изменится поколение или updated_at"""
+        self.assertContains(self.client.get(reverse('order_list')), 'Старое название')
+
+        # update() не вызывает сигналы и не меняет updated_at — карточка остается в кеше
+        Order.objects.filter(pk=self.order.pk).update(title='Новое название')
+        self.assertContains(self.client.get(reverse('order_list')), 'Старое название')
+
+        # Сохранение любого заказа сбрасывает все карточки заказов
+        Order.objects.create(title='Другой заказ', description='Описание', customer=self.customer)
+        response = self.client.get(reverse('order_list'))
+        self.assertContains(response, 'Новое название')
+        self.assertNotContains(response, 'Старое название')
+
+    def test_executor_card_invalidated_on_profile_save(self):
+        """Сохранение профиля сбрасывает карточки исполнителей"""
+        self.assertContains(self.client.get(reverse('executor_list')), 'Python')
+
+        self.profile.specialization = 'Дизайнер'
+        self.profile.save()
+        response = self.client.get(reverse('executor_list'))
+        self.assertContains(response, 'Дизайнер')
+        self.assertNotContains(response, 'Python')
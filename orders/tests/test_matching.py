@@ -0,0 +1,144 @@
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.urls import reverse
+from accounts.models import UserProfile
+from orders.matching import rank_executors, suggest_executors, tokenize
+from orders.models import ExecutorTerm, MatchingTerm, Order, Review
+
+
+class MatchingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+
+    def executor(self, username, specialization, portfolio='', rating=0.0):
+        user = User.objects.create_user(username=username)
+        return UserProfile.objects.create(
+            user=user, role='executor', specialization=specialization, portfolio=portfolio, rating=rating,
+        )
+
+    def order(self, title, description='Описание'):
+        return Order.objects.create(title=title, description=description, customer=self.customer)
+
+    def document_counts(self):
+        return dict(MatchingTerm.objects.filter(document_count__gt=0).values_list('term', 'document_count'))
+
+    def test_tokenize(self):
+        """Короткие и служебные слова отбрасываются, формы слова сводятся к одному термину"""
+        self.assertEqual(
+            list(tokenize('Разработка и разработчики для API на Django 2024')),
+            ['разраб', 'разраб', 'api', 'django'],
+        )
+
+    def test_index_updated_on_profile_save(self):
+        profile = self.executor('dev', 'Django Backend', 'Сайты на Django')
+        self.assertEqual(set(profile.matching_terms.values_list('term', flat=True)), {'django', 'backen', 'сайты'})
+        self.assertEqual(self.document_counts(), {'django': 1, 'backen': 1, 'сайты': 1})
+
+        profile.specialization = 'Дизайнер'
+        profile.portfolio = ''
+        profile.save()
+        self.assertEqual(set(profile.matching_terms.values_list('term', flat=True)), {'дизайн'})
+        self.assertEqual(self.document_counts(), {'дизайн': 1})
+
+    def test_customers_and_deleted_profiles_are_not_indexed(self):
+        profile = self.executor('dev', 'Django Backend')
+        profile.role = 'customer'
+        profile.save()
+        self.assertFalse(ExecutorTerm.objects.exists())
+
+        profile = self.executor('dev2', 'Django Backend')
+        profile.user.delete()
+        self.assertFalse(ExecutorTerm.objects.exists())
+        self.assertEqual(self.document_counts(), {})
+
+    def test_rating_update_does_not_reindex(self):
+        profile = self.executor('dev', 'Django Backend')
+        profile.rating = 4.5
+        with self.assertNumQueries(1):
+            profile.save(update_fields=['rating'])
+
+    def test_ranking(self):
+        """Совпадение по тексту важнее рейтинга, рейтинг различает равные по тексту профили"""
+        django_dev = self.executor('django_dev', 'Django Backend', 'REST API на Django')
+        strong_dev = self.executor('strong_dev', 'Django Backend', 'REST API на Django', rating=5.0)
+        self.executor('designer', 'Дизайнер логотипов', 'Логотипы и фирменный стиль', rating=5.0)
+        self.executor('writer', 'Копирайтер')
+
+        order = self.order('Backend на Django', 'Нужен REST API для мобильного приложения')
+        ranked = rank_executors(order)
+        self.assertEqual([profile.pk for profile in ranked], [strong_dev.pk, django_dev.pk])
+        self.assertGreater(ranked[0].similarity, 0.5)
+        self.assertEqual(ranked[0].user.username, 'strong_dev')
+
+    def test_query_count_does_not_depend_on_executors(self):
+        for i in range(3):
+            self.executor(f'dev{i}', 'Django Backend', f'Проект {i} на Django')
+        order = self.order('Backend на Django')
+        cache.clear()
+        # Частоты терминов, число исполнителей, оценка и загрузка профилей
+        with self.assertNumQueries(4):
+            rank_executors(order)
+        with self.assertNumQueries(3):
+            rank_executors(order)
+
+    def test_suggestions_are_cached_until_profile_changes(self):
+        profile = self.executor('dev', 'Django Backend')
+        order = self.order('Backend на Django')
+        self.assertEqual(suggest_executors(order), [profile])
+        with self.assertNumQueries(0):
+            suggest_executors(order)
+
+        designer = self.executor('designer', 'Дизайнер')
+        designer.specialization = 'Django Backend'
+        designer.save()
+        self.assertEqual(len(suggest_executors(order)), 2)
+
+    def test_suggestions_refreshed_after_review(self):
+        """Рейтинг меняется UPDATE без post_save: кеш подбора сбрасывается после фиксации отзыва"""
+        profile = self.executor('dev', 'Django Backend')
+        order = self.order('Backend на Django')
+        self.assertEqual(suggest_executors(order)[0].rating, 0.0)
+
+        completed = Order.objects.create(
+            title='Готовый заказ', description='Описание', customer=self.customer,
+            status='completed', assigned_executor=profile.user,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(order=completed, customer=self.customer, executor=profile.user, rating=5)
+        self.assertEqual(suggest_executors(order)[0].rating, 5.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.get().delete()
+        self.assertEqual(suggest_executors(order)[0].rating, 0.0)
+
+    def test_rebuild_command(self):
+        profile = self.executor('dev', 'Django Backend')
+        ExecutorTerm.objects.all().delete()
+        MatchingTerm.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_matching_index', '--batch-size', '1', stdout=out)
+        self.assertIn('2 профилей', out.getvalue())
+        self.assertEqual(profile.matching_terms.count(), 2)
+        self.assertEqual(self.document_counts(), {'django': 1, 'backen': 1})
+
+    def test_order_detail_panel_for_customer(self):
+        self.executor('django_dev', 'Django Backend')
+        order = self.order('Backend на Django')
+        url = reverse('order_detail', args=[order.id])
+
+        client = Client()
+        client.force_login(self.customer)
+        response = client.get(url)
+        self.assertContains(response, 'Подходящие исполнители')
+        self.assertContains(response, 'django_dev')
+
+        other = User.objects.create_user(username='other')
+        UserProfile.objects.create(user=other, role='customer')
+        client.force_login(other)
+        self.assertEqual(client.get(url).context['suggested_executors'], [])
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.contrib.auth.models import User
 from orders.models import Order, Bid
+from orders.workflow import ORDER_WORKFLOW
 
 
 class OrderModelTest(TestCase):
@@ -41,9 +42,9 @@ class OrderModelTest(TestCase):
         self.assertIsNone(order.assigned_executor)
 
     def test_order_status_transition_method(self):
-        """Проверка созданного метода get_allowed_status_transitions"""
+        """Проверка допустимых переходов из статуса заказа"""
         order = Order.objects.create(title='Название', description='Описание', customer=self.customer, status='open')
-        allowed = dict(order.get_allowed_status_transitions())
+        allowed = dict(ORDER_WORKFLOW.transition_choices(order.status))
         self.assertIn('open', allowed)
         self.assertIn('in_progress', allowed)
         self.assertIn('cancelled', allowed)
@@ -102,3 +103,34 @@ class BidModelTest(TestCase):
             bid.updated_at,
             delta=2
         )
+
+
+class OrderTransitionTest(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer', password='pass')
+        self.executor = User.objects.create_user(username='executor', password='pass')
+        self.order = Order.objects.create(title='Заказ', description='Описание', customer=self.customer)
+
+    def test_transition_updates_only_changed_fields(self):
+        """Переход записывает статус и переданные поля, не затирая остальные"""
+        stale = Order.objects.get(pk=self.order.pk)
+        Order.objects.filter(pk=self.order.pk).update(title='Новое название')
+
+        self.assertTrue(stale.transition('in_progress', assigned_executor=self.executor))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'in_progress')
+        self.assertEqual(self.order.assigned_executor, self.executor)
+        self.assertEqual(self.order.title, 'Новое название')
+
+    def test_concurrent_transition_is_rejected(self):
+        """Второй переход по устаревшему статусу не применяется"""
+        first = Order.objects.get(pk=self.order.pk)
+        second = Order.objects.get(pk=self.order.pk)
+
+        self.assertTrue(first.transition('in_progress', assigned_executor=self.executor))
+        self.assertFalse(second.transition('cancelled', assigned_executor=None))
+        self.assertEqual(second.status, 'open')
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'in_progress')
+        self.assertEqual(self.order.assigned_executor, self.executor)
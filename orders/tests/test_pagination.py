@@ -0,0 +1,91 @@
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.utils import timezone
+from core.pagination import KeysetPaginator
+from orders.models import Order
+from accounts.models import UserProfile
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer', password='pass')
+        self.orders = [
+            Order.objects.create(title=f'Заказ {i}', description='Описание', customer=self.customer)
+            for i in range(5)
+        ]
+        # Одинаковое время создания у части заказов: порядок должен решаться по id
+        Order.objects.filter(id__in=[o.id for o in self.orders[1:4]]).update(created_at=timezone.now())
+        self.paginator = KeysetPaginator(Order.objects.all(), ('-created_at', '-id'), 2)
+
+    def titles(self, page):
+        return [order.title for order in page]
+
+    def test_walk_forward_and_back(self):
+        """Проход по страницам вперед и назад не теряет и не дублирует записи"""
+        expected = list(Order.objects.order_by('-created_at', '-id').values_list('title', flat=True))
+
+        first = self.paginator.get_page()
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+        second = self.paginator.get_page(first.next_cursor)
+        third = self.paginator.get_page(second.next_cursor)
+        self.assertFalse(third.has_next)
+        self.assertEqual(self.titles(first) + self.titles(second) + self.titles(third), expected)
+
+        back = self.paginator.get_page(third.previous_cursor)
+        self.assertEqual(self.titles(back), self.titles(second))
+        back = self.paginator.get_page(back.previous_cursor)
+        self.assertEqual(self.titles(back), self.titles(first))
+        self.assertFalse(back.has_previous)
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Некорректный курсор приводит к первой странице"""
+        first = self.paginator.get_page()
+        for cursor in ('мусор', 'abc', 'WyJ4IiwgW119'):
+            self.assertEqual(self.titles(self.paginator.get_page(cursor)), self.titles(first))
+
+    def test_mixed_directions_rejected(self):
+        """Поля сортировки с разным направлением не поддерживаются"""
+        with self.assertRaises(ValueError):
+            KeysetPaginator(Order.objects.all(), ('-created_at', 'id'), 2)
+
+
+@override_settings(ORDERS_PAGE_SIZE=2)
+class OrderListPaginationTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        for i in range(3):
+            Order.objects.create(title=f'Заказ {i}', description='Описание', customer=self.customer)
+
+    def test_order_list_next_page(self):
+        """Лента заказов разбита на страницы и переходит по курсору"""
+        response = self.client.get(reverse('order_list'))
+        page = response.context['page']
+        self.assertEqual(len(page), 2)
+        self.assertContains(response, 'Вперед')
+
+        response = self.client.get(reverse('order_list'), {'cursor': page.next_cursor})
+        self.assertEqual([o.title for o in response.context['orders']], ['Заказ 0'])
+
+    def test_search_pages_without_count(self):
+        """Результаты поиска листаются по номеру страницы одним запросом, без COUNT(*)"""
+        response = self.client.get(reverse('order_list'), {'q': 'Заказ'})
+        page = response.context['page']
+        self.assertEqual((len(page), page.number, page.has_next, page.has_previous), (2, 1, True, False))
+        self.assertContains(response, 'Страница 1')
+
+        response = self.client.get(reverse('order_list'), {'q': 'Заказ', 'page': '2'})
+        page = response.context['page']
+        self.assertEqual([o.title for o in page], ['Заказ 0'])
+        self.assertEqual((page.has_next, page.has_previous), (False, True))
+
+    def test_my_orders_paginated(self):
+        """Мои заказы также используют курсорную пагинацию"""
+        self.client.login(username='customer', password='qwerty123____')
+        response = self.client.get(reverse('my_orders'))
+        self.assertEqual(len(response.context['customer_orders']), 2)
+        self.assertTrue(response.context['page'].has_next)
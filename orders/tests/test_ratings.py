@@ -0,0 +1,131 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.urls import reverse
+from accounts.models import UserProfile
+from orders.models import Order, Review
+
+
+class RatingTest(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.executor = User.objects.create_user(username='executor', password='qwerty123____')
+        self.profile = UserProfile.objects.create(user=self.executor, role='executor')
+
+    def completed_order(self, title='Заказ'):
+        return Order.objects.create(
+            title=title, description='Описание', customer=self.customer,
+            status='completed', assigned_executor=self.executor,
+        )
+
+    def review(self, rating, order=None):
+        return Review.objects.create(
+            order=order or self.completed_order(), customer=self.customer, executor=self.executor, rating=rating,
+        )
+
+    def assertRating(self, rating_sum, rating_count, rating):
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.rating_sum, self.profile.rating_count), (rating_sum, rating_count))
+        self.assertAlmostEqual(self.profile.rating, rating)
+
+    def test_rating_updated_on_create(self):
+        """Каждый отзыв меняет сумму, количество и среднюю оценку одним UPDATE"""
+        self.review(5)
+        order = self.completed_order('Второй заказ')
+        with self.assertNumQueries(2):
+            self.review(2, order)
+        self.assertRating(7, 2, 3.5)
+
+    def test_rating_updated_on_delete(self):
+        first = self.review(5)
+        self.review(4)
+        first.delete()
+        self.assertRating(4, 1, 4.0)
+
+        Review.objects.all().delete()
+        self.assertRating(0, 0, 0.0)
+
+    def test_rating_updated_on_change(self):
+        review = self.review(5)
+        self.review(3)
+        review.rating = 1
+        review.save()
+        self.assertRating(4, 2, 2.0)
+
+    def test_order_delete_removes_review_from_rating(self):
+        self.review(5)
+        self.review(1).order.delete()
+        self.assertRating(5, 1, 5.0)
+
+    def test_rating_range_constraint(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.review(6)
+
+    def test_recompute_command(self):
+        """Команда восстанавливает рейтинг по отзывам"""
+        self.review(4)
+        self.review(5)
+        UserProfile.objects.filter(pk=self.profile.pk).update(rating_sum=0, rating_count=0, rating=0.0)
+
+        out = StringIO()
+        call_command('recompute_ratings', '--batch-size', '1', stdout=out)
+        self.assertIn('1 исполнителей', out.getvalue())
+        self.assertRating(9, 2, 4.5)
+
+
+class ReviewViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.executor = User.objects.create_user(username='executor', password='qwerty123____')
+        UserProfile.objects.create(user=self.executor, role='executor')
+        self.order = Order.objects.create(
+            title='Заказ', description='Описание', customer=self.customer,
+            status='in_progress', assigned_executor=self.executor,
+        )
+        self.url = reverse('order_detail', args=[self.order.id])
+        self.client.force_login(self.customer)
+
+    def test_completing_keeps_executor(self):
+        """Завершенный заказ сохраняет исполнителя, которому оставляется отзыв"""
+        self.client.post(self.url, {'change_status': '1', 'new_status': 'completed'})
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'completed')
+        self.assertEqual(self.order.assigned_executor, self.executor)
+
+    def test_customer_leaves_review(self):
+        self.order.transition('completed')
+        response = self.client.get(self.url)
+        self.assertIsNotNone(response.context['review_form'])
+
+        response = self.client.post(self.url, {'leave_review': '1', 'rating': '4', 'comment': 'Хорошо'})
+        self.assertEqual(response.status_code, 302)
+        review = Review.objects.get(order=self.order)
+        self.assertEqual((review.executor, review.customer, review.rating), (self.executor, self.customer, 4))
+        self.assertEqual(UserProfile.objects.get(user=self.executor).rating_count, 1)
+
+        response = self.client.get(self.url)
+        self.assertIsNone(response.context['review_form'])
+        self.assertContains(response, 'Хорошо')
+
+    def test_second_review_is_ignored(self):
+        self.order.transition('completed')
+        self.client.post(self.url, {'leave_review': '1', 'rating': '4'})
+        self.client.post(self.url, {'leave_review': '1', 'rating': '1'})
+        self.assertEqual(Review.objects.get(order=self.order).rating, 4)
+
+    def test_no_review_before_completion(self):
+        response = self.client.post(self.url, {'leave_review': '1', 'rating': '5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['review_form'])
+        self.assertFalse(Review.objects.exists())
+
+    def test_executor_cannot_review(self):
+        self.order.transition('completed')
+        self.client.force_login(self.executor)
+        self.client.post(self.url, {'leave_review': '1', 'rating': '5'})
+        self.assertFalse(Review.objects.exists())
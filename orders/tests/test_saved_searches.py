@@ -0,0 +1,174 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from tablib import Dataset
+from accounts.models import UserProfile
+from orders.admin import OrderResource
+from orders.models import InboxEntry, Order, SavedSearch, SavedSearchTerm
+from orders.percolator import matching_searches, percolate
+
+
+class PercolatorTest(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.executor = User.objects.create_user(username='executor')
+        UserProfile.objects.create(user=self.executor, role='executor')
+
+    def search(self, keywords='', executor=None, **kwargs):
+        return SavedSearch.objects.create(executor=executor or self.executor, keywords=keywords, **kwargs)
+
+    def order(self, title, description='Описание', **kwargs):
+        # Order.objects.create доставил бы заказ после фиксации транзакции — здесь подбор вызывается явно
+        return Order(title=title, description=description, customer=self.customer, **kwargs)
+
+    def matches(self, order):
+        return {search_id for _, search_id in matching_searches(order)}
+
+    def test_search_is_indexed_by_terms(self):
+        search = self.search('Разработка API на Django')
+        self.assertEqual(
+            set(search.terms.values_list('term', 'term_count')),
+            {('разраб', 3), ('api', 3), ('django', 3)},
+        )
+        search.keywords = 'Django'
+        search.min_budget = Decimal('5000')
+        search.save()
+        self.assertEqual(list(search.terms.values_list('term', 'min_budget')), [('django', Decimal('5000'))])
+
+    def test_all_keywords_must_match(self):
+        both = self.search('django api')
+        django_only = self.search('django')
+        other = self.search('дизайн логотипа')
+        self.assertEqual(self.matches(self.order('Разработка на Django', 'Нужен REST API')), {both.pk, django_only.pk})
+        self.assertEqual(self.matches(self.order('Бот на Django')), {django_only.pk})
+        self.assertNotIn(other.pk, self.matches(self.order('Дизайн сайта')))
+
+    def test_budget_threshold(self):
+        any_budget = self.search('django')
+        cheap = self.search('django', min_budget=Decimal('1000'))
+        expensive = self.search('django', min_budget=Decimal('50000'))
+        self.assertEqual(self.matches(self.order('Django', budget=Decimal('20000'))), {any_budget.pk, cheap.pk})
+        self.assertEqual(self.matches(self.order('Django', budget=Decimal('50000'))), {any_budget.pk, cheap.pk, expensive.pk})
+        # Заказ без бюджета не проходит поиск с минимальным бюджетом
+        self.assertEqual(self.matches(self.order('Django')), {any_budget.pk})
+
+    def test_deadline_limit(self):
+        now = timezone.now()
+        soon = self.search('django', max_deadline=now + timedelta(days=7))
+        any_deadline = self.search('django')
+        self.assertEqual(self.matches(self.order('Django', deadline=now + timedelta(days=3))), {soon.pk, any_deadline.pk})
+        self.assertEqual(self.matches(self.order('Django', deadline=now + timedelta(days=30))), {any_deadline.pk})
+        self.assertEqual(self.matches(self.order('Django')), {soon.pk, any_deadline.pk})
+
+    def test_search_without_keywords_matches_every_order(self):
+        everything = self.search('', min_budget=Decimal('10000'))
+        self.assertEqual(self.matches(self.order('Перевод статьи', budget=Decimal('10000'))), {everything.pk})
+        self.assertEqual(self.matches(self.order('Перевод статьи', budget=Decimal('9999'))), set())
+
+    def test_inbox_entry_per_executor(self):
+        self.search('django')
+        self.search('api')
+        other = User.objects.create_user(username='other')
+        other_search = self.search('django', executor=other)
+
+        order = Order.objects.create(title='Django API', description='Описание', customer=self.customer)
+        InboxEntry.objects.all().delete()
+        self.assertEqual(percolate(order), 2)
+        self.assertEqual(InboxEntry.objects.filter(executor=self.executor, order=order).count(), 1)
+        self.assertEqual(InboxEntry.objects.get(executor=other).search, other_search)
+        # Повторная доставка не дублирует записи
+        percolate(order)
+        self.assertEqual(InboxEntry.objects.count(), 2)
+
+    def test_query_count_does_not_depend_on_searches(self):
+        for i in range(20):
+            executor = User.objects.create_user(username=f'executor{i}')
+            self.search('django', executor=executor)
+        order = Order.objects.create(title='Django', description='Описание', customer=self.customer)
+        with self.assertNumQueries(2):
+            self.assertEqual(percolate(order), 20)
+
+    def test_new_order_is_delivered_after_commit(self):
+        self.search('django')
+        with self.captureOnCommitCallbacks(execute=True):
+            order = Order.objects.create(title='Бот на Django', description='Описание', customer=self.customer)
+        self.assertTrue(InboxEntry.objects.filter(executor=self.executor, order=order).exists())
+
+        # Изменение заказа повторно не доставляет, закрытые заказы не доставляются
+        with self.captureOnCommitCallbacks(execute=True):
+            order.save()
+            Order.objects.create(title='Django', description='Описание', customer=self.customer, status='cancelled')
+        self.assertEqual(InboxEntry.objects.count(), 1)
+
+    def test_deleting_search_removes_terms(self):
+        search = self.search('django')
+        search.delete()
+        self.assertFalse(SavedSearchTerm.objects.exists())
+
+    def test_imported_orders_are_delivered(self):
+        self.search('django')
+        dataset = Dataset(headers=['title', 'description', 'customer__username', 'status'])
+        dataset.append(['Сайт на Django', 'Описание', 'customer', 'open'])
+        dataset.append(['Django', 'Описание', 'customer', 'completed'])
+        with self.captureOnCommitCallbacks(execute=True):
+            result = OrderResource().import_data(dataset, use_transactions=True)
+        self.assertFalse(result.has_errors())
+        self.assertEqual(list(InboxEntry.objects.values_list('order__title', flat=True)), ['Сайт на Django'])
+
+
+class SavedSearchViewsTest(TestCase):
+    def setUp(self):
+        self.executor = User.objects.create_user(username='executor', password='qwerty123____')
+        UserProfile.objects.create(user=self.executor, role='executor')
+        self.customer = User.objects.create_user(username='customer')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.client = Client()
+        self.client.force_login(self.executor)
+
+    def test_create_and_delete_search(self):
+        response = self.client.post(reverse('saved_searches'), {'keywords': 'Django', 'min_budget': '5000'})
+        self.assertRedirects(response, reverse('saved_searches'))
+        search = SavedSearch.objects.get(executor=self.executor)
+        self.assertEqual(search.terms.count(), 1)
+        self.assertContains(self.client.get(reverse('saved_searches')), 'Django')
+
+        response = self.client.post(reverse('delete_saved_search', args=[search.id]))
+        self.assertRedirects(response, reverse('saved_searches'))
+        self.assertFalse(SavedSearch.objects.exists())
+
+    @override_settings(SAVED_SEARCHES_PER_EXECUTOR=1)
+    def test_search_limit(self):
+        SavedSearch.objects.create(executor=self.executor, keywords='django')
+        response = self.client.post(reverse('saved_searches'), {'keywords': 'python'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'не более 1 поисков')
+        self.assertEqual(SavedSearch.objects.count(), 1)
+
+    def test_cannot_delete_foreign_search(self):
+        search = SavedSearch.objects.create(executor=self.customer, keywords='django')
+        response = self.client.post(reverse('delete_saved_search', args=[search.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_customer_has_no_inbox(self):
+        self.client.force_login(self.customer)
+        self.assertEqual(self.client.get(reverse('inbox')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('saved_searches')).status_code, 403)
+
+    def test_inbox_marks_entries_read(self):
+        search = SavedSearch.objects.create(executor=self.executor, keywords='django')
+        order = Order.objects.create(title='Бот на Django', description='Описание', customer=self.customer)
+        InboxEntry.objects.create(executor=self.executor, order=order, search=search)
+
+        response = self.client.get(reverse('inbox'))
+        self.assertContains(response, 'Бот на Django')
+        self.assertContains(response, 'новый')
+        self.assertEqual(response.context['unread_count'], 1)
+        self.assertTrue(InboxEntry.objects.get().is_read)
+
+        response = self.client.get(reverse('inbox'))
+        self.assertNotContains(response, 'badge bg-primary">новый')
+        self.assertEqual(response.context['unread_count'], 0)
@@ -1,4 +1,5 @@
-from django.test import TestCase, Client
+from unittest import mock
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -160,3 +161,164 @@ class OrdersViewsTest(TestCase):
         self.order.refresh_from_db()
         self.assertEqual(self.order.assigned_executor, self.executor)
         self.assertEqual(self.order.status, 'in_progress')
+
+
+class OrderSearchViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+
+        Order.objects.create(title='Разработка сайта', description='Лендинг на Django', customer=self.customer)
+        Order.objects.create(title='Дизайн логотипа', description='Векторный логотип', customer=self.customer)
+        Order.objects.create(title='Закрытый сайт', description='Django', customer=self.customer, status='cancelled')
+
+    def test_search_filters_open_orders(self):
+        """Поиск находит только открытые заказы, подходящие под запрос"""
+        response = self.client.get(reverse('order_list'), {'q': 'Django'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([o.title for o in response.context['orders']], ['Разработка сайта'])
+
+    def test_search_without_results(self):
+        """Пустой результат поиска показывает сообщение"""
+        response = self.client.get(reverse('order_list'), {'q': 'перевод'})
+        self.assertContains(response, 'ничего не найдено')
+
+    def test_admin_search_uses_order_search(self):
+        """Поиск в админке заказов работает через тот же механизм"""
+        User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123____')
+        self.client.login(username='admin', password='admin123____')
+        response = self.client.get('/admin/orders/order/', {'q': 'логотип'})
+        self.assertContains(response, 'Дизайн логотипа')
+        self.assertNotContains(response, 'Разработка сайта')
+
+
+@override_settings(EXECUTORS_PAGE_SIZE=2)
+class ExecutorDirectoryViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        for username, specialization, rating in [
+            ('alice', 'Python Developer', 4.9),
+            ('bob', 'Дизайнер', 4.5),
+            ('carol', 'Python Backend', 3.0),
+        ]:
+            user = User.objects.create_user(username=username, password='qwerty123____')
+            UserProfile.objects.create(user=user, role='executor', specialization=specialization, rating=rating)
+
+        customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=customer, role='customer', rating=5.0)
+
+    def usernames(self, response):
+        return [profile.user.username for profile in response.context['executors']]
+
+    def test_executors_ordered_by_rating_and_paged(self):
+        """Исполнители отсортированы по рейтингу и разбиты на страницы"""
+        response = self.client.get(reverse('executor_list'))
+        self.assertEqual(self.usernames(response), ['alice', 'bob'])
+
+        response = self.client.get(reverse('executor_list'), {'cursor': response.context['page'].next_cursor})
+        self.assertEqual(self.usernames(response), ['carol'])
+
+    def test_filter_by_specialization(self):
+        """Фильтр по специализации"""
+        response = self.client.get(reverse('executor_list'), {'specialization': 'python'})
+        self.assertEqual(self.usernames(response), ['alice', 'carol'])
+
+    def test_search_by_username(self):
+        """Поиск по логину исполнителя"""
+        response = self.client.get(reverse('executor_list'), {'q': 'bob'})
+        self.assertEqual(self.usernames(response), ['bob'])
+
+
+class OrderStatusConflictViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.order = Order.objects.create(title='Название', description='Описание', customer=self.customer)
+        self.client.login(username='customer', password='qwerty123____')
+
+    def test_change_status(self):
+        """Заказчик меняет статус заказа"""
+        url = reverse('order_detail', kwargs={'order_id': self.order.id})
+        response = self.client.post(url, {'change_status': '1', 'new_status': 'cancelled'})
+        self.assertRedirects(response, url)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'cancelled')
+
+    def test_change_status_rejected_when_order_changed(self):
+        """Если статус изменился между чтением и записью, пользователь видит сообщение"""
+        url = reverse('order_detail', kwargs={'order_id': self.order.id})
+        original = Order.transition
+
+        def concurrent_transition(order, *args, **kwargs):
+            Order.objects.filter(pk=order.pk).update(status='cancelled')
+            return original(order, *args, **kwargs)
+
+        with mock.patch.object(Order, 'transition', concurrent_transition):
+            response = self.client.post(url, {'change_status': '1', 'new_status': 'cancelled'}, follow=True)
+
+        self.assertContains(response, 'Статус заказа уже изменился')
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'cancelled')
+
+    def test_in_progress_requires_assignment(self):
+        """В работу заказ переводится только назначением исполнителя, не выбором статуса"""
+        url = reverse('order_detail', kwargs={'order_id': self.order.id})
+        response = self.client.get(url)
+        self.assertEqual(response.context['allowed_status_transitions'], (('open', 'Открыт'), ('cancelled', 'Отменен')))
+
+        self.client.post(url, {'change_status': '1', 'new_status': 'in_progress'})
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'open')
+
+
+class BulkOrderStatusViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.executor = User.objects.create_user(username='executor', password='qwerty123____')
+        UserProfile.objects.create(user=self.executor, role='executor')
+
+        self.open_order = Order.objects.create(title='Открытый', description='Описание', customer=self.customer)
+        self.in_progress = Order.objects.create(
+            title='В работе', description='Описание', customer=self.customer,
+            status='in_progress', assigned_executor=self.executor
+        )
+        self.completed = Order.objects.create(title='Завершенный', description='Описание', customer=self.customer, status='completed')
+        self.client.login(username='customer', password='qwerty123____')
+
+    def test_bulk_cancel_reports_skipped(self):
+        """Массовая отмена переводит допустимые заказы и сообщает о пропущенных"""
+        response = self.client.post(reverse('my_orders_bulk'), {
+            'new_status': 'cancelled',
+            'orders': [self.open_order.id, self.in_progress.id, self.completed.id],
+        }, follow=True)
+
+        self.assertRedirects(response, reverse('my_orders'))
+        self.assertContains(response, 'заказов: 2')
+        self.assertContains(response, 'Пропущены заказы, для которых переход недопустим: Завершенный')
+
+        self.assertEqual(
+            dict(Order.objects.values_list('title', 'status')),
+            {'Открытый': 'cancelled', 'В работе': 'cancelled', 'Завершенный': 'completed'}
+        )
+        self.in_progress.refresh_from_db()
+        self.assertIsNone(self.in_progress.assigned_executor)
+
+    def test_bulk_rejects_foreign_orders(self):
+        """Чужие заказы не проходят валидацию формы"""
+        other = User.objects.create_user(username='other', password='qwerty123____')
+        foreign = Order.objects.create(title='Чужой', description='Описание', customer=other)
+
+        response = self.client.post(reverse('my_orders_bulk'), {'new_status': 'cancelled', 'orders': [foreign.id]}, follow=True)
+        self.assertContains(response, 'Выберите заказы и новый статус.')
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'open')
+
+    def test_bulk_forbidden_for_executor(self):
+        """Исполнитель не может выполнять массовые операции"""
+        self.client.login(username='executor', password='qwerty123____')
+        response = self.client.post(reverse('my_orders_bulk'), {'new_status': 'cancelled', 'orders': [self.open_order.id]})
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,169 @@
+import io
+from contextlib import redirect_stdout
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.test import TestCase, Client
+from django.urls import reverse
+from accounts.models import UserProfile
+from orders.forms import OrderAdminForm
+from orders.models import Bid, Order, order_transitioned
+from orders.workflow import ORDER_WORKFLOW, TransitionNotAllowed, Workflow
+
+
+class WorkflowTest(TestCase):
+    def test_tables(self):
+        self.assertEqual(ORDER_WORKFLOW.sources['open'], ('in_progress', 'completed', 'cancelled'))
+        self.assertEqual(ORDER_WORKFLOW.sources['completed'], ('in_progress',))
+        self.assertEqual(
+            ORDER_WORKFLOW.transition_choices('in_progress'),
+            (('open', 'Открыт'), ('in_progress', 'В работе'), ('completed', 'Завершен'), ('cancelled', 'Отменен')),
+        )
+        self.assertEqual(ORDER_WORKFLOW.status_choices('completed'), (('open', 'Открыт'), ('completed', 'Завершен')))
+        self.assertNotIn('in_progress', dict(ORDER_WORKFLOW.bulk_choices))
+        self.assertTrue(ORDER_WORKFLOW.can_transition('open', 'in_progress'))
+        self.assertFalse(ORDER_WORKFLOW.can_choose('open', 'in_progress'))
+        self.assertFalse(ORDER_WORKFLOW.can_transition('completed', 'cancelled'))
+
+    def test_unknown_status_in_transitions(self):
+        with self.assertRaises(ValueError):
+            Workflow(states=[('a', 'A')], transitions={'a': ['b']})
+
+    def test_prepare_runs_hooks_and_checks_required_fields(self):
+        self.assertEqual(ORDER_WORKFLOW.prepare('cancelled', {}), {'assigned_executor': None})
+        self.assertEqual(ORDER_WORKFLOW.prepare('completed', {}), {})
+        with self.assertRaises(TransitionNotAllowed):
+            ORDER_WORKFLOW.prepare('in_progress', {})
+        with self.assertRaises(TransitionNotAllowed):
+            ORDER_WORKFLOW.prepare('archived', {})
+
+
+class OrderWorkflowTest(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer', password='qwerty123____')
+        UserProfile.objects.create(user=self.customer, role='customer')
+        self.executor = User.objects.create_user(username='executor')
+        UserProfile.objects.create(user=self.executor, role='executor')
+        self.order = Order.objects.create(
+            title='Заказ', description='Описание', customer=self.customer,
+            status='in_progress', assigned_executor=self.executor,
+        )
+
+    def test_transition_hooks(self):
+        self.assertTrue(self.order.transition('open'))
+        self.assertIsNone(self.order.assigned_executor)
+        self.order.refresh_from_db()
+        self.assertIsNone(self.order.assigned_executor_id)
+
+    def test_disallowed_transition(self):
+        self.order.transition('completed')
+        with self.assertRaises(TransitionNotAllowed):
+            self.order.transition('cancelled')
+
+    def test_bulk_transition(self):
+        other = Order.objects.create(title='Другой', description='Описание', customer=self.customer, status='completed')
+        updated = Order.objects.filter(customer=self.customer).transition('cancelled')
+        self.assertEqual(updated, {self.order.pk})
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.status, self.order.assigned_executor), ('cancelled', None))
+        other.refresh_from_db()
+        self.assertEqual(other.status, 'completed')
+
+    def test_status_check_constraint(self):
+        with self.assertRaises(IntegrityError):
+            Order.objects.filter(pk=self.order.pk).update(status='archived')
+
+    def test_order_detail_writes_nothing_to_stdout(self):
+        client = Client()
+        client.force_login(self.customer)
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            response = client.get(reverse('order_detail', args=[self.order.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(stdout.getvalue(), '')
+
+
+class OrderAdminWorkflowTest(TestCase):
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123____')
+        self.client = Client()
+        self.client.force_login(self.superuser)
+        self.customer = User.objects.create_user(username='customer')
+        self.executor = User.objects.create_user(username='executor')
+
+    def order(self, **kwargs):
+        return Order.objects.create(title='Заказ', description='Описание', customer=self.customer, **kwargs)
+
+    def form_data(self, order, **changes):
+        data = {
+            'title': order.title, 'description': order.description, 'customer': order.customer_id,
+            'status': order.status, 'assigned_executor': order.assigned_executor_id or '',
+            'loaded_status': order.status,
+        }
+        data.update(changes)
+        return data
+
+    def test_status_choices_follow_transitions(self):
+        form = OrderAdminForm(instance=self.order(status='completed'))
+        self.assertEqual(form.fields['status'].choices, [('open', 'Открыт'), ('completed', 'Завершен')])
+
+    def test_in_progress_requires_executor(self):
+        order = self.order()
+        form = OrderAdminForm(self.form_data(order, status='in_progress'), instance=order)
+        self.assertIn('assigned_executor', form.errors)
+
+        form = OrderAdminForm(self.form_data(order, status='in_progress', assigned_executor=self.executor.pk), instance=order)
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_admin_change_runs_hooks(self):
+        order = self.order(status='in_progress', assigned_executor=self.executor)
+        url = reverse('admin:orders_order_change', args=[order.pk])
+        response = self.client.post(url, self.form_data(order, status='cancelled'))
+        self.assertEqual(response.status_code, 302)
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.assigned_executor), ('cancelled', None))
+
+    def test_admin_status_change_is_a_transition(self):
+        """Смена статуса в админке отправляет order_transitioned и не затирает статистику откликов"""
+        order = self.order()
+        Bid.objects.create(order=order, executor=self.executor, price_proposal=1000)
+        sent = []
+
+        def receiver(sender, order_ids, status, **kwargs):
+            sent.append((list(order_ids), status))
+
+        order_transitioned.connect(receiver, sender=Order)
+        self.addCleanup(order_transitioned.disconnect, receiver, sender=Order)
+
+        url = reverse('admin:orders_order_change', args=[order.pk])
+        response = self.client.post(url, self.form_data(order, status='cancelled', title='Новое название'))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(sent, [([order.pk], 'cancelled')])
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.title, order.bid_count), ('cancelled', 'Новое название', 1))
+
+    def test_admin_stale_status_rejected(self):
+        """Если статус изменился после открытия формы, изменение отклоняется целиком"""
+        order = self.order()
+        url = reverse('admin:orders_order_change', args=[order.pk])
+        self.assertContains(self.client.get(url), 'name="loaded_status" value="open"')
+
+        Order.objects.filter(pk=order.pk).update(status='in_progress', assigned_executor=self.executor)
+        response = self.client.post(url, self.form_data(order, status='cancelled', title='Новое название'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Заказ изменен другим запросом')
+        self.assertFalse(LogEntry.objects.exists())
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.title), ('in_progress', 'Заказ'))
+
+    def test_bulk_action(self):
+        open_order = self.order()
+        completed = self.order(status='completed', assigned_executor=self.executor)
+        response = self.client.post(reverse('admin:orders_order_changelist'), {
+            'action': 'transition_to_cancelled',
+            '_selected_action': [open_order.pk, completed.pk],
+        }, follow=True)
+        self.assertContains(response, 'установлен для заказов: 1, пропущено: 1')
+        open_order.refresh_from_db()
+        completed.refresh_from_db()
+        self.assertEqual((open_order.status, completed.status), ('cancelled', 'completed'))
@@ -1,12 +1,24 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
+
+# Под ASGI читающие представления работают нативно, без переключения в поток
+read_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path('', views.order_list, name='order_list'),
-    path('executors/', views.executor_list, name='executor_list'),
+    path('', read_views.order_list, name='order_list'),
+    path('executors/', read_views.executor_list, name='executor_list'),
     path('my_orders/', views.my_orders, name='my_orders'),
+    path('my_orders/bulk/', views.my_orders_bulk, name='my_orders_bulk'),
     path('my_assigned_orders/', views.my_assigned_orders, name='my_assigned_orders'),
+    path('saved_searches/', views.saved_searches, name='saved_searches'),
+    path('saved_searches/<int:search_id>/delete/', views.delete_saved_search, name='delete_saved_search'),
+    path('inbox/', views.inbox, name='inbox'),
     path('create_order/', views.create_order, name='create_order'),
-    path('order/<int:order_id>/', views.order_detail, name='order_detail'),
-    path('order/<int:order_id>/edit/', views.edit_order, name='edit_order')
+    path('order/<int:order_id>/', read_views.order_detail, name='order_detail'),
+    path('order/<int:order_id>/events/', async_views.order_events, name='order_events'),
+    path('order/<int:order_id>/edit/', views.edit_order, name='edit_order'),
+    path('api/orders/', api.order_list, name='api_order_list'),
+    path('api/orders/<int:order_id>/', api.order_detail, name='api_order_detail'),
+    path('api/executors/', api.executor_list, name='api_executor_list'),
 ]
\ No newline at end of file
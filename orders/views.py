@@ -1,22 +1,79 @@
+from django.conf import settings
+from django.contrib import messages
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import redirect_to_login
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from django.http import HttpResponseRedirect
+from django.views.decorators.http import require_POST
 from django.core.exceptions import PermissionDenied
-from .models import Order, Bid
-from .forms import BidForm, OrderForm
+from accounts.models import UserProfile
+from core.cache import get_generation
+from core.pagination import KeysetPaginator, OffsetPaginator
+from .models import InboxEntry, Order, Bid, Review, SavedSearch
+from .forms import BidForm, BulkOrderStatusForm, OrderForm, ReviewForm, SavedSearchForm
+from .matching import suggest_executors
+from .search import search_executors, search_orders
+from .workflow import ORDER_WORKFLOW
 # Create your views here.
 
+ORDER_FEED_ORDERING = ('-created_at', '-id')
+
+STALE_ORDER_MESSAGE = 'Статус заказа уже изменился. Обновите страницу и повторите действие.'
+
+
+def can_leave_review(order, is_customer, review):
+    return is_customer and review is None and order.status == 'completed' and order.assigned_executor_id is not None
+
+
+def paginate_orders(request, queryset):
+    paginator = KeysetPaginator(queryset, ORDER_FEED_ORDERING, settings.ORDERS_PAGE_SIZE)
+    return paginator.get_page(request.GET.get('cursor'))
+
 
 def order_list(request):
     orders = Order.objects.filter(status='open').select_related('customer')
-    return render(request, 'orders/order_list.html', {'orders': orders})
+    query = request.GET.get('q', '').strip()
+
+    if query:
+        # Результаты поиска упорядочены по релевантности, поэтому листаются по номеру
+        # страницы — без COUNT(*), одним запросом, как и лента
+        results = search_orders(orders, query)
+        page = OffsetPaginator(results, settings.ORDERS_PAGE_SIZE).get_page(request.GET.get('page'))
+    else:
+        page = paginate_orders(request, orders)
+
+    context = {
+        'orders': page.object_list,
+        'page': page,
+        'query': query,
+        'cache_generation': get_generation(Order),
+    }
+    return render(request, 'orders/order_list.html', context)
 
 
 def executor_list(request):
-    executors = User.objects.filter(profile__role='executor').select_related('profile')
-    return render(request, 'orders/executor_list.html', {'executors': executors})
+    executors = UserProfile.objects.filter(role='executor').select_related('user')
+
+    specialization = request.GET.get('specialization', '').strip()
+    if specialization:
+        executors = executors.filter(specialization__icontains=specialization)
+
+    query = request.GET.get('q', '').strip()
+    executors = search_executors(executors, query)
+
+    paginator = KeysetPaginator(executors, ('-rating', '-id'), settings.EXECUTORS_PAGE_SIZE)
+    page = paginator.get_page(request.GET.get('cursor'))
+
+    context = {
+        'executors': page.object_list,
+        'page': page,
+        'query': query,
+        'specialization': specialization,
+        'cache_generation': get_generation(UserProfile),
+    }
+    return render(request, 'orders/executor_list.html', context)
 
 
 @login_required
@@ -24,8 +81,38 @@ def my_orders(request):
     if request.user.profile.role != 'customer':
         raise PermissionDenied
 
-    customer_orders = Order.objects.filter(customer=request.user)
-    return render(request, 'orders/my_orders.html', {'customer_orders': customer_orders})
+    customer_orders = Order.objects.filter(customer=request.user).select_related('assigned_executor')
+    page = paginate_orders(request, customer_orders)
+    context = {
+        'customer_orders': page.object_list,
+        'page': page,
+        'bulk_form': BulkOrderStatusForm(customer=request.user),
+    }
+    return render(request, 'orders/my_orders.html', context)
+
+
+@login_required
+@require_POST
+def my_orders_bulk(request):
+    if request.user.profile.role != 'customer':
+        raise PermissionDenied
+
+    form = BulkOrderStatusForm(request.POST, customer=request.user)
+    if not form.is_valid():
+        messages.error(request, 'Выберите заказы и новый статус.')
+        return redirect('my_orders')
+
+    new_status = form.cleaned_data['new_status']
+    orders = form.cleaned_data['orders']
+    updated = Order.objects.filter(pk__in=[order.pk for order in orders]).transition(new_status)
+
+    status_label = ORDER_WORKFLOW.labels[new_status]
+    if updated:
+        messages.success(request, f'Статус «{status_label}» установлен для заказов: {len(updated)}.')
+    skipped = [order.title for order in orders if order.pk not in updated]
+    if skipped:
+        messages.warning(request, f'Пропущены заказы, для которых переход недопустим: {", ".join(skipped)}.')
+    return redirect('my_orders')
 
 
 @login_required
@@ -34,12 +121,69 @@ def my_assigned_orders(request):
         raise PermissionDenied
 
     assigned_orders = Order.objects.filter(assigned_executor=request.user).select_related('customer')
-    return render(request, 'orders/my_assigned_orders.html', {'assigned_orders': assigned_orders})
+    page = paginate_orders(request, assigned_orders)
+    return render(request, 'orders/my_assigned_orders.html', {'assigned_orders': page.object_list, 'page': page})
+
+
+@login_required
+def saved_searches(request):
+    if request.user.profile.role != 'executor':
+        raise PermissionDenied
+
+    if request.method == 'POST':
+        form = SavedSearchForm(request.POST, executor=request.user)
+        if form.is_valid():
+            search = form.save(commit=False)
+            search.executor = request.user
+            # Поиск и строки его индекса (сигнал post_save) сохраняются вместе
+            with transaction.atomic():
+                search.save()
+            messages.success(request, 'Поиск сохранен: новые подходящие заказы появятся во входящих.')
+            return redirect('saved_searches')
+    else:
+        form = SavedSearchForm(executor=request.user)
+
+    context = {
+        'searches': SavedSearch.objects.filter(executor=request.user).order_by('-created_at'),
+        'form': form,
+    }
+    return render(request, 'orders/saved_searches.html', context)
+
+
+@login_required
+@require_POST
+def delete_saved_search(request, search_id):
+    search = get_object_or_404(SavedSearch, id=search_id, executor=request.user)
+    search.delete()
+    messages.success(request, 'Поиск удален.')
+    return redirect('saved_searches')
+
+
+@login_required
+def inbox(request):
+    if request.user.profile.role != 'executor':
+        raise PermissionDenied
+
+    entries = InboxEntry.objects.filter(executor=request.user).select_related('order__customer', 'search')
+    paginator = KeysetPaginator(entries, ('-created_at', '-id'), settings.INBOX_PAGE_SIZE)
+    page = paginator.get_page(request.GET.get('cursor'))
+    unread_count = InboxEntry.objects.filter(executor=request.user, is_read=False).count()
+    # Показанные записи отмечаются прочитанными; на странице они еще выделены как новые
+    unread = [entry.pk for entry in page.object_list if not entry.is_read]
+    if unread:
+        InboxEntry.objects.filter(pk__in=unread).update(is_read=True)
+
+    context = {
+        'entries': page.object_list,
+        'page': page,
+        'unread_count': unread_count,
+    }
+    return render(request, 'orders/inbox.html', context)
 
 
 @login_required
 def order_detail(request, order_id):
-    order = get_object_or_404(Order, id=order_id)
+    order = get_object_or_404(Order.objects.select_related('customer', 'assigned_executor'), id=order_id)
 
     is_customer = request.user.is_authenticated and request.user == order.customer
     is_executor = request.user.is_authenticated and request.user.profile.role == 'executor'
@@ -66,13 +210,12 @@ def order_detail(request, order_id):
 
     if request.method == 'POST' and is_customer and 'assign_executor' in request.POST:
         executor_id = request.POST.get('executor_id')
-        if executor_id:
+        if executor_id and order.status == 'open':
             try:
                 selected_executor = User.objects.get(id=executor_id, profile__role='executor')
                 if Bid.objects.filter(order=order, executor=selected_executor).exists():
-                    order.assigned_executor = selected_executor
-                    order.status = 'in_progress'
-                    order.save()
+                    if not order.transition('in_progress', assigned_executor=selected_executor):
+                        messages.error(request, STALE_ORDER_MESSAGE)
                     return HttpResponseRedirect(request.path)
                 else:
                     pass
@@ -81,20 +224,38 @@ def order_detail(request, order_id):
 
     if request.method == 'POST' and is_customer and 'change_status' in request.POST:
         new_status = request.POST.get('new_status')
-        allowed_statuses = [choice[0] for choice in order.get_allowed_status_transitions()]
-        if new_status in allowed_statuses:
-            order.status = new_status
-            if new_status in ['open', 'completed', 'cancelled']:
-                order.assigned_executor = None
-            order.save()
+        if new_status == order.status:
+            return HttpResponseRedirect(request.path)
+        if ORDER_WORKFLOW.can_choose(order.status, new_status):
+            if not order.transition(new_status):
+                messages.error(request, STALE_ORDER_MESSAGE)
             return HttpResponseRedirect(request.path)
 
     if request.method == 'POST' and is_customer and 'unassign_executor' in request.POST:
-        order.assigned_executor = None
-        order.status = 'open'
-        order.save()
+        if not ORDER_WORKFLOW.can_transition(order.status, 'open') or not order.transition('open'):
+            messages.error(request, STALE_ORDER_MESSAGE)
         return HttpResponseRedirect(request.path)
 
+    review = Review.objects.filter(order=order).first()
+    review_form = None
+    if can_leave_review(order, is_customer, review):
+        if request.method == 'POST' and 'leave_review' in request.POST:
+            review_form = ReviewForm(request.POST)
+            if review_form.is_valid():
+                review = review_form.save(commit=False)
+                review.order = order
+                review.customer = request.user
+                review.executor_id = order.assigned_executor_id
+                try:
+                    # Рейтинг исполнителя обновляется в этой же транзакции (orders.ratings)
+                    with transaction.atomic():
+                        review.save()
+                except IntegrityError:
+                    messages.error(request, 'Отзыв к этому заказу уже оставлен.')
+                return HttpResponseRedirect(request.path)
+        else:
+            review_form = ReviewForm()
+
     context = {
         'order': order,
         'bids': bids,
@@ -103,11 +264,12 @@ def order_detail(request, order_id):
         'is_assigned_executor': is_assigned_executor,
         'user_can_bid': user_can_bid,
         'bid_form': bid_form,
+        'review': review,
+        'review_form': review_form,
+        'suggested_executors': suggest_executors(order) if is_customer and order.status == 'open' else [],
         'bidders_for_selection': bids.values_list('executor__id', 'executor__username') if is_customer else [],
-        'allowed_status_transitions': order.get_allowed_status_transitions() if is_customer or is_assigned_executor else [],
+        'allowed_status_transitions': ORDER_WORKFLOW.status_choices(order.status) if is_customer or is_assigned_executor else (),
     }
-    print(order.status)
-    print(order.get_allowed_status_transitions())
 
     return render(request, 'orders/order_detail.html', context)
 
@@ -0,0 +1,128 @@
+from django.db import models
+
+# Жизненный цикл заказа.
+#
+# Статусы, переходы и действия при переходах описаны декларативно, а все
+# производные таблицы (варианты статуса для каждого исходного статуса,
+# исходные статусы для каждого целевого, варианты массовой смены) строятся
+# один раз при импорте модуля. Модуль не зависит от моделей: модель заказа
+# берет из него choices и CHECK-ограничение на статус.
+
+
+class TransitionNotAllowed(ValueError):
+    pass
+
+
+class Workflow:
+    """
+    Конечный автомат статусов.
+
+    states — пары (значение, подпись) в порядке вывода; transitions — для
+    каждого статуса допустимые целевые статусы; requires — поля, без которых
+    переход в статус невозможен (например, исполнитель для «В работе»).
+    Действия при входе в статус регистрируются декоратором on_enter и
+    дополняют изменения, которые записываются вместе со статусом.
+    """
+
+    def __init__(self, states, transitions, requires=None):
+        self.choices = tuple(states)
+        self.labels = dict(self.choices)
+        self.values = tuple(self.labels)
+        self.requires = {status: tuple(fields) for status, fields in (requires or {}).items()}
+        self._hooks = {status: [] for status in self.values}
+
+        unknown = {status for source, targets in transitions.items() for status in (source, *targets)} - set(self.values)
+        if unknown:
+            raise ValueError(f'Неизвестные статусы в переходах: {", ".join(sorted(unknown))}')
+
+        self.targets = {status: frozenset(transitions.get(status, ())) for status in self.values}
+        self.sources = {
+            status: tuple(source for source in self.values if status in self.targets[source])
+            for status in self.values
+        }
+        # Выбор статуса вручную: переходы в статусы, не требующие дополнительных полей
+        self._manual_targets = {
+            source: frozenset(target for target in self.targets[source] if not self.requires.get(target))
+            for source in self.values
+        }
+        self._status_choices = {
+            source: self._choices_from(source, self._manual_targets[source]) for source in self.values
+        }
+        self._transition_choices = {
+            source: self._choices_from(source, self.targets[source]) for source in self.values
+        }
+        # Массовая смена статуса: достижимые статусы без обязательных полей
+        self.bulk_choices = tuple(
+            (value, label) for value, label in self.choices
+            if self.sources[value] and not self.requires.get(value)
+        )
+
+    def _choices_from(self, source, targets):
+        return tuple((value, label) for value, label in self.choices if value == source or value in targets)
+
+    def on_enter(self, *statuses):
+        """Регистрирует действие hook(changes) при переходе в любой из statuses"""
+        def register(hook):
+            for status in statuses:
+                self._hooks[status].append(hook)
+            return hook
+        return register
+
+    def can_transition(self, source, target):
+        return target in self.targets.get(source, ())
+
+    def can_choose(self, source, target):
+        """Можно ли выбрать target вручную, без дополнительных полей"""
+        return target in self._manual_targets.get(source, ())
+
+    def status_choices(self, source):
+        """Варианты для формы смены статуса заказа в статусе source: текущий и выбираемые вручную"""
+        return self._status_choices.get(source, ())
+
+    def transition_choices(self, source):
+        """Текущий статус и все допустимые переходы из него (для форм, где задаются и обязательные поля)"""
+        return self._transition_choices.get(source, self.choices)
+
+    def prepare(self, target, changes):
+        """
+        Изменения, записываемые вместе с переходом в target: переданные
+        changes, дополненные действиями on_enter.
+        """
+        if target not in self.labels:
+            raise TransitionNotAllowed(f'Неизвестный статус «{target}».')
+        missing = [field for field in self.requires.get(target, ()) if changes.get(field) is None]
+        if missing:
+            raise TransitionNotAllowed(f'Для статуса «{self.labels[target]}» нужно указать: {", ".join(missing)}.')
+        changes = dict(changes)
+        for hook in self._hooks[target]:
+            hook(changes)
+        return changes
+
+    def check_constraint(self, field, name):
+        return models.CheckConstraint(condition=models.Q(**{f'{field}__in': self.values}), name=name)
+
+
+ORDER_WORKFLOW = Workflow(
+    states=[
+        ('open', 'Открыт'),
+        ('in_progress', 'В работе'),
+        ('completed', 'Завершен'),
+        ('cancelled', 'Отменен'),
+    ],
+    transitions={
+        'open': ['in_progress', 'cancelled'],
+        'in_progress': ['completed', 'cancelled', 'open'],
+        'completed': ['open'],
+        'cancelled': ['open'],
+    },
+    # В работу заказ переводится назначением исполнителя из откликнувшихся
+    requires={'in_progress': ['assigned_executor']},
+)
+
+ORDER_STATUS_CHOICES = ORDER_WORKFLOW.choices
+
+
+@ORDER_WORKFLOW.on_enter('open', 'cancelled')
+def unassign_executor(changes):
+    # У завершенного заказа исполнитель остается — заказчик оставляет ему отзыв
+    changes['assigned_executor'] = None
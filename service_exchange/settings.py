@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -37,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'import_export',
     'core',
     'orders',
@@ -44,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,7 +60,7 @@ ROOT_URLCONF = 'service_exchange.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [
             BASE_DIR / 'templates'
         ],
@@ -78,17 +81,74 @@ WSGI_APPLICATION = 'service_exchange.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+#
+# Параметры подключения берутся из переменных окружения DB_*. Соединения
+# переиспользуются между запросами одним из двух способов (в Django они
+# взаимоисключающие):
+# - пул psycopg (DB_POOL=1, нужен пакет psycopg_pool) — соединение берется
+#   из пула на время запроса; подходит и для ASGI;
+# - постоянное соединение процесса на DB_CONN_MAX_AGE секунд — под WSGI.
+#   Под ASGI (asgi.py) по умолчанию отключено: async-представления выполняют
+#   запросы в разных потоках, и соединения не переиспользовались бы.
+
+DB_POOL = os.environ.get('DB_POOL') == '1'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'service_exchange_db',
-        'USER': 'service_exchange_user',
-        'PASSWORD': 'qwerty123',
-        'HOST': 'localhost',
-        'PORT': '5432'
+        'NAME': os.environ.get('DB_NAME', 'service_exchange_db'),
+        'USER': os.environ.get('DB_USER', 'service_exchange_user'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+        # Время жизни постоянного соединения, секунды; 0 — новое соединение на каждый запрос
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get(
+            'DB_CONN_MAX_AGE', '0' if os.environ.get('DJANGO_ASYNC_VIEWS') == '1' else '60'
+        )),
+        # Постоянное соединение проверяется перед первым запросом в новом HTTP-запросе:
+        # разорванное сервером БД или балансировщиком переоткрывается, а не дает ошибку
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1',
+        'OPTIONS': {
+            'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', '5')),
+        },
     }
 }
 
+if DB_POOL:
+    from psycopg_pool import ConnectionPool
+
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+        # Сколько запрос ждет свободного соединения, прежде чем завершиться ошибкой, секунды
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        # Простаивающие дольше соединения сверх min_size закрываются, секунды
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '600')),
+        # Проверка соединения при выдаче из пула (аналог CONN_HEALTH_CHECKS)
+        'check': ConnectionPool.check_connection,
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        # Считает попадания и промахи в метрике cache_requests_total (core.metrics)
+        'BACKEND': 'core.metrics.InstrumentedLocMemCache',
+        'LOCATION': 'service-exchange',
+    }
+}
+
+
+# Authentication
+
+AUTHENTICATION_BACKENDS = [
+    # Путь бэкенда в сессиях, открытых до перехода на него, переписан миграцией
+    # accounts.0007_rewrite_session_backend
+    'accounts.backends.ProfileModelBackend',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -126,7 +186,144 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Загружаемые и сгенерированные файлы (в том числе фоновые экспорты)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Query budgets
+
+# Максимальное число SQL-запросов на одно представление (по имени URL).
+# Контролируется QueryBudgetMiddleware и тестами core.tests.test_query_budget.
+QUERY_BUDGETS = {
+    'order_list': 1,
+    'executor_list': 1,
+    'my_orders': 3,
+    'my_orders_bulk': 7,
+    'my_assigned_orders': 3,
+    'saved_searches': 7,
+    'delete_saved_search': 6,
+    'inbox': 5,
+    'create_order': 3,
+    'order_detail': 7,
+    'edit_order': 4,
+    'api_order_list': 2,
+    'api_order_detail': 5,
+    'api_executor_list': 2,
+    'order_events': 3,
+    'register': 0,
+    'login': 0,
+    'logout': 4,
+    'profile': 2,
+    'profile_update': 2,
+}
+
+# 'log' — предупреждение в лог, 'raise' — исключение QueryBudgetExceeded
+QUERY_BUDGET_ACTION = 'log'
+
+
+# Pagination
+
+# Количество заказов на странице курсорной пагинации
+ORDERS_PAGE_SIZE = 20
+
+# Количество исполнителей на странице каталога
+EXECUTORS_PAGE_SIZE = 20
+
+# Количество записей на странице входящих заказов исполнителя
+INBOX_PAGE_SIZE = 20
+
+
+# ASGI
+
+# Нативные async-версии читающих представлений (order_list, executor_list,
+# order_detail, profile). Включается в asgi.py; под WSGI остаются синхронные.
+ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS') == '1'
+
+
+# Server-sent events
+
+# Брокер событий (core.events). InProcessBroker раздает события только
+# подписчикам своего процесса
+EVENT_BROKER = {
+    'BACKEND': 'core.events.InProcessBroker',
+    'OPTIONS': {'max_queue_size': 100},
+}
+
+# Период комментария keepalive в открытом потоке, секунды
+SSE_KEEPALIVE_INTERVAL = 15
+
+# Интервал переподключения клиента после обрыва, секунды
+SSE_RETRY_INTERVAL = 3
+
+
+# Export
+
+# Размер порции строк потокового экспорта (core.export): chunk_size для
+# .iterator() и число строк в одной порции ответа
+EXPORT_CHUNK_SIZE = 2000
+
+# Задание фонового экспорта в статусе «Выполняется» без обновления прогресса
+# дольше этого времени считается брошенным (воркер завершился аварийно) и
+# снова забирается из очереди, секунды
+EXPORT_JOB_TIMEOUT = 600
+
+
+# Import
+
+# Размер пачки bulk_create/bulk_update при импорте (core.imports)
+IMPORT_BATCH_SIZE = 1000
+
+# Количество строк файла, проверяемых и записываемых в одной транзакции (manage.py import_data)
+IMPORT_CHUNK_SIZE = 5000
+
+
+# Admin
+
+# С этого количества строк (по статистике PostgreSQL) списки админки
+# показывают оценку вместо точного COUNT(*) (core.changelist)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100000
+
+# Откликов на одной странице панели откликов на странице заказа в админке
+ADMIN_BIDS_PAGE_SIZE = 50
+
+
+# Matching
+
+# Подбор исполнителей к заказу (orders.matching): доля рейтинга в итоговой
+# оценке (остальное — текстовое сходство), число предлагаемых исполнителей
+MATCHING_RATING_WEIGHT = 0.2
+MATCHING_SUGGESTIONS = 5
+
+# Сколько самых весомых терминов заказа участвует в запросе и сколько
+# терминов хранится для одного профиля
+MATCHING_MAX_QUERY_TERMS = 12
+MATCHING_MAX_PROFILE_TERMS = 100
+
+# Время жизни закешированного списка предложенных исполнителей, секунды
+MATCHING_CACHE_TIMEOUT = 600
+
+
+# Saved searches
+
+# Сколько сохраненных поисков может завести один исполнитель (orders.percolator)
+SAVED_SEARCHES_PER_EXECUTOR = 20
+
+
+# Metrics
+
+# Каталог, через который процессы сервера суммируют метрики /metrics
+# (core.metrics); без него каждый процесс отдает только свои значения.
+# Каталог очищается при развертывании, до запуска воркеров
+METRICS_MULTIPROCESS_DIR = os.environ.get('METRICS_MULTIPROCESS_DIR') or None
+
+# Как часто процесс записывает снимок своих метрик в каталог, секунды
+METRICS_FLUSH_INTERVAL = 5
+
+# Если задан, /metrics требует заголовок Authorization: Bearer <токен>
+METRICS_BEARER_TOKEN = os.environ.get('METRICS_BEARER_TOKEN') or None
@@ -17,9 +17,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import TemplateView
+from core.views import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
     path('accounts/', include('accounts.urls')),
     path('orders/', include('orders.urls')),
     path('', TemplateView.as_view(template_name='home.html'), name='home')